@@ -38,8 +38,9 @@ class OaiPmhListView(AdminResourceListView):
         "spec": {"text": _("Set spec"), "order": 1},
         "name": {"text": _("Set name"), "order": 2},
         "search_pattern": {"text": _("Search query"), "order": 3},
-        "created": {"text": _("Created"), "order": 4},
-        "updated": {"text": _("Updated"), "order": 5},
+        "records_count": {"text": _("Records"), "order": 4},
+        "created": {"text": _("Created"), "order": 5},
+        "updated": {"text": _("Updated"), "order": 6},
     }
 
     search_config_name = "RDM_OAI_PMH_SEARCH"
@@ -148,6 +149,7 @@ class OaiPmhDetailView(AdminResourceDetailView):
         "name": {"text": _("Set name"), "order": 1},
         "spec": {"text": _("Set spec"), "order": 2},
         "search_pattern": {"text": _("Search query"), "order": 3},
-        "created": {"text": _("Created"), "order": 4},
-        "updated": {"text": _("Updated"), "order": 5},
+        "records_count": {"text": _("Records"), "order": 4},
+        "created": {"text": _("Created"), "order": 5},
+        "updated": {"text": _("Updated"), "order": 6},
     }
@@ -0,0 +1,45 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2023 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Create OAI render cache table."""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy_utils import UUIDType
+
+# revision identifiers, used by Alembic.
+revision = "5e2a1c6f8b3d"
+down_revision = "a2a6819f14f1"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "rdm_records_oai_render_cache",
+        sa.Column("record_id", UUIDType(), nullable=False),
+        sa.Column("format", sa.String(length=64), nullable=False),
+        sa.Column("revision_id", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=40), nullable=True),
+        sa.Column("xml", sa.LargeBinary(), nullable=False),
+        sa.Column("updated", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["record_id"],
+            ["rdm_records_metadata.id"],
+            name=op.f("fk_rdm_records_oai_render_cache_record_id_rdm_records_metadata"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "record_id", "format", name=op.f("pk_rdm_records_oai_render_cache")
+        ),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_table("rdm_records_oai_render_cache")
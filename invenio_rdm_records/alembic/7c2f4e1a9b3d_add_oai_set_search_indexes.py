@@ -0,0 +1,82 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2023 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add trigram indexes for searching OAI sets.
+
+The indexes need the ``pg_trgm`` extension of PostgreSQL. If it is not installed
+and the database user is not allowed to install it, the indexes are skipped
+with a warning: the sets can still be searched, only more slowly. The indexes
+can then be added later, by a superuser of the database:
+
+.. code-block:: sql
+
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX IF NOT EXISTS ix_oaiserver_set_name_trgm
+        ON oaiserver_set USING gin (name gin_trgm_ops);
+    CREATE INDEX IF NOT EXISTS ix_oaiserver_set_spec_trgm
+        ON oaiserver_set USING gin (spec gin_trgm_ops);
+"""
+
+import warnings
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+# revision identifiers, used by Alembic.
+revision = "7c2f4e1a9b3d"
+down_revision = "5e2a1c6f8b3d"
+branch_labels = ()
+depends_on = "5d25c1981985"
+
+
+def upgrade():
+    """Upgrade database."""
+    # trigram indexes (used by ILIKE '%...%' queries) only exist on PostgreSQL
+    if op.get_context().dialect.name != "postgresql":
+        return
+    if not _create_trgm_extension():
+        warnings.warn(
+            "The pg_trgm extension of PostgreSQL could not be installed, the "
+            "trigram indexes of the OAI sets are skipped. See the docstring of "
+            f"the migration {revision} to add them later as a superuser."
+        )
+        return
+    for column in ("name", "spec"):
+        op.create_index(
+            op.f(f"ix_oaiserver_set_{column}_trgm"),
+            "oaiserver_set",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def _create_trgm_extension():
+    """Install the pg_trgm extension if needed, returning whether it exists."""
+    bind = op.get_bind()
+    installed = bind.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    ).scalar()
+    if installed:
+        return True
+    # in a savepoint, so that a failure does not abort the migration
+    try:
+        with bind.begin_nested():
+            bind.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError:
+        return False
+    return True
+
+
+def downgrade():
+    """Downgrade database."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    # the indexes are skipped if the extension could not be installed
+    for column in ("name", "spec"):
+        op.execute(f"DROP INDEX IF EXISTS ix_oaiserver_set_{column}_trgm")
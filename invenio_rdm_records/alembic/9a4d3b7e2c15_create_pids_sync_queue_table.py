@@ -0,0 +1,53 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2023 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Create PIDs sync queue table."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a4d3b7e2c15"
+down_revision = "7c2f4e1a9b3d"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "rdm_pids_sync_queue",
+        sa.Column("created", sa.DateTime(), nullable=False),
+        sa.Column("updated", sa.DateTime(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("record_id", sa.String(length=255), nullable=False),
+        sa.Column("scheme", sa.String(length=64), nullable=False),
+        sa.Column("parent", sa.Boolean(), nullable=False),
+        sa.Column("state", sa.String(length=1), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt", sa.DateTime(), nullable=False),
+        sa.Column("generation", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_rdm_pids_sync_queue")),
+        sa.UniqueConstraint(
+            "record_id", "scheme", "parent", name="uq_rdm_pids_sync_queue_pid"
+        ),
+    )
+    op.create_index(
+        op.f("ix_rdm_pids_sync_queue_next_attempt"),
+        "rdm_pids_sync_queue",
+        ["next_attempt"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(
+        op.f("ix_rdm_pids_sync_queue_next_attempt"), table_name="rdm_pids_sync_queue"
+    )
+    op.drop_table("rdm_pids_sync_queue")
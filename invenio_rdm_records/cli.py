@@ -8,6 +8,8 @@
 
 """Command-line tools for demo module."""
 
+import os
+
 import click
 from flask import current_app
 from flask.cli import with_appcontext
@@ -41,6 +43,11 @@ from .fixtures.tasks import (
     create_demo_record,
     get_authenticated_identity,
 )
+from .oaiserver import render_cache
+from .reindex import BlueGreenReindex, IncrementalReindex, ShardedReindex
+from .reindex import update_mappings as update_index_mappings
+from .services.pids import queue as pids_sync_queue
+from .services.pids.providers.transport import transport_metrics
 from .utils import get_or_create_user
 
 COMMUNITY_OWNER_EMAIL = "community@demo.org"
@@ -281,9 +288,64 @@ def create_fixtures():
 
 
 @rdm_records.command("rebuild-index")
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Index the records directly, in shards, with this many worker processes.",
+)
+@click.option(
+    "--shard-size",
+    type=click.IntRange(min=1),
+    default=10000,
+    show_default=True,
+    help="Maximum number of records per shard (only used with --workers).",
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    default="rebuild-index.checkpoint.json",
+    show_default=True,
+    help="File used to resume an interrupted run (only used with --workers).",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Only reindex the records and drafts modified since the last run.",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    default=None,
+    help="Only reindex the records and drafts modified since this UTC time.",
+)
+@click.option(
+    "--watermark",
+    type=click.Path(dir_okay=False),
+    default="rebuild-index.watermark.json",
+    show_default=True,
+    help="File storing the start time of the last successful direct or "
+    "incremental run.",
+)
 @with_appcontext
-def rebuild_index():
-    """Reindex all drafts, records and vocabularies."""
+def rebuild_index(workers, shard_size, checkpoint, incremental, since, watermark):
+    """Reindex all drafts, records and vocabularies.
+
+    By default, the records are sent to the indexing queue. With ``--workers``,
+    they are dumped and bulk-indexed right away by a pool of worker processes.
+    With ``--incremental`` or ``--since``, only the records and drafts modified
+    since the given time (or since the last run) are reindexed.
+    """
+    if incremental or since:
+        _rebuild_index_incremental(since, watermark)
+        return
+
+    if workers:
+        _rebuild_index_sharded(workers, shard_size, checkpoint, watermark)
+        return
+
     click.secho("Reindexing vocabularies...", fg="green")
     vocab_service = current_service_registry.get("vocabularies")
     vocab_service.rebuild_index(identity=system_identity)
@@ -315,6 +377,149 @@ def rebuild_index():
     click.secho("Reindexed records and vocabularies!", fg="green")
 
 
+def _rebuild_index_incremental(since, watermark):
+    """Reindex the records and drafts modified since a given time."""
+
+    def report(progress):
+        click.echo(str(progress))
+
+    try:
+        reindex = IncrementalReindex(
+            since=since, watermark_path=watermark, progress_callback=report
+        )
+    except ValueError:
+        click.secho(
+            f"No watermark found in {watermark}, please provide --since.", fg="red"
+        )
+        exit(1)
+
+    click.secho(f"Reindexing modifications since {reindex.since}...", fg="green")
+    for progress in reindex.run():
+        color = "red" if progress.errors else "green"
+        click.secho(
+            f"Reindexed {progress.target.name}: {progress.done} docs, "
+            f"{progress.errors} errors.",
+            fg=color,
+        )
+
+
+def _rebuild_index_sharded(workers, shard_size, checkpoint, watermark):
+    """Reindex all targets in shards with a pool of worker processes."""
+    if os.path.exists(checkpoint):
+        click.secho(f"Resuming interrupted run from {checkpoint}...", fg="yellow")
+
+    def report(progress):
+        click.echo(str(progress))
+
+    reindex = ShardedReindex(
+        workers=workers,
+        shard_size=shard_size,
+        checkpoint_path=checkpoint,
+        watermark_path=watermark,
+        progress_callback=report,
+    )
+    results = reindex.run()
+
+    for progress in results:
+        color = "red" if progress.errors or progress.failed_shards else "green"
+        click.secho(
+            f"Reindexed {progress.target.name}: {progress.indexed} docs, "
+            f"{progress.errors} errors, {progress.failed_shards} failed shards.",
+            fg=color,
+        )
+
+    if any(progress.failed_shards for progress in results):
+        click.secho(
+            "Some shards failed. Run the command again to retry them.", fg="red"
+        )
+        exit(1)
+
+    click.secho("Reindexed records and vocabularies!", fg="green")
+
+
+@rdm_records.command("switch-index")
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes loading the new indices.",
+)
+@click.option(
+    "--shard-size",
+    type=click.IntRange(min=1),
+    default=10000,
+    show_default=True,
+    help="Maximum number of records per shard.",
+)
+@click.option(
+    "--delete-old",
+    is_flag=True,
+    default=False,
+    help="Delete the old indices once the aliases point to the new ones.",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Only show the indices and aliases that would be changed.",
+)
+@with_appcontext
+def switch_index(workers, shard_size, delete_old, dry_run):
+    """Reindex records and drafts into new indices without downtime.
+
+    New indices are created from the current mappings and loaded from the
+    database, while the old indices keep serving requests. The modifications
+    done in the meantime are replayed, and the aliases are then switched to the
+    new indices in one atomic operation.
+    """
+
+    def report(progress):
+        click.echo(str(progress))
+
+    reindex = BlueGreenReindex(
+        workers=workers,
+        shard_size=shard_size,
+        delete_old=delete_old,
+        progress_callback=report,
+    )
+
+    if dry_run:
+        plans = reindex.plan()
+    else:
+        try:
+            plans = reindex.run()
+        except RuntimeError as e:
+            click.secho(str(e), fg="red")
+            exit(1)
+
+    for plan in plans:
+        old_indices = ", ".join(plan["old_indices"]) or "-"
+        click.secho(f"{plan['target'].name}:", fg="green")
+        click.echo(f"  new index: {plan['new_index']}")
+        click.echo(f"  old indices: {old_indices}")
+        click.echo(f"  aliases: {', '.join(plan['aliases'])}")
+
+    if dry_run:
+        click.secho("Dry run, nothing was changed.", fg="yellow")
+    else:
+        click.secho("Switched records and drafts to the new indices!", fg="green")
+
+
+@rdm_records.command("update-mappings")
+@with_appcontext
+def update_mappings():
+    """Add the new fields of the mappings to the existing record indices.
+
+    Must be run when upgrading, before the workers indexing records are
+    restarted, since the records and drafts indices reject the documents with
+    unknown fields.
+    """
+    for index_name in update_index_mappings():
+        click.secho(f"Updated the mapping of {index_name}.", fg="green")
+
+
 # CUSTOM FIELDS
 
 
@@ -418,3 +623,105 @@ def custom_field_exists_in_records(field_name):
         click.secho(f"Field {field_name} exists", fg="green")
     else:
         click.secho(f"Field {field_name} does not exist", fg="red")
+
+
+# OAI-PMH RENDER CACHE
+
+
+@rdm_records.group("oai-cache")
+def oai_cache():
+    """OAI-PMH render cache commands."""
+
+
+@oai_cache.command("warmup")
+@click.option(
+    "--prefix",
+    "-p",
+    "prefixes",
+    multiple=True,
+    help="Metadata prefix to render (can be repeated). Defaults to all cached ones.",
+)
+@with_appcontext
+def oai_cache_warmup(prefixes):
+    """Render the OAI-PMH metadata of all harvestable records into the cache."""
+    unknown = set(prefixes) - set(current_app.config["OAISERVER_METADATA_FORMATS"])
+    if unknown:
+        click.secho(
+            f"Unknown metadata prefixes: {', '.join(sorted(unknown))}", fg="red"
+        )
+        exit(1)
+
+    def report(rendered):
+        if rendered % 1000 == 0:
+            click.echo(f"Rendered {rendered} records...")
+
+    rendered = render_cache.warmup(prefixes or None, progress_callback=report)
+    click.secho(f"Rendered the metadata of {rendered} records!", fg="green")
+
+
+@oai_cache.command("invalidate")
+@click.option(
+    "--format",
+    "-f",
+    "formats",
+    multiple=True,
+    help="Format whose renderings are deleted (can be repeated). Defaults to all.",
+)
+@with_appcontext
+def oai_cache_invalidate(formats):
+    """Delete the cached OAI-PMH renderings."""
+    deleted = render_cache.invalidate(formats=formats or None)
+    click.secho(f"Deleted {deleted} cached renderings!", fg="green")
+
+
+# PIDS SYNCHRONIZATION QUEUE
+
+
+@rdm_records.group("pids-queue")
+def pids_queue():
+    """PID synchronization queue commands."""
+
+
+@pids_queue.command("list")
+@click.option(
+    "--failed-only",
+    is_flag=True,
+    default=False,
+    help="Only list the given up requests.",
+)
+@with_appcontext
+def pids_queue_list(failed_only):
+    """List the PID synchronization requests which failed."""
+    items = pids_sync_queue.stuck(include_pending=not failed_only).all()
+    for item in items:
+        pid = f"{item.scheme} of {'parent ' if item.parent else ''}{item.record_id}"
+        click.echo(
+            f"{item.id}\t{item.state.name}\t{pid}\tattempts={item.attempts}\t"
+            f"next={item.next_attempt.isoformat()}\t{item.last_error or ''}"
+        )
+    click.secho(f"{len(items)} failed requests.", fg="yellow" if items else "green")
+
+
+@pids_queue.command("retry")
+@click.argument("item_ids", nargs=-1, type=int)
+@with_appcontext
+def pids_queue_retry(item_ids):
+    """Retry PID synchronization requests (defaults to all the given up ones)."""
+    rescheduled = pids_sync_queue.retry(item_ids or None)
+    click.secho(f"Rescheduled {rescheduled} requests!", fg="green")
+
+
+@pids_queue.command("drain")
+@click.option("--limit", "-l", type=int, help="Maximum number of requests.")
+@with_appcontext
+def pids_queue_drain(limit):
+    """Process the due PID synchronization requests in the current process."""
+    synced, failed = pids_sync_queue.drain(limit=limit)
+    click.secho(f"Synchronized {synced} PIDs, {failed} failed.", fg="green")
+    metrics = transport_metrics()
+    click.echo(
+        f"DataCite: {metrics['requests']} requests "
+        f"({metrics['error_rate']:.1%} errors, "
+        f"{metrics['latency_avg'] * 1000:.0f} ms on average) "
+        f"over {metrics['connections']} connections."
+    )
@@ -304,6 +304,61 @@ RDM_OAI_PMH_SEARCH = {
 }
 """OAI-PMH search configuration."""
 
+RDM_OAI_PMH_RECORDS_FETCHER = "invenio_rdm_records.oaiserver.query:get_records"
+"""Function fetching a page of the OAI-PMH record lists.
+
+The default one pages through the records with cursors instead of scroll
+contexts. The cursor of the next page is stored in the resumption token, so
+that no search context needs to be kept open for the harvesters. Set to
+``None`` to use the scroll contexts, as Invenio-OAIServer does.
+"""
+
+RDM_OAI_PMH_MATERIALIZED_SETS = True
+"""Match records against the OAI sets when indexing them.
+
+The specs of the matching sets are stored in the search documents, so that
+harvesting a set only needs a terms filter, and the sets of the harvested
+records do not need to be computed for each response. Records which have not
+been classified yet are still matched with the query of the set.
+"""
+
+RDM_OAI_PMH_RECORDS_SETS_FETCHER = "invenio_rdm_records.oaiserver.sets:records_sets"
+"""Function listing the sets of the records of a harvested page.
+
+It receives the list of the search documents of the page, and returns the list
+of the set specs of each of them. The default one reads the materialized sets,
+and percolates the records which have not been classified yet. Set to ``None``
+to percolate all the records, as Invenio-OAIServer does.
+"""
+
+RDM_OAI_PMH_RECLASSIFY_BATCH_SIZE = 1000
+"""Number of records reclassified per background task when a set changes."""
+
+RDM_OAI_PMH_SET_COUNTS_TTL = 60 * 60
+"""Time (in seconds) for which the record counts of the OAI sets are cached.
+
+The counts can be refreshed ahead of their expiration by the periodic
+``invenio_rdm_records.services.tasks.refresh_oai_set_counts`` task, e.g.:
+
+.. code-block:: python
+
+    CELERY_BEAT_SCHEDULE = {
+        "refresh-oai-set-counts": {
+            "task": "invenio_rdm_records.services.tasks.refresh_oai_set_counts",
+            "schedule": timedelta(minutes=30),
+        },
+    }
+"""
+
+RDM_OAI_RENDER_CACHE_ENABLED = True
+"""Store the rendered OAI-PMH metadata of records, per revision and format."""
+
+RDM_OAI_RENDER_CACHE_EAGER = False
+"""Render the OAI-PMH metadata of records in the background when published.
+
+When disabled, the metadata is rendered when first requested by a harvester.
+"""
+
 #
 # Persistent identifiers configuration
 #
@@ -388,6 +443,59 @@ RDM_PARENT_PERSISTENT_IDENTIFIERS = {
 RDM_ALLOW_EXTERNAL_DOI_VERSIONING = True
 """Allow records with external DOIs to be versioned."""
 
+RDM_PIDS_SYNC_QUEUE_ENABLED = True
+"""Register and update the PIDs on their providers through a durable queue.
+
+The requests are stored in the database with the changes of the records, and
+processed in the background, with retries. The retried and delayed requests are
+processed by the periodic
+``invenio_rdm_records.services.pids.tasks.process_pid_sync_queue`` task, see
+``RDM_PIDS_SYNC_SCHEDULE``.
+
+When disabled, a task is sent per PID, and its errors are only logged.
+"""
+
+RDM_PIDS_SYNC_SCHEDULE = timedelta(minutes=1)
+"""Interval of the periodic processing of the PID synchronization queue.
+
+The task is added to ``CELERY_BEAT_SCHEDULE``, unless it is already scheduled
+there. Set to ``None`` to not schedule it.
+"""
+
+RDM_PIDS_PARENT_UPDATE_DELAY = timedelta(minutes=5)
+"""Time during which the updates of a parent PID (e.g. the concept DOI) are merged.
+
+When several versions of a record are published in a row, their parent PIDs are
+only updated once, with the metadata of the latest version. The delayed updates
+are processed by the periodic task of the PID synchronization queue (see
+``RDM_PIDS_SYNC_SCHEDULE``). Set to ``None`` to update the parent PIDs
+immediately.
+"""
+
+RDM_PIDS_SYNC_CONCURRENCY = 2
+"""Maximum number of workers processing the PID synchronization queue at once."""
+
+RDM_PIDS_SYNC_RATE_LIMIT = 10
+"""Maximum number of PID synchronization requests per second, for all workers.
+
+Set to ``0`` to disable the rate limit.
+"""
+
+RDM_PIDS_SYNC_BATCH_SIZE = 100
+"""Number of PID synchronization requests claimed at once by a worker."""
+
+RDM_PIDS_SYNC_LEASE = timedelta(minutes=10)
+"""Time after which the requests claimed by a worker can be claimed again."""
+
+RDM_PIDS_SYNC_MAX_ATTEMPTS = 10
+"""Number of failed attempts after which a PID synchronization is given up."""
+
+RDM_PIDS_SYNC_BACKOFF = timedelta(minutes=1)
+"""Delay before the second attempt, doubled after each failed attempt."""
+
+RDM_PIDS_SYNC_BACKOFF_MAX = timedelta(hours=6)
+"""Maximum delay between two attempts."""
+
 # Configuration for the DataCiteClient used by the DataCitePIDProvider
 
 DATACITE_ENABLED = False
@@ -405,6 +513,16 @@ DATACITE_PREFIX = ""
 DATACITE_TEST_MODE = True
 """DataCite test mode enabled."""
 
+DATACITE_POOL_SIZE = 10
+"""Maximum number of keep-alive connections to DataCite, per worker process.
+
+The connections are shared by all the DataCite clients of the process. Set to
+``0`` to open a new connection for each request.
+"""
+
+DATACITE_TIMEOUT = (5, 30)
+"""Connect and read timeouts (in seconds) of the requests to DataCite."""
+
 DATACITE_FORMAT = "{prefix}/{id}"
 """A string used for formatting the DOI or a callable.
 
@@ -524,3 +642,28 @@ RDM_RESOURCE_ACCESS_TOKEN_REQUEST_ARG = "resource_access_token"
 
 RDM_LOCK_EDIT_PUBLISHED_FILES = lock_edit_published_files
 """Lock editing already published files (enforce record versioning)."""
+
+RDM_INDEX_RELATED_RECORDS_ASYNC_THRESHOLD = 100
+"""Number of versions above which they are reindexed in a background task.
+
+Changes to the parent (e.g. to its access grants or secret links) require the
+reindexing of all its versions. Below this threshold, they are reindexed right
+after the changes are committed.
+"""
+
+RDM_STATS_REFRESH_LOOKBACK = timedelta(days=1)
+"""Time span checked for updated statistics when refreshing them the first time.
+
+The statistics of the indexed records are refreshed by the periodic
+``invenio_rdm_records.services.tasks.refresh_records_stats`` task, which should
+run after the statistics aggregations, e.g.:
+
+.. code-block:: python
+
+    CELERY_BEAT_SCHEDULE = {
+        "refresh-records-stats": {
+            "task": "invenio_rdm_records.services.tasks.refresh_records_stats",
+            "schedule": timedelta(hours=1),
+        },
+    }
+"""
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Memoized parsing of EDTF dates.
+
+Parsing EDTF strings is slow, while the same (relatively few distinct) date
+strings are parsed over and over again, e.g. when indexing or serializing
+records. The parsed values and their range bounds are thus kept in a bounded
+LRU cache which is shared by the whole process.
+
+The values are parsed with the (faster) level 0 grammar first, falling back to
+the full grammar for the other values accepted by the metadata schema of the
+records (e.g. dates with unspecified digits).
+"""
+
+import calendar
+from functools import lru_cache
+
+from arrow import Arrow
+from edtf import parse_edtf
+from edtf.parser.edtf_exceptions import EDTFParseException
+from edtf.parser.grammar import level0Expression
+from pyparsing import ParseException
+from pytz import utc
+
+_level0_parser = level0Expression("level0")
+
+
+def _format_date(date):
+    """Format the given date into ISO format."""
+    arrow = Arrow.fromtimestamp(calendar.timegm(date), tzinfo=utc)
+    return arrow.date().isoformat()
+
+
+def parse(value):
+    """Parse an EDTF string, trying the level 0 grammar first.
+
+    :raises: The same errors as ``edtf.parse_edtf()``.
+    """
+    if not value:
+        raise EDTFParseException(value)
+    try:
+        return _level0_parser.parse_string(value.strip(), parse_all=True)[0]
+    except ParseException:
+        return parse_edtf(value)
+
+
+class EDTFCache:
+    """Bounded LRU cache of parsed EDTF values and their range bounds.
+
+    Only successfully parsed values are cached. The cached EDTF objects are shared,
+    so they must not be modified.
+    """
+
+    def __init__(self, maxsize=65536):
+        """Constructor.
+
+        :param maxsize: Maximum number of entries of each cache.
+        """
+        self.maxsize = maxsize
+        self._parse = lru_cache(maxsize=maxsize)(parse)
+        self._bounds = lru_cache(maxsize=maxsize)(self._compute_bounds)
+
+    def parse(self, value):
+        """Parse an EDTF string.
+
+        :raises: The same errors as ``edtf.parse_edtf()``.
+        """
+        return self._parse(value)
+
+    def _compute_bounds(self, value):
+        """Compute the range bounds of an EDTF string."""
+        parsed = self.parse(value)
+        return _format_date(parsed.lower_strict()), _format_date(parsed.upper_strict())
+
+    def bounds(self, value):
+        """Get the lower and upper strict bounds of an EDTF string.
+
+        :returns: Tuple with the bounds, as ISO-formatted dates.
+        :raises: The same errors as ``edtf.parse_edtf()``.
+        """
+        return self._bounds(value)
+
+    def info(self):
+        """Get the hits, misses and sizes of the caches."""
+        return {
+            "parse": self._parse.cache_info()._asdict(),
+            "bounds": self._bounds.cache_info()._asdict(),
+        }
+
+    def clear(self):
+        """Empty the caches and reset their counters."""
+        self._parse.cache_clear()
+        self._bounds.cache_clear()
+
+
+edtf_cache = EDTFCache()
+"""Process-wide cache of parsed EDTF values."""
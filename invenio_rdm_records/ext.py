@@ -10,11 +10,13 @@
 # it under the terms of the MIT License; see LICENSE file for more details.
 
 """DataCite-based data model for Invenio."""
+
 from flask_iiif import IIIF
 from flask_principal import identity_loaded
 from invenio_records_resources.resources.files import FileResource
 from invenio_records_resources.services import FileService
 
+from invenio_rdm_records.oaiserver.hooks import init_response_hooks
 from invenio_rdm_records.oaiserver.resources.config import OAIPMHServerResourceConfig
 from invenio_rdm_records.oaiserver.resources.resources import OAIPMHServerResource
 from invenio_rdm_records.oaiserver.services.config import OAIPMHServerServiceConfig
@@ -98,6 +100,7 @@ class InvenioRDMRecords(object):
         self.init_config(app)
         self.init_services(app)
         self.init_resource(app)
+        init_response_hooks()
         app.extensions["invenio-rdm-records"] = self
         app.register_blueprint(blueprint)
         # Load flask IIIF
@@ -126,6 +129,7 @@ class InvenioRDMRecords(object):
             app.config["COMMUNITIES_NAMESPACES"] = app.config["RDM_NAMESPACES"]
 
         self.fix_datacite_configs(app)
+        self.schedule_pids_sync(app)
 
     def service_configs(self, app):
         """Customized service configs."""
@@ -256,6 +260,21 @@ class InvenioRDMRecords(object):
             config=IIIFResourceConfig.build(app),
         )
 
+    def schedule_pids_sync(self, app):
+        """Schedule the periodic processing of the PID synchronization queue."""
+        schedule = app.config["RDM_PIDS_SYNC_SCHEDULE"]
+        if not app.config["RDM_PIDS_SYNC_QUEUE_ENABLED"] or not schedule:
+            return
+        task = "invenio_rdm_records.services.pids.tasks.process_pid_sync_queue"
+        beat_schedule = dict(app.config.get("CELERY_BEAT_SCHEDULE") or {})
+        if any(entry.get("task") == task for entry in beat_schedule.values()):
+            return
+        beat_schedule["rdm-records-process-pids-sync-queue"] = {
+            "task": task,
+            "schedule": schedule,
+        }
+        app.config["CELERY_BEAT_SCHEDULE"] = beat_schedule
+
     def fix_datacite_configs(self, app):
         """Make sure that the DataCite config items are strings."""
         datacite_config_items = [
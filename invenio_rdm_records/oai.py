@@ -9,7 +9,6 @@
 """Invenio-RDM-Records OAI Functionality."""
 
 from datacite import schema43
-from dcxml import simpledc
 from flask import current_app, g
 from invenio_pidstore.errors import PersistentIdentifierError, PIDDoesNotExistError
 from invenio_pidstore.fetchers import FetchedPID
@@ -19,6 +18,7 @@ from invenio_search import RecordsSearch
 from invenio_search.engine import dsl
 from lxml import etree
 
+from .oaiserver.render_cache import render_cached
 from .proxies import current_rdm_records, current_rdm_records_service
 from .resources.serializers.datacite import DataCite43XMLSerializer
 from .resources.serializers.dcat import DCATSerializer
@@ -26,44 +26,68 @@ from .resources.serializers.dublincore import DublinCoreXMLSerializer
 from .resources.serializers.marcxml import MARCXMLSerializer
 from .services.pids.providers.oai import OAIPIDProvider
 
+# The serializers are stateless, so the same instances are used for all records
+_datacite_serializer = DataCite43XMLSerializer()
+_dcat_serializer = DCATSerializer()
+_dublincore_serializer = DublinCoreXMLSerializer()
+_marcxml_serializer = MARCXMLSerializer()
 
+
+def _oai_result_item(source):
+    """Get the result item of a record source.
+
+    The result items are only built for the records which are rendered (e.g. not
+    served from the render cache), sharing the links template of the request.
+    """
+    links_tpl = g.get("rdm_records_oai_links_tpl")
+    if links_tpl is None:
+        links_tpl = g.rdm_records_oai_links_tpl = (
+            current_rdm_records_service.oai_links_tpl()
+        )
+    return current_rdm_records_service.oai_result_items(
+        g.identity, [source], links_tpl=links_tpl
+    )[0]
+
+
+@render_cached("oai_dc")
 def dublincore_etree(pid, record, **serializer_kwargs):
     """Get DublinCore XML etree for OAI-PMH."""
-    item = current_rdm_records_service.oai_result_item(g.identity, record["_source"])
-    # TODO: DublinCoreXMLSerializer should be able to dump an etree directly
-    # instead. See https://github.com/inveniosoftware/flask-resources/issues/117
-    obj = DublinCoreXMLSerializer(**serializer_kwargs).dump_obj(item.to_dict())
-    return simpledc.dump_etree(obj)
+    item = _oai_result_item(record["_source"])
+    serializer = (
+        DublinCoreXMLSerializer(**serializer_kwargs)
+        if serializer_kwargs
+        else _dublincore_serializer
+    )
+    return serializer.serialize_object_etree(item.to_dict())
 
 
+@render_cached("marcxml")
 def oai_marcxml_etree(pid, record):
     """OAI MARCXML format for OAI-PMH."""
-    item = current_rdm_records_service.oai_result_item(g.identity, record["_source"])
-    # TODO: MARCXMLSerializer should directly be able to dump an etree instead
-    # of internally creating an etree, then dump to xml, then parse into an
-    # etree. See https://github.com/inveniosoftware/flask-resources/issues/117
-    return etree.fromstring(MARCXMLSerializer().serialize_object(item.to_dict()))
+    item = _oai_result_item(record["_source"])
+    return _marcxml_serializer.serialize_object_etree(item.to_dict())
 
 
+@render_cached("dcat")
 def oai_dcat_etree(pid, record):
     """OAI DCAT-AP format for OAI-PMH."""
-    item = current_rdm_records_service.oai_result_item(g.identity, record["_source"])
-    # TODO: Ditto. See https://github.com/inveniosoftware/flask-resources/issues/117
-    return etree.fromstring(
-        DCATSerializer().serialize_object(item.to_dict()).encode(encoding="utf-8")
-    )
+    item = _oai_result_item(record["_source"])
+    return _dcat_serializer.serialize_object_etree(item.to_dict())
 
 
+@render_cached("datacite")
 def datacite_etree(pid, record):
     """DataCite XML format for OAI-PMH.
 
     It assumes that record is a search result.
     """
-    # TODO: Ditto. See https://github.com/inveniosoftware/flask-resources/issues/117
-    data_dict = DataCite43XMLSerializer().dump_obj(record["_source"])
+    # TODO: DataCite43XMLSerializer should be able to dump an etree directly
+    # instead. See https://github.com/inveniosoftware/flask-resources/issues/117
+    data_dict = _datacite_serializer.dump_obj(record["_source"])
     return schema43.dump_etree(data_dict)
 
 
+@render_cached("oai_datacite")
 def oai_datacite_etree(pid, record):
     """OAI DataCite XML format for OAI-PMH.
 
@@ -71,7 +95,7 @@ def oai_datacite_etree(pid, record):
     """
     # TODO: See https://github.com/inveniosoftware/flask-resources/issues/117
     # This should be made into a serializer similar to the ones above.
-    resource_dict = DataCite43XMLSerializer().dump_obj(record["_source"])
+    resource_dict = _datacite_serializer.dump_obj(record["_source"])
 
     nsmap = {
         None: "http://schema.datacite.org/oai/oai-1.1/",
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Cached record counts of the OAI sets.
+
+The records of many sets are counted at once, with a ``filters`` aggregation
+over the queries of the sets (split in a few requests of a single multi-search
+for large numbers of sets). The counts are cached for a limited time, and can be
+refreshed periodically in the background, so that listing the sets does not
+need to query the search cluster.
+"""
+
+from datetime import datetime, timezone
+
+from flask import current_app
+from invenio_cache import current_cache
+from invenio_oaiserver.fetchers import set_records_query_fetcher
+from invenio_oaiserver.models import OAISet
+from invenio_oaiserver.proxies import current_oaiserver
+from invenio_oaiserver.query import query_string_parser
+from invenio_search import current_search_client
+from invenio_search.engine import dsl
+
+from . import sets
+
+CACHE_KEY_PREFIX = "rdm_records:oai_set_count:"
+"""Prefix of the cache keys of the record counts, followed by the set spec."""
+
+UPDATED_CACHE_KEY = "rdm_records:oai_set_counts:updated"
+"""Cache key of the time the record counts were last updated."""
+
+FILTERS_PER_REQUEST = 500
+"""Maximum number of sets counted by a single request of the multi-search."""
+
+
+def _cache_key(spec):
+    """Get the cache key of the record count of a set."""
+    return CACHE_KEY_PREFIX + spec
+
+
+def _fetch_set_queries(specs):
+    """Get the queries of sets, loading all the sets with one query.
+
+    Sets whose query is fetched by a custom ``OAISERVER_SET_RECORDS_QUERY_FETCHER``
+    are fetched one by one with it.
+    """
+    fetcher = current_oaiserver.set_records_query_fetcher
+    if fetcher is not set_records_query_fetcher:
+        return {spec: fetcher(spec) for spec in specs}
+
+    patterns = dict(
+        OAISet.query.filter(OAISet.spec.in_(specs)).with_entities(
+            OAISet.spec, OAISet.search_pattern
+        )
+    )
+    return {
+        spec: (
+            dsl.Q(query_string_parser(patterns[spec]))
+            if spec in patterns
+            else dsl.Q("match_none")
+        )
+        for spec in specs
+    }
+
+
+def _set_queries(specs):
+    """Get the queries of the records of sets."""
+    queries = _fetch_set_queries(specs)
+    if sets.is_enabled():
+        return {
+            spec: sets.set_records_query(spec, query=query)
+            for spec, query in queries.items()
+        }
+    return queries
+
+
+def count_records(specs):
+    """Count the records of sets, without using the cache.
+
+    :param specs: Specs of the sets.
+    :returns: Dictionary of the record count of each set. The sets whose records
+        could not be counted (e.g. because of an invalid query) are left out.
+    """
+    specs = list(specs)
+    if not specs:
+        return {}
+
+    queries = _set_queries(specs)
+    index = current_app.config["OAISERVER_RECORD_INDEX"]
+    multi_search = dsl.MultiSearch(using=current_search_client)
+    for start in range(0, len(specs), FILTERS_PER_REQUEST):
+        chunk = specs[start : start + FILTERS_PER_REQUEST]
+        search = current_oaiserver.search_cls(index=index).extra(size=0)
+        search.aggs.bucket(
+            "sets",
+            "filters",
+            filters={spec: queries[spec] for spec in chunk},
+        )
+        multi_search = multi_search.add(search)
+
+    counts = {}
+    for response in multi_search.execute(raise_on_error=False):
+        if not response.success():
+            current_app.logger.warning("Failed to count the records of OAI sets.")
+            continue
+        for spec, bucket in response.aggregations.sets.buckets.to_dict().items():
+            counts[spec] = bucket["doc_count"]
+    return counts
+
+
+def get_counts(specs):
+    """Get the record counts of sets, counting only the ones not cached.
+
+    :param specs: Specs of the sets.
+    :returns: Dictionary of the record count of each set, ``None`` if unknown.
+    """
+    specs = list(specs)
+    if not specs:
+        return {}
+
+    cached = current_cache.get_many(*[_cache_key(spec) for spec in specs])
+    counts = dict(zip(specs, cached))
+    missing = [spec for spec, count in counts.items() if count is None]
+    if missing:
+        computed = count_records(missing)
+        _store(computed)
+        counts.update(computed)
+    return counts
+
+
+def refresh_counts():
+    """Count the records of all sets, and cache the counts.
+
+    :returns: Number of counted sets.
+    """
+    specs = [spec for spec, in OAISet.query.with_entities(OAISet.spec)]
+    counts = count_records(specs)
+    _store(counts)
+    return len(counts)
+
+
+def last_updated():
+    """Get the time the cached record counts were last updated, if known."""
+    return current_cache.get(UPDATED_CACHE_KEY)
+
+
+def forget(spec):
+    """Remove the cached record count of a set, e.g. when its query changes."""
+    current_cache.delete(_cache_key(spec))
+
+
+def _store(counts):
+    """Cache record counts."""
+    if counts:
+        current_cache.set_many(
+            {_cache_key(spec): count for spec, count in counts.items()},
+            timeout=current_app.config["RDM_OAI_PMH_SET_COUNTS_TTL"],
+        )
+        current_cache.set(UPDATED_CACHE_KEY, datetime.now(timezone.utc), timeout=0)
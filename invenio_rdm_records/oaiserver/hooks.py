@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Configurable hooks into the OAI-PMH responses of Invenio-OAIServer.
+
+Invenio-OAIServer does not allow configuring how the harvested records and
+their sets are fetched. Its response module is instead pointed once to the
+functions below, which call the functions configured for the current
+application, or fall back to the ones of Invenio-OAIServer.
+"""
+
+from flask import current_app
+from invenio_base.utils import obj_or_import_string
+from invenio_oaiserver import response
+from invenio_oaiserver.percolator import sets_search_all
+from invenio_oaiserver.query import get_records as scroll_get_records
+
+
+def _configured(key, default):
+    """Get the function configured for the current application."""
+    return obj_or_import_string(current_app.config.get(key)) or default
+
+
+def get_records(**kwargs):
+    """Get a page of the harvested records.
+
+    See ``RDM_OAI_PMH_RECORDS_FETCHER``.
+    """
+    return _configured("RDM_OAI_PMH_RECORDS_FETCHER", scroll_get_records)(**kwargs)
+
+
+def records_sets(records):
+    """List the sets of the records of a harvested page.
+
+    See ``RDM_OAI_PMH_RECORDS_SETS_FETCHER``.
+    """
+    return _configured("RDM_OAI_PMH_RECORDS_SETS_FETCHER", sets_search_all)(records)
+
+
+def init_response_hooks():
+    """Point the OAI-PMH responses to the configurable hooks."""
+    response.get_records = get_records
+    response.sets_search_all = records_sets
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Database models for the OAI-PMH server."""
+
+from datetime import datetime
+
+from invenio_db import db
+from sqlalchemy_utils import UUIDType
+
+from ..records.models import RDMRecordMetadata
+
+
+class OAIRenderCache(db.Model):
+    """Rendered OAI-PMH metadata of a record, in a given format.
+
+    An entry is only valid for the revision (and content hash of the search
+    document) of the record it was rendered from.
+    """
+
+    __tablename__ = "rdm_records_oai_render_cache"
+
+    record_id = db.Column(
+        UUIDType,
+        db.ForeignKey(RDMRecordMetadata.id, ondelete="CASCADE"),
+        primary_key=True,
+    )
+    """ID of the rendered record."""
+
+    format = db.Column(db.String(64), primary_key=True)
+    """Name of the metadata format."""
+
+    revision_id = db.Column(db.Integer, nullable=False)
+    """Revision of the rendered record."""
+
+    content_hash = db.Column(db.String(40), nullable=True)
+    """Content hash of the search document the record was rendered from."""
+
+    xml = db.Column(db.LargeBinary, nullable=False)
+    """Rendered metadata, as serialized XML."""
+
+    updated = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    """Rendering timestamp."""
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Cursor-based paging of the OAI-PMH record lists.
+
+Invenio-OAIServer pages through ``ListRecords`` and ``ListIdentifiers`` results
+with scroll contexts, which are held open on the search cluster until they
+expire. Instead, the results are sorted on a stable key (last update, then ID),
+and the sort values of the last record of a page are passed in the resumption
+token. The next page is fetched with ``search_after``, so resuming a harvest does
+not need any state on the cluster.
+
+Records updated during a harvest move to the end of the list, so they are
+harvested again rather than skipped. The total number of records is only
+counted for the first page, and carried in the resumption token.
+"""
+
+import json
+from datetime import datetime
+
+from flask import current_app, g
+from invenio_oaiserver.errors import OAINoRecordsMatchError
+from invenio_oaiserver.proxies import current_oaiserver
+
+from . import sets
+
+
+class CursorPagination:
+    """Page of OAI-PMH records, with the cursor of the next page."""
+
+    def __init__(self, response, page, per_page, total=None):
+        """Constructor.
+
+        :param total: Total number of records, if counted by a previous page.
+        """
+        self.response = response
+        self.page = page
+        self.per_page = per_page
+        self.total = response["hits"]["total"]["value"] if total is None else total
+        if self.total == 0:
+            raise OAINoRecordsMatchError()
+
+        hits = response["hits"]["hits"]
+        self.has_next = len(hits) == per_page and page * per_page < self.total
+        self.next_num = page + 1 if self.has_next else None
+        # the resumption token stores the cursor in place of a scroll ID
+        self._scroll_id = (
+            json.dumps({"search_after": hits[-1]["sort"], "total": self.total})
+            if self.has_next
+            else None
+        )
+
+    @property
+    def items(self):
+        """Return iterator."""
+        for result in self.response["hits"]["hits"]:
+            yield {
+                "id": result["_id"],
+                "json": result,
+                "updated": datetime.strptime(
+                    result["_source"][current_oaiserver.last_update_key][:19],
+                    "%Y-%m-%dT%H:%M:%S",
+                ),
+            }
+
+
+def _parse_cursor(cursor):
+    """Get the ``search_after`` values and the total of a resumption token cursor."""
+    if not cursor:
+        return None, None
+    cursor = json.loads(cursor)
+    if isinstance(cursor, list):
+        # issued before the total was carried in the resumption tokens
+        return cursor, None
+    return cursor["search_after"], cursor["total"]
+
+
+def get_records(**kwargs):
+    """Get a page of OAI-PMH records, starting after the cursor of the token.
+
+    See ``RDM_OAI_PMH_RECORDS_FETCHER``.
+    """
+    token = kwargs.get("resumptionToken", {})
+    page = token.get("page", 1)
+    size = current_app.config["OAISERVER_PAGE_SIZE"]
+    search_after, total = _parse_cursor(token.get("scroll_id"))
+
+    search = (
+        current_oaiserver.search_cls(index=current_app.config["OAISERVER_RECORD_INDEX"])
+        .sort(current_oaiserver.last_update_key, "id")
+        .extra(size=size, track_total_hits=total is None, version=True)
+    )
+
+    if "set" in kwargs:
+        if sets.is_enabled():
+            search = search.filter(sets.set_records_query(kwargs["set"]))
+        else:
+            search = search.query(
+                current_oaiserver.set_records_query_fetcher(kwargs["set"])
+            )
+
+    time_range = {}
+    if "from_" in kwargs:
+        time_range["gte"] = kwargs["from_"]
+    if "until" in kwargs:
+        time_range["lte"] = kwargs["until"]
+    if time_range:
+        search = search.filter(
+            "range", **{current_oaiserver.last_update_key: time_range}
+        )
+
+    if search_after:
+        search = search.extra(search_after=search_after)
+
+    # imported here, since the records package is not loaded yet on import
+    from .render_cache import ENTRIES_KEY
+
+    result = search.execute().to_dict()
+    # the render cache entries of the page are then loaded at once
+    g.rdm_records_oai_page_sources = [hit["_source"] for hit in result["hits"]["hits"]]
+    g.pop(ENTRIES_KEY, None)
+    return CursorPagination(result, page, size, total=total)
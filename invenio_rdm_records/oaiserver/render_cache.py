@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Persistent cache of the rendered OAI-PMH metadata of records.
+
+Harvesters repeatedly request the same records in the same formats, while
+rendering the metadata (i.e. dumping the record, and building the XML tree) is
+comparatively expensive. The rendered XML is thus stored in the database, per
+record and format, together with the revision of the record (and the content
+hash of the search document) it was rendered from. An entry is only used as long
+as both still match the record being served.
+
+Only the renderings for anonymous harvesters are cached, as the output of some
+formats depends on the permissions of the requesting identity.
+"""
+
+from functools import wraps
+from itertools import islice
+
+from flask import after_this_request, current_app, g, has_request_context
+from flask_principal import AnonymousIdentity
+from invenio_access.permissions import any_user, authenticated_user
+from invenio_db import db
+from invenio_oaiserver.proxies import current_oaiserver
+from invenio_oaiserver.utils import serializer
+from lxml import etree
+from sqlalchemy.exc import SQLAlchemyError
+
+from .models import OAIRenderCache
+
+ENTRIES_KEY = "rdm_records_oai_render_cache_entries"
+"""Key of the loaded cache entries in the application context globals."""
+
+PENDING_KEY = "rdm_records_oai_render_cache_pending"
+"""Key of the cache entries to write in the application context globals."""
+
+
+def _entry_key(source):
+    """Get the record ID, revision and content hash of a search document.
+
+    Only search documents (e.g. from ``ListRecords``) carry the record's UUID and
+    version, so ``None`` is returned for other dumps.
+    """
+    if "uuid" not in source or "version_id" not in source:
+        return None
+    # the version of the search document is the revision of the record plus one
+    return source["uuid"], source["version_id"] - 1, source.get("content_hash")
+
+
+def _is_enabled():
+    """Check whether the cache can be used for the current request."""
+    if not current_app.config.get("RDM_OAI_RENDER_CACHE_ENABLED", False):
+        return False
+    identity = getattr(g, "identity", None)
+    return identity is not None and authenticated_user not in identity.provides
+
+
+def _entry(record_id, format_name):
+    """Get the cache entry of a record, if any.
+
+    The entries of all the records of the harvested page (if any) are loaded at
+    once, when the first one is needed (see ``oaiserver.query.get_records()``).
+    """
+    entries = g.setdefault(ENTRIES_KEY, {}).setdefault(format_name, {})
+    if record_id not in entries:
+        page = g.get("rdm_records_oai_page_sources") or []
+        record_ids = {record_id} | {s["uuid"] for s in page if "uuid" in s}
+        record_ids -= entries.keys()
+        entries.update(dict.fromkeys(record_ids))
+        query = OAIRenderCache.query.filter(
+            OAIRenderCache.format == format_name,
+            OAIRenderCache.record_id.in_(list(record_ids)),
+        )
+        for entry in query:
+            entries[str(entry.record_id)] = entry
+    return entries[record_id]
+
+
+def _store(entry, record_id, format_name, revision_id, content_hash, xml):
+    """Queue the creation or update of a cache entry.
+
+    During a request, the queued entries are written at once after the response
+    is built. Otherwise, they are only written by :func:`flush`.
+    """
+    pending = g.setdefault(PENDING_KEY, {})
+    pending[(record_id, format_name)] = (entry, revision_id, content_hash, xml)
+    if has_request_context() and len(pending) == 1:
+        after_this_request(_flush_response)
+
+
+def _flush_response(response):
+    """Write the queued cache entries after a response."""
+    flush()
+    return response
+
+
+def flush():
+    """Write the queued cache entries in one transaction, without failing."""
+    pending = g.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    try:
+        with db.session.begin_nested():
+            for (record_id, format_name), values in pending.items():
+                entry, revision_id, content_hash, xml = values
+                if entry is None:
+                    entry = OAIRenderCache(record_id=record_id, format=format_name)
+                    db.session.add(entry)
+                entry.revision_id = revision_id
+                entry.content_hash = content_hash
+                entry.xml = xml
+        db.session.commit()
+    except SQLAlchemyError:
+        # e.g. the same records rendered concurrently by another request
+        db.session.rollback()
+        current_app.logger.warning(
+            "Could not cache the OAI-PMH renderings of {0} records".format(
+                len(pending)
+            ),
+            exc_info=True,
+        )
+    finally:
+        # the loaded entries are stale once written (or rolled back)
+        g.pop(ENTRIES_KEY, None)
+
+
+def render_cached(format_name):
+    """Decorate an OAI-PMH format function to cache its output.
+
+    Calls with additional serializer keyword arguments are never cached.
+
+    :param format_name: Name under which the renderings are stored.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def inner(pid, record, **kwargs):
+            key = _entry_key(record["_source"])
+            if kwargs or key is None or not _is_enabled():
+                return f(pid, record, **kwargs)
+
+            record_id, revision_id, content_hash = key
+            entry = _entry(record_id, format_name)
+            if (
+                entry is not None
+                and entry.revision_id == revision_id
+                and entry.content_hash == content_hash
+            ):
+                return etree.fromstring(entry.xml)
+
+            tree = f(pid, record)
+            _store(
+                entry,
+                record_id,
+                format_name,
+                revision_id,
+                content_hash,
+                etree.tostring(tree),
+            )
+            return tree
+
+        inner.render_cache_format = format_name
+        return inner
+
+    return decorator
+
+
+def cached_prefixes(prefixes=None):
+    """Get the metadata prefixes whose format function is cached.
+
+    :param prefixes: Prefixes to pick from. Defaults to all configured prefixes.
+    """
+    formats = current_app.config["OAISERVER_METADATA_FORMATS"]
+    result = []
+    for prefix in prefixes or formats:
+        f = serializer(prefix)
+        # prefixes configured with serializer keyword arguments are never cached
+        if getattr(f, "keywords", None):
+            continue
+        if hasattr(getattr(f, "func", f), "render_cache_format"):
+            result.append(prefix)
+    return result
+
+
+def _chunks(iterable, size):
+    """Split an iterable in lists of a given size."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def warmup(prefixes=None, record_ids=None, progress_callback=None, batch_size=100):
+    """Render the metadata of the harvestable records into the cache.
+
+    :param prefixes: Metadata prefixes to render. Defaults to all cached formats.
+    :param record_ids: Only render these records. Defaults to all records.
+    :param progress_callback: Called with the number of rendered records.
+    :param batch_size: Number of records rendered, and stored, at once.
+    :returns: Number of rendered records.
+    """
+    prefixes = cached_prefixes(prefixes)
+    search = current_oaiserver.search_cls(
+        index=current_app.config["OAISERVER_RECORD_INDEX"]
+    )
+    if record_ids is not None:
+        search = search.filter("ids", values=[str(id_) for id_ in record_ids])
+
+    # render as an anonymous harvester would
+    previous_identity = g.pop("identity", None)
+    g.identity = AnonymousIdentity()
+    g.identity.provides.add(any_user)
+    rendered = 0
+    try:
+        for hits in _chunks(search.scan(), batch_size):
+            # rendered like a harvested page, see ``oaiserver.query.get_records()``
+            sources = [hit.to_dict() for hit in hits]
+            g.rdm_records_oai_page_sources = sources
+            for hit, source in zip(hits, sources):
+                try:
+                    pid = current_oaiserver.oaiid_fetcher(hit.meta.id, source)
+                    for prefix in prefixes:
+                        serializer(prefix)(pid, {"_source": source})
+                except Exception:
+                    current_app.logger.error(
+                        "Failed to render the OAI-PMH metadata of record {0}".format(
+                            hit.meta.id
+                        ),
+                        exc_info=True,
+                    )
+                    continue
+                rendered += 1
+                if progress_callback:
+                    progress_callback(rendered)
+            flush()
+    finally:
+        g.pop("identity")
+        if previous_identity is not None:
+            g.identity = previous_identity
+        for key in ("rdm_records_oai_page_sources", "rdm_records_oai_links_tpl"):
+            g.pop(key, None)
+
+    return rendered
+
+
+def invalidate(record_ids=None, formats=None):
+    """Delete cached renderings.
+
+    :param record_ids: Only delete the renderings of these records.
+    :param formats: Only delete the renderings in these formats.
+    :returns: Number of deleted entries.
+    """
+    query = OAIRenderCache.query
+    if record_ids is not None:
+        query = query.filter(OAIRenderCache.record_id.in_(list(record_ids)))
+    if formats is not None:
+        query = query.filter(OAIRenderCache.format.in_(list(formats)))
+    deleted = query.delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
@@ -59,6 +59,7 @@ class OAIPMHServerResourceConfig(ResourceConfig, ConfiguratorMixin):
         "set-prefix": "/sets",
         "list": "",
         "item": "/<id>",
+        "counts": "/counts",
         "format-prefix": "/formats",
     }
 
@@ -66,5 +67,6 @@ class OAIPMHServerResourceConfig(ResourceConfig, ConfiguratorMixin):
     request_read_args = {}
     request_view_args = {"id": ma.fields.Int()}
     request_search_args = OAIPMHServerSearchRequestArgsSchema
+    request_counts_args = {"spec": ma.fields.List(ma.fields.Str())}
 
     error_handlers = oaipmh_error_handlers
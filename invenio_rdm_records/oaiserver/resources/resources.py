@@ -7,8 +7,18 @@
 
 """OAI-PMH resource."""
 
-from flask import g
-from flask_resources import Resource, resource_requestctx, response_handler, route
+import hashlib
+import json
+
+from flask import Response, g, request
+from flask_resources import (
+    Resource,
+    from_conf,
+    request_parser,
+    resource_requestctx,
+    response_handler,
+    route,
+)
 from invenio_records_resources.resources.errors import ErrorHandlersMixin
 from invenio_records_resources.resources.records.resource import (
     request_data,
@@ -17,6 +27,26 @@ from invenio_records_resources.resources.records.resource import (
     request_view_args,
 )
 
+request_counts_args = request_parser(from_conf("request_counts_args"), location="args")
+
+
+def _is_not_modified(etag, last_modified=None):
+    """Check whether the copy of the client is still valid."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified and request.if_modified_since:
+        # HTTP dates have a resolution of one second
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def _set_validators(response, etag, last_modified=None):
+    """Set the validators of a response."""
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    return response
+
 
 class OAIPMHServerResource(ErrorHandlersMixin, Resource):
     """OAI-PMH server resource."""
@@ -32,6 +62,7 @@ class OAIPMHServerResource(ErrorHandlersMixin, Resource):
         url_rules = [
             route("GET", routes["set-prefix"] + routes["list"], self.search),
             route("POST", routes["set-prefix"], self.create),
+            route("GET", routes["set-prefix"] + routes["counts"], self.read_counts),
             route("GET", routes["set-prefix"] + routes["item"], self.read),
             route("PUT", routes["set-prefix"] + routes["item"], self.update),
             route("DELETE", routes["set-prefix"] + routes["item"], self.delete),
@@ -48,15 +79,41 @@ class OAIPMHServerResource(ErrorHandlersMixin, Resource):
     # Primary Interface
     #
     @request_search_args
-    @response_handler(many=True)
     def search(self):
-        """Perform a search over the items."""
-        identity = g.identity
+        """Perform a search over the items, answering conditional requests."""
+        etag, last_modified = self.service.read_sets_validators(g.identity)
+        if _is_not_modified(etag, last_modified):
+            return _set_validators(Response(status=304), etag, last_modified)
+
         hits = self.service.search(
-            identity=identity,
+            identity=g.identity,
             params=resource_requestctx.args,
         )
-        return hits.to_dict(), 200
+        # the search may have updated the record counts of the listed sets
+        etag, last_modified = self.service.read_sets_validators(
+            g.identity, sets_last_modified=hits.sets_last_modified
+        )
+        return _set_validators(
+            self._serialize_list(hits.to_dict()), etag, last_modified
+        )
+
+    @response_handler(many=True)
+    def _serialize_list(self, hits):
+        """Serialize a list of items."""
+        return hits, 200
+
+    @request_counts_args
+    @response_handler()
+    def read_counts(self):
+        """Read the record counts of sets."""
+        counts = self.service.read_counts(
+            g.identity,
+            specs=resource_requestctx.args.get("spec") or None,
+        )
+        hits = [
+            {"spec": spec, "records_count": count} for spec, count in counts.items()
+        ]
+        return {"hits": {"hits": hits, "total": len(hits)}}, 200
 
     @request_data
     @response_handler()
@@ -103,11 +160,10 @@ class OAIPMHServerResource(ErrorHandlersMixin, Resource):
         return "", 204
 
     @request_search_args
-    @response_handler(many=True)
     def read_formats(self):
-        """Perform a search over the formats."""
-        identity = g.identity
-        hits = self.service.read_all_formats(
-            identity=identity,
-        )
-        return hits.to_dict(), 200
+        """Perform a search over the formats, answering conditional requests."""
+        hits = self.service.read_all_formats(identity=g.identity).to_dict()
+        etag = hashlib.md5(json.dumps(hits, sort_keys=True).encode()).hexdigest()
+        if _is_not_modified(etag):
+            return _set_validators(Response(status=304), etag)
+        return _set_validators(self._serialize_list(hits), etag)
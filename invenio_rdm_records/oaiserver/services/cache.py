@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Versioned in-process caches of the OAI-PMH service.
+
+The version of the OAI sets is the time of their last change, shared between
+processes through the cache. It is updated by the unit of work operations which
+change the sets, so that every process drops its cached set listings on the next
+request, and clients can validate their copies without querying the database.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from invenio_cache import current_cache
+
+SETS_VERSION_CACHE_KEY = "rdm_records:oai_sets:last_modified"
+"""Cache key of the time of the last change of the OAI sets."""
+
+
+def sets_last_modified():
+    """Get the time of the last change of the OAI sets.
+
+    If unknown (e.g. the cache was cleared), the current time is used from now
+    on, which invalidates all the copies of the set listings.
+    """
+    last_modified = current_cache.get(SETS_VERSION_CACHE_KEY)
+    if last_modified is None:
+        last_modified = touch_sets()
+    return last_modified
+
+
+def touch_sets():
+    """Record a change of the OAI sets.
+
+    :returns: The new time of the last change.
+    """
+    last_modified = datetime.now(timezone.utc)
+    current_cache.set(SETS_VERSION_CACHE_KEY, last_modified, timeout=0)
+    return last_modified
+
+
+class VersionedCache:
+    """Bounded in-process cache whose entries are valid for a single version.
+
+    All the entries are dropped as soon as a different version is requested,
+    and each entry expires after a while, in case a change of the version was
+    missed (e.g. the shared version was lost with the cache).
+    """
+
+    def __init__(self, maxsize=256, ttl=5 * 60):
+        """Constructor.
+
+        :param maxsize: Maximum number of entries.
+        :param ttl: Time (in seconds) after which an entry expires.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = OrderedDict()
+
+    def _sync(self, version):
+        """Drop the entries of other versions. Must be called with the lock."""
+        if version != self._version:
+            self._version = version
+            self._entries.clear()
+
+    def get(self, version, key):
+        """Get the entry of a key, or ``None`` if not cached for the version."""
+        with self._lock:
+            self._sync(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if time.monotonic() >= expires:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, version, key, value):
+        """Cache the entry of a key for a version."""
+        with self._lock:
+            self._sync(version)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all the entries."""
+        with self._lock:
+            self._version = None
+            self._entries.clear()
@@ -141,10 +141,43 @@ class BaseServiceListResult(ServiceListResult):
 class OAISetItem(BaseServiceItemResult):
     """Single OAI-PMH set result item."""
 
+    def __init__(self, *args, records_count=None, **kwargs):
+        """Constructor."""
+        super().__init__(*args, **kwargs)
+        self._records_count = records_count
+
+    @property
+    def data(self):
+        """Property to get the set, with its record count if known."""
+        data = super().data
+        if self._records_count is not None:
+            data["records_count"] = self._records_count
+        return data
+
 
 class OAISetList(BaseServiceListResult):
     """List of OAI-PMH set result items."""
 
+    def __init__(self, *args, records_counts=None, sets_last_modified=None, **kwargs):
+        """Constructor."""
+        super().__init__(*args, **kwargs)
+        self._records_counts = records_counts or {}
+        self._sets_last_modified = sets_last_modified
+
+    @property
+    def sets_last_modified(self):
+        """Time of the last change of the sets, when they were listed."""
+        return self._sets_last_modified
+
+    @property
+    def hits(self):
+        """Iterator over the hits, with the record counts of the sets if known."""
+        for hit, projection in zip(self._results.items, super().hits):
+            count = self._records_counts.get(hit.spec)
+            if count is not None:
+                projection["records_count"] = count
+            yield projection
+
 
 class OAIMetadataFormatItem(BaseServiceItemResult):
     """Single OAI-PMH metadata format result item."""
@@ -36,6 +36,8 @@ class OAIPMHSetSchema(Schema):
     updated = fields.DateTime(dump_only=True)
     system_created = fields.Boolean(dump_only=True)
     id = fields.Int(dump_only=True)
+    # added by the result items, from the cached record counts
+    records_count = fields.Int(dump_only=True)
 
     class Meta:
         """Meta attributes for the schema."""
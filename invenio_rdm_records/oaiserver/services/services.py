@@ -17,12 +17,14 @@ from invenio_records_resources.services import Service
 from invenio_records_resources.services.base import LinksTemplate
 from invenio_records_resources.services.base.utils import map_search_params
 from invenio_records_resources.services.records.schema import ServiceSchemaWrapper
-from invenio_records_resources.services.uow import unit_of_work
+from invenio_records_resources.services.uow import TaskOp, unit_of_work
 from marshmallow import ValidationError
-from sqlalchemy import or_
+from sqlalchemy import func, or_
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.sql import text
 
+from invenio_rdm_records.oaiserver import counts
+from invenio_rdm_records.oaiserver.services import cache
 from invenio_rdm_records.oaiserver.services.errors import (
     OAIPMHSetDoesNotExistError,
     OAIPMHSetIDDoesNotExistError,
@@ -30,6 +32,8 @@ from invenio_rdm_records.oaiserver.services.errors import (
     OAIPMHSetSpecAlreadyExistsError,
 )
 from invenio_rdm_records.oaiserver.services.uow import OAISetCommitOp, OAISetDeleteOp
+from invenio_rdm_records.oaiserver.sets import is_enabled as materialized_sets_enabled
+from invenio_rdm_records.services.tasks import reclassify_oai_set
 
 
 class OAIPMHServerService(Service):
@@ -39,6 +43,8 @@ class OAIPMHServerService(Service):
         """Init service with config."""
         super().__init__(config)
         self.reserved_prefixes = config.reserved_prefixes.union(extra_reserved_prefixes)
+        self._sets_cache = cache.VersionedCache()
+        self._formats_cache = cache.VersionedCache(maxsize=1)
 
     @property
     def schema(self):
@@ -65,6 +71,21 @@ class OAIPMHServerService(Service):
             errors.append(str(e))
         return set, errors
 
+    def _reclassify(self, spec, uow):
+        """Reclassify the records of a set, once its changes are committed."""
+        if materialized_sets_enabled():
+            uow.register(TaskOp(reclassify_oai_set, spec))
+
+    def _records_counts(self, specs):
+        """Get the cached record counts of sets, without failing the request."""
+        try:
+            return counts.get_counts(specs)
+        except Exception:
+            current_app.logger.warning(
+                "Could not count the records of the OAI sets.", exc_info=True
+            )
+            return {}
+
     def _validate_spec(self, spec):
         """Checks the validity of the provided spec."""
         # Reserved for community integration
@@ -108,6 +129,7 @@ class OAIPMHServerService(Service):
             raise OAIPMHSetSpecAlreadyExistsError(new_set.spec)
 
         uow.register(OAISetCommitOp(new_set))
+        self._reclassify(new_set.spec, uow)
         return self.result_item(
             service=self,
             identity=identity,
@@ -125,14 +147,71 @@ class OAIPMHServerService(Service):
             identity=identity,
             item=oai_set,
             links_tpl=self.links_item_tpl,
+            records_count=self._records_counts([oai_set.spec]).get(oai_set.spec),
+        )
+
+    def read_counts(self, identity, specs=None):
+        """Get the record counts of OAI sets.
+
+        The counts are cached for ``RDM_OAI_PMH_SET_COUNTS_TTL`` seconds, and
+        only the sets whose count is not cached are counted, all at once.
+
+        :param specs: Specs of the sets. Defaults to all sets.
+        :returns: Dictionary of the record count of each set, ``None`` if unknown.
+        """
+        self.require_permission(identity, "read")
+        if specs is None:
+            specs = [spec for spec, in OAISet.query.with_entities(OAISet.spec)]
+        return counts.get_counts(specs)
+
+    def read_sets_validators(self, identity, sets_last_modified=None):
+        """Get the validators of the set listings, without querying the database.
+
+        :param sets_last_modified: Time of the last change of the sets, as used
+            for a listing. Defaults to the current one.
+        :returns: Tuple with the entity tag and the time of the last change of
+            the set listings (including the record counts of the sets).
+        """
+        self.require_permission(identity, "read")
+        last_modified = sets_last_modified or cache.sets_last_modified()
+        counts_updated = counts.last_updated()
+        etag = "{0}-{1}".format(
+            last_modified.timestamp(),
+            counts_updated.timestamp() if counts_updated else 0,
         )
+        if counts_updated and counts_updated > last_modified:
+            last_modified = counts_updated
+        return etag, last_modified
 
     def search(self, identity, params):
-        """Perform search over OAI sets."""
+        """Perform search over OAI sets.
+
+        The pages of sets are cached in the process until the sets are changed.
+        """
         self.require_permission(identity, "read")
 
         search_params = map_search_params(self.config.search, params)
+        # read before the query, so that concurrent changes drop the cached page
+        version = cache.sets_last_modified()
+        cache_key = tuple(sorted((k, str(v)) for k, v in params.items()))
+        oai_sets = self._sets_cache.get(version, cache_key)
+        if oai_sets is None:
+            oai_sets = self._search_sets(search_params)
+            self._sets_cache.set(version, cache_key, oai_sets)
 
+        return self.result_list(
+            self,
+            identity,
+            oai_sets,
+            params=search_params,
+            links_tpl=LinksTemplate(self.config.links_search, context={"args": params}),
+            links_item_tpl=self.links_item_tpl,
+            records_counts=self._records_counts([s.spec for s in oai_sets.items]),
+            sets_last_modified=version,
+        )
+
+    def _search_sets(self, search_params):
+        """Query a page of sets, detached from the database session."""
         query_param = search_params["q"]
         filters = []
 
@@ -144,25 +223,35 @@ class OAIPMHServerService(Service):
                 ]
             )
 
-        oai_sets = (
-            OAISet.query.filter(or_(*filters))
+        # the total is computed along with the page, instead of a separate COUNT
+        page, size = search_params["page"], search_params["size"]
+        query = OAISet.query.filter(or_(*filters))
+        rows = (
+            query.add_columns(func.count().over().label("total"))
             .order_by(
                 search_params["sort_direction"](text(",".join(search_params["sort"])))
             )
-            .paginate(
-                page=search_params["page"],
-                per_page=search_params["size"],
-                error_out=False,
-            )
+            .limit(size)
+            .offset((page - 1) * size)
+            .all()
         )
-
-        return self.result_list(
-            self,
-            identity,
-            oai_sets,
-            params=search_params,
-            links_tpl=LinksTemplate(self.config.links_search, context={"args": params}),
-            links_item_tpl=self.links_item_tpl,
+        if rows:
+            total = rows[0].total
+        else:
+            # only needed for pages past the end of the results
+            total = query.count() if page > 1 else 0
+
+        columns = [column.key for column in OAISet.__table__.columns]
+        return Pagination(
+            query=None,
+            page=page,
+            per_page=size,
+            total=total,
+            # transient copies, which can be shared between requests
+            items=[
+                OAISet(**{key: getattr(row.OAISet, key) for key in columns})
+                for row in rows
+            ],
         )
 
     @unit_of_work()
@@ -179,9 +268,13 @@ class OAIPMHServerService(Service):
             raise_errors=True,
         )
 
+        previous_pattern = oai_set.search_pattern
         for key, value in valid_data.items():
             setattr(oai_set, key, value)
         uow.register(OAISetCommitOp(oai_set))
+        if oai_set.search_pattern != previous_pattern:
+            self._reclassify(oai_set.spec, uow)
+            counts.forget(oai_set.spec)
 
         return self.result_item(
             service=self,
@@ -198,20 +291,29 @@ class OAIPMHServerService(Service):
         if oai_set.system_created:
             raise OAIPMHSetNotEditable(oai_set.id)
         uow.register(OAISetDeleteOp(oai_set))
+        self._reclassify(oai_set.spec, uow)
+        counts.forget(oai_set.spec)
 
         return True
 
     def read_all_formats(self, identity):
-        """Read available metadata formats."""
+        """Read available metadata formats.
+
+        The formats are built once per configuration of the metadata formats.
+        """
         self.require_permission(identity, "read_format")
-        formats = [
-            {
-                "id": k,
-                "schema": v.get("schema", None),
-                "namespace": v.get("namespace", None),
-            }
-            for k, v in current_app.config.get("OAISERVER_METADATA_FORMATS").items()
-        ]
+        formats_config = current_app.config.get("OAISERVER_METADATA_FORMATS")
+        formats = self._formats_cache.get(id(formats_config), "formats")
+        if formats is None:
+            formats = [
+                {
+                    "id": k,
+                    "schema": v.get("schema", None),
+                    "namespace": v.get("namespace", None),
+                }
+                for k, v in formats_config.items()
+            ]
+            self._formats_cache.set(id(formats_config), "formats", formats)
 
         results = Pagination(
             query=None,
@@ -11,6 +11,8 @@
 from invenio_db import db
 from invenio_records_resources.services.uow import Operation
 
+from .cache import touch_sets
+
 
 class OAISetCommitOp(Operation):
     """OAI-PMH set add/update operation."""
@@ -24,6 +26,10 @@ class OAISetCommitOp(Operation):
         """Add set to db session."""
         db.session.add(self._oai_set)
 
+    def on_post_commit(self, uow):
+        """Invalidate the cached set listings."""
+        touch_sets()
+
 
 class OAISetDeleteOp(Operation):
     """OAI-PMH set delete operation."""
@@ -36,3 +42,7 @@ class OAISetDeleteOp(Operation):
     def on_register(self, uow):
         """Hard delete set."""
         db.session.delete(self._oai_set)
+
+    def on_post_commit(self, uow):
+        """Invalidate the cached set listings."""
+        touch_sets()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Materialized membership of records in OAI sets.
+
+Instead of running the query of a set on every harvest of the set (and
+percolating every page of harvested records to list their sets), the records
+are matched against the queries of all sets when they are indexed, and the specs
+of the matching sets are stored in a keyword field of the search documents.
+
+When the query of a set changes, the records which may have joined or left it
+are reclassified in the background, in bounded batches. Records which have not
+been classified yet (e.g. indexed before the sets were materialized) are still
+matched with the query of the set. The classified documents are marked as such,
+since the documents which are not in any set do not hold any spec.
+"""
+
+from flask import current_app
+from invenio_oaiserver.percolator import sets_search_all as percolate_sets
+from invenio_oaiserver.proxies import current_oaiserver
+from invenio_search import current_search_client
+from invenio_search.engine import dsl
+from invenio_search.utils import build_alias_name
+
+SETS_FIELD = "oai_sets"
+"""Field of the search documents holding the specs of the record's sets."""
+
+CLASSIFIED_FIELD = "oai_sets_classified"
+"""Field of the search documents marking them as classified."""
+
+
+def is_enabled():
+    """Check whether the set membership is materialized."""
+    return current_app.config.get("RDM_OAI_PMH_MATERIALIZED_SETS", False)
+
+
+def is_harvested_index(index):
+    """Check whether the documents of an index are harvested through OAI-PMH.
+
+    :param index: Index of a record class, whose name and search alias are
+        compared with the (aliased) ``OAISERVER_RECORD_INDEX``.
+    """
+    oai_index = str(current_app.config.get("OAISERVER_RECORD_INDEX") or "")
+    if not oai_index:
+        return False
+    names = {index._name, getattr(index, "search_alias", index._name)}
+    return build_alias_name(oai_index) in {build_alias_name(n) for n in names}
+
+
+def classify(documents):
+    """Match search documents against all sets, and store the specs of their sets.
+
+    All documents are matched with a single percolation request.
+
+    :param documents: List of dumped search documents, modified in place.
+    """
+    if not documents:
+        return
+    fields = (SETS_FIELD, CLASSIFIED_FIELD)
+    sources = [{k: v for k, v in d.items() if k not in fields} for d in documents]
+    for document, specs in zip(documents, percolate_sets(sources)):
+        document[SETS_FIELD] = sorted(specs)
+        document[CLASSIFIED_FIELD] = True
+
+
+def set_records_query(spec, query=None):
+    """Query of the records of a set.
+
+    :param spec: Spec of the set.
+    :param query: Query of the set, if already fetched. Defaults to the one of
+        ``OAISERVER_SET_RECORDS_QUERY_FETCHER``.
+    """
+    if query is None:
+        query = current_oaiserver.set_records_query_fetcher(spec)
+    unclassified = dsl.Q(
+        "bool",
+        must_not=[dsl.Q("term", **{CLASSIFIED_FIELD: True})],
+        filter=[query],
+    )
+    return dsl.Q(
+        "bool",
+        should=[dsl.Q("term", **{SETS_FIELD: spec}), unclassified],
+        minimum_should_match=1,
+    )
+
+
+def records_sets(records):
+    """Get the sets of search documents, percolating only unclassified ones.
+
+    :param records: List of search documents.
+    :returns: List with the list of set specs of each document.
+    """
+    if not is_enabled():
+        return percolate_sets(records)
+
+    result = [
+        record.get(SETS_FIELD, []) if record.get(CLASSIFIED_FIELD) else None
+        for record in records
+    ]
+    missing = [i for i, specs in enumerate(result) if specs is None]
+    if missing:
+        percolated = percolate_sets([records[i] for i in missing])
+        for i, specs in zip(missing, percolated):
+            result[i] = specs
+    return result
+
+
+def reclassify_set(spec, search_after=None, size=1000):
+    """Reclassify one batch of the records which may have joined or left a set.
+
+    The records currently in the set, or matching its query, are matched against
+    all sets again. The records whose sets changed are then indexed again from
+    the database (which classifies them), so that the stored documents are never
+    overwritten with stale ones, e.g. if the records have been reindexed in the
+    meantime.
+
+    :param spec: Spec of the set.
+    :param search_after: Cursor returned by the previous batch.
+    :param size: Maximum number of records in the batch.
+    :returns: The cursor of the next batch, or ``None`` if this was the last one.
+    """
+    index = build_alias_name(str(current_app.config["OAISERVER_RECORD_INDEX"]))
+    query = dsl.Q(
+        "bool",
+        should=[
+            dsl.Q("term", **{SETS_FIELD: spec}),
+            current_oaiserver.set_records_query_fetcher(spec),
+        ],
+        minimum_should_match=1,
+    )
+    search_ = (
+        dsl.Search(using=current_search_client, index=index)
+        .query(query)
+        .sort("id")
+        .extra(size=size)
+    )
+    if search_after:
+        search_ = search_.extra(search_after=search_after)
+
+    hits = search_.execute().hits
+    documents = [hit.to_dict() for hit in hits]
+    previous = [
+        (document.get(SETS_FIELD), document.get(CLASSIFIED_FIELD))
+        for document in documents
+    ]
+    classify(documents)
+
+    changed = [
+        document["uuid"]
+        for document, (specs, classified) in zip(documents, previous)
+        if specs != document[SETS_FIELD] or not classified
+    ]
+    if changed:
+        from invenio_rdm_records.proxies import current_rdm_records_service
+
+        current_rdm_records_service.indexer.index_records(changed)
+
+    if len(hits) < size:
+        return None
+    return list(hits[-1].meta.sort)
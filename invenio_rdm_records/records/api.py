@@ -41,9 +41,11 @@ from invenio_vocabularies.records.systemfields.relations import CustomFieldsRela
 
 from . import models
 from .dumpers import (
+    ContentHashDumperExt,
     EDTFDumperExt,
     EDTFListDumperExt,
     GrantTokensDumperExt,
+    OAISetsDumperExt,
     StatisticsDumperExt,
 )
 from .systemfields import (
@@ -113,6 +115,9 @@ class CommonFieldsMixin:
             RelationDumperExt("relations"),
             CustomFieldsDumperExt(fields_var="RDM_CUSTOM_FIELDS"),
             StatisticsDumperExt("stats"),
+            OAISetsDumperExt("oai_sets"),
+            # must come last, to hash the output of the other extensions
+            ContentHashDumperExt("content_hash", exclude=["stats"]),
         ]
     )
 
@@ -8,16 +8,20 @@
 """Search dumpers, for transforming to and from versions to index."""
 
 from .access import GrantTokensDumperExt
+from .content_hash import ContentHashDumperExt
 from .edtf import EDTFDumperExt, EDTFListDumperExt
 from .locations import LocationsDumper
+from .oai_sets import OAISetsDumperExt
 from .pids import PIDsDumperExt
 from .statistics import StatisticsDumperExt
 
 __all__ = (
+    "ContentHashDumperExt",
     "EDTFDumperExt",
     "EDTFListDumperExt",
     "PIDsDumperExt",
     "GrantTokensDumperExt",
     "LocationsDumper",
+    "OAISetsDumperExt",
     "StatisticsDumperExt",
 )
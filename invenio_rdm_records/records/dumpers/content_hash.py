@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Search dumper for the content hash of the search documents."""
+
+import hashlib
+import json
+
+from invenio_records.dumpers import SearchDumperExt
+
+
+def content_hash(data, exclude=()):
+    """Compute a stable hash of a dumped document.
+
+    :param data: The dumped document.
+    :param exclude: Top-level keys left out of the hash.
+    """
+    content = {k: v for k, v in data.items() if k not in exclude}
+    serialized = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+class ContentHashDumperExt(SearchDumperExt):
+    """Search dumper extension for the content hash of the search document.
+
+    On dump, it hashes the document as dumped by the previous extensions and
+    stores the hash in the target field, so that the indexer can skip writing
+    documents which did not change. It must thus be the last extension.
+    On load, it removes the target field from the dictionary again.
+    """
+
+    def __init__(self, target_field, exclude=None):
+        """Constructor.
+
+        :param target_field: top-level key where to dump the hash.
+        :param exclude: top-level keys which are not part of the hash (e.g. the
+                        statistics, which are updated separately).
+        """
+        super().__init__()
+        self.key = target_field
+        self.exclude = {target_field, *(exclude or [])}
+
+    def dump(self, record, data):
+        """Dump the content hash to the data dictionary."""
+        data[self.key] = content_hash(data, exclude=self.exclude)
+
+    def load(self, data, record_cls):
+        """Remove the content hash from the data dictionary."""
+        data.pop(self.key, None)
@@ -7,20 +7,11 @@
 
 """Search dumpers for ETDF dates."""
 
-import calendar
-
-from arrow import Arrow
-from edtf import parse_edtf
 from edtf.parser.edtf_exceptions import EDTFParseException
 from invenio_records.dictutils import dict_lookup, parse_lookup_key
 from invenio_records.dumpers import SearchDumperExt
-from pytz import utc
-
 
-def _format_date(date):
-    """Format the given date into ISO format."""
-    arrow = Arrow.fromtimestamp(calendar.timegm(date), tzinfo=utc)
-    return arrow.date().isoformat()
+from ...edtf import edtf_cache
 
 
 class EDTFDumperExt(SearchDumperExt):
@@ -50,11 +41,8 @@ class EDTFDumperExt(SearchDumperExt):
         """Dump the data."""
         try:
             parent_data = dict_lookup(data, self.keys, parent=True)
-            pd = parse_edtf(parent_data[self.key])
-            parent_data[self.range_key] = {
-                "gte": _format_date(pd.lower_strict()),
-                "lte": _format_date(pd.upper_strict()),
-            }
+            lower, upper = edtf_cache.bounds(parent_data[self.key])
+            parent_data[self.range_key] = {"gte": lower, "lte": upper}
 
         except (KeyError, EDTFParseException):
             # The field does not exists or had wrong data
@@ -107,11 +95,8 @@ class EDTFListDumperExt(SearchDumperExt):
 
             # EDTF parse_edtf (using pyparsing) expects a string
             for item in date_list:
-                pd = parse_edtf(item[self.key])
-                item[self.range_key] = {
-                    "gte": _format_date(pd.lower_strict()),
-                    "lte": _format_date(pd.upper_strict()),
-                }
+                lower, upper = edtf_cache.bounds(item[self.key])
+                item[self.range_key] = {"gte": lower, "lte": upper}
 
         except (KeyError, EDTFParseException):
             # The field does not exists or had wrong data
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Search dumper for the OAI sets of the search documents."""
+
+from invenio_records.dumpers import SearchDumperExt
+
+
+class OAISetsDumperExt(SearchDumperExt):
+    """Search dumper extension for the OAI sets of the search document.
+
+    The sets are not dumped here, but written by the indexer, which matches whole
+    batches of dumped documents against the sets at once.
+    On load, it removes the target field from the dictionary.
+    """
+
+    def __init__(self, target_field, classified_field=None):
+        """Constructor.
+
+        :param target_field: top-level key holding the specs of the sets.
+        :param classified_field: top-level key marking the classified documents.
+        """
+        super().__init__()
+        self.key = target_field
+        self.classified_key = classified_field or f"{target_field}_classified"
+
+    def dump(self, record, data):
+        """The sets are added by the indexer."""
+
+    def load(self, data, record_cls):
+        """Remove the sets from the data dictionary."""
+        data.pop(self.key, None)
+        data.pop(self.classified_key, None)
@@ -19,6 +19,8 @@ class StatisticsDumperExt(SearchDumperExt):
 
     On dump, it fetches the record's download & view statistics via Invenio-Stats
     queries and dumps them into a field so that they are indexed in the search engine.
+    When the record is part of a batch whose statistics have been prefetched (e.g.
+    during bulk indexing), the prefetched values are used instead.
     On load, it keeps the dumped values in the data dictionary, in order to enable
     the record schema to dump them if present.
     """
@@ -42,9 +44,12 @@ class StatisticsDumperExt(SearchDumperExt):
 
         try:
             parent_data = dict_lookup(data, self.keys, parent=True)
-            parent_data[self.key] = Statistics.get_record_stats(
-                recid=recid, parent_recid=parent_recid
-            )
+            stats = Statistics.get_prefetched_record_stats(recid)
+            if stats is None:
+                stats = Statistics.get_record_stats(
+                    recid=recid, parent_recid=parent_recid
+                )
+            parent_data[self.key] = stats
         except KeyError as e:
             current_app.logger.warning(e)
 
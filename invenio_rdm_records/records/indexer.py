@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Record indexer with batch-level prefetching for bulk indexing."""
+
+from contextlib import ExitStack, contextmanager
+from itertools import islice
+
+from flask import current_app
+from invenio_db import db
+from invenio_indexer.api import RecordIndexer
+from invenio_search.engine import dsl, search
+from sqlalchemy.orm.exc import NoResultFound
+
+from ..oaiserver import sets as oai_sets
+from .stats import Statistics
+from .systemfields.access import Owner
+
+
+def _chunks(iterable, size):
+    """Split an iterable into lists of at most ``size`` elements."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class RDMRecordIndexer(RecordIndexer):
+    """Record indexer that prefetches shared data when bulk indexing.
+
+    When processing the bulk indexing queue, messages are consumed in chunks.
+    For each chunk, the records and their parents are fetched with one query each,
+    and data that would otherwise be looked up per record while dumping (e.g. the
+    statistics, the parents' owners or the "has_draft" flag) is prefetched for the
+    whole chunk.
+    Indexing of single records is not affected.
+
+    The prefetching steps only apply to record classes that need them, so the
+    indexer can also be used for other record types (e.g. vocabularies).
+
+    When bulk indexing documents holding a content hash, the documents which are
+    already up to date in the index are not written again.
+
+    The documents of the harvestable records are matched against the OAI sets
+    before being written, with one request per batch.
+    """
+
+    bulk_chunk_size = 500
+    """Number of queued messages processed together as one batch."""
+
+    content_hash_field = "content_hash"
+    """Field of the search documents holding the hash of their content."""
+
+    unhashed_fields = ("stats", oai_sets.SETS_FIELD, oai_sets.CLASSIFIED_FIELD)
+    """Fields which are not part of the content hash, and are compared as is."""
+
+    def __init__(self, *args, index=None, **kwargs):
+        """Constructor.
+
+        :param index: Name of a concrete index to write to, instead of the write
+                      alias of the record class (e.g. while building a new index).
+        """
+        super().__init__(*args, **kwargs)
+        self._index = index
+
+    def _prepare_index(self, index):
+        """Prepare the index before an operation."""
+        if self._index:
+            return self._index
+        return super()._prepare_index(index)
+
+    def _prepare_record(self, record, index, arguments=None, classify=True, **kwargs):
+        """Prepare record data for indexing.
+
+        :param classify: Match the document against the OAI sets. Disabled for
+                         bulk indexing, where whole batches are matched at once.
+        """
+        data = super()._prepare_record(record, index, arguments=arguments, **kwargs)
+        if classify:
+            self._classify_oai_sets([data])
+        return data
+
+    def _classify_oai_sets(self, documents):
+        """Store the OAI sets of the documents of harvestable records.
+
+        Documents which cannot be matched are left unclassified, and are then
+        matched with the query of the sets when harvested.
+        """
+        if not oai_sets.is_enabled():
+            return
+        if not oai_sets.is_harvested_index(self.record_cls.index):
+            return
+        try:
+            oai_sets.classify(list(documents))
+        except Exception:
+            current_app.logger.warning("Failed to classify OAI sets.", exc_info=True)
+
+    @contextmanager
+    def prefetch(self, records):
+        """Prefetch data needed for dumping the given batch of records."""
+        records = list(records)
+        parents = self._prefetch_parents(records)
+        if hasattr(self.record_cls, "has_draft"):
+            self.record_cls.has_draft.prefetch(records)
+
+        with ExitStack() as stack:
+            # the owners are needed for the parents' "is_verified" field
+            stack.enter_context(
+                Owner.preload(parent.access.owner for parent in parents)
+            )
+
+            # statistics are only dumped for published records
+            if hasattr(self.record_cls, "stats"):
+                stack.enter_context(
+                    Statistics.prefetch(
+                        (record["id"], record.parent["id"]) for record in records
+                    )
+                )
+
+            yield
+
+    def _prefetch_parents(self, records):
+        """Fetch the parents of all records with a single query."""
+        if not hasattr(self.record_cls, "parent_record_cls"):
+            return []
+
+        parent_ids = {r.model.parent_id for r in records if r.model.parent_id}
+        if not parent_ids:
+            return []
+
+        parents = self.record_cls.parent_record_cls.get_records(parent_ids)
+        parents = {parent.id: parent for parent in parents}
+        for record in records:
+            parent = parents.get(record.model.parent_id)
+            if parent is not None:
+                self.record_cls.parent._set_cache(record, parent)
+
+        return list(parents.values())
+
+    def _actionsiter(self, message_iterator):
+        """Iterate bulk actions, prefetching shared data per chunk of messages."""
+        for messages in _chunks(message_iterator, self.bulk_chunk_size):
+            payloads = [message.decode() for message in messages]
+            record_ids = [p["id"] for p in payloads if p["op"] != "delete"]
+            records = {}
+            if record_ids:
+                records = {
+                    str(record.id): record
+                    for record in self.record_cls.get_records(record_ids)
+                }
+
+            actions = []
+            with self.prefetch(records.values()):
+                for message, payload in zip(messages, payloads):
+                    try:
+                        if payload["op"] == "delete":
+                            action = self._delete_action(payload)
+                        elif payload["id"] not in records:
+                            raise NoResultFound()
+                        else:
+                            action = self._record_index_action(records[payload["id"]])
+                        actions.append((message, action))
+                    except NoResultFound:
+                        message.reject()
+                    except Exception:
+                        message.reject()
+                        current_app.logger.error(
+                            "Failed to index record {0}".format(payload.get("id")),
+                            exc_info=True,
+                        )
+
+            self._classify_oai_sets(
+                action["_source"] for _, action in actions if "_source" in action
+            )
+            unchanged = self._unchanged_documents(action for _, action in actions)
+            for message, action in actions:
+                if (action["_index"], action["_id"]) not in unchanged:
+                    yield action
+                message.ack()
+
+    def index_records(self, record_ids, search_bulk_kwargs=None):
+        """Index records synchronously with the bulk API, bypassing the queue.
+
+        :param record_ids: Iterable of record UUIDs.
+        :param dict search_bulk_kwargs: Passed to `search.helpers.bulk`.
+        :returns: Tuple with the number of indexed (or already up to date)
+                  records and of failures.
+        """
+        failed = 0
+        skipped = 0
+
+        def actions():
+            nonlocal failed, skipped
+            for ids in _chunks(record_ids, self.bulk_chunk_size):
+                records = self.record_cls.get_records(ids)
+                batch = []
+                with self.prefetch(records):
+                    for record in records:
+                        try:
+                            batch.append(self._record_index_action(record))
+                        except Exception:
+                            failed += 1
+                            current_app.logger.error(
+                                "Failed to index record {0}".format(record.id),
+                                exc_info=True,
+                            )
+
+                self._classify_oai_sets(action["_source"] for action in batch)
+                unchanged = self._unchanged_documents(batch)
+                skipped += len(unchanged)
+                for action in batch:
+                    if (action["_index"], action["_id"]) not in unchanged:
+                        yield action
+
+        indexed, errors = search.helpers.bulk(
+            self.client,
+            actions(),
+            stats_only=True,
+            raise_on_error=False,
+            request_timeout=current_app.config["INDEXER_BULK_REQUEST_TIMEOUT"],
+            **(search_bulk_kwargs or {}),
+        )
+        return indexed + skipped, errors + failed
+
+    def parents_records_query(self, parent_ids):
+        """Query the IDs of the (not deleted) records of the given parents.
+
+        :param parent_ids: Iterable of parent record UUIDs.
+        """
+        model_cls = self.record_cls.model_cls
+        return db.session.query(model_cls.id).filter(
+            model_cls.parent_id.in_(list(parent_ids)),
+            model_cls.is_deleted == False,  # noqa
+        )
+
+    def index_parents_records(self, parent_ids):
+        """Index all the (not deleted) records of the given parents in bulk.
+
+        :param parent_ids: Iterable of parent record UUIDs.
+        :returns: Tuple with the number of indexed records and of failures.
+        """
+        query = self.parents_records_query(parent_ids)
+        return self.index_records(id_ for (id_,) in query)
+
+    def refresh_stats(self, parent_recids):
+        """Update the statistics of all the indexed versions of the given parents.
+
+        The statistics of the stored search documents are compared with the
+        current ones, and only the records whose statistics changed are indexed
+        again, in batches (see ``index_records``), dumping the statistics fetched
+        for the comparison.
+
+        The whole documents are indexed, rather than only their statistics: a
+        partial update would bump the version of the documents above the
+        revision of the records, and the next indexing of the records at the
+        same revision (e.g. after a change of their parent) would be rejected.
+        Since they are dumped from the database with their revision, they never
+        overwrite fresher documents (e.g. of records reindexed in the meantime).
+
+        :param parent_recids: Iterable of parent record IDs.
+        :returns: Tuple with the number of updated documents and of failures.
+        """
+        index = self._prepare_index(self.record_cls.index._name)
+        updated = errors = 0
+        for parents in _chunks(parent_recids, self.bulk_chunk_size):
+            search_ = (
+                dsl.Search(using=self.client, index=index)
+                .filter("terms", **{"parent.id": parents})
+                .source(["uuid", "id", "parent.id", "stats"])
+            )
+            for hits in _chunks(search_.scan(), self.bulk_chunk_size):
+                stats = Statistics.get_records_stats(
+                    (hit.id, hit.parent.id) for hit in hits
+                )
+                changed = [
+                    hit.uuid
+                    for hit in hits
+                    if hit.to_dict().get("stats") != stats[hit.id]
+                ]
+                if not changed:
+                    continue
+                with Statistics.prefetch(stats=stats):
+                    batch_updated, batch_errors = self.index_records(changed)
+                updated += batch_updated
+                errors += batch_errors
+        return updated, errors
+
+    def delete_records(self, record_ids):
+        """Delete records from the index synchronously with the bulk API.
+
+        :param record_ids: Iterable of record UUIDs.
+        """
+        index = self._prepare_index(self.record_cls.index._name)
+        actions = (
+            {"_op_type": "delete", "_index": index, "_id": str(record_id)}
+            for record_id in record_ids
+        )
+        search.helpers.bulk(
+            self.client,
+            actions,
+            stats_only=True,
+            raise_on_error=False,
+            request_timeout=current_app.config["INDEXER_BULK_REQUEST_TIMEOUT"],
+        )
+
+    def _record_index_action(self, record):
+        """Bulk index action for an already fetched record."""
+        index = self.record_to_index(record)
+        arguments = {}
+        body = self._prepare_record(record, index, arguments, classify=False)
+        index = self._prepare_index(index)
+
+        action = {
+            "_op_type": "index",
+            "_index": index,
+            "_id": str(record.id),
+            "_version": record.revision_id,
+            "_version_type": self._version_type,
+            "_source": body,
+        }
+        action.update(arguments)
+        return action
+
+    def _unchanged_documents(self, actions):
+        """Find the index actions whose document is already up to date.
+
+        The content hashes (and the fields which are not part of the hash) of the
+        stored documents are fetched with one multi-get request per index.
+
+        :returns: Set of ``(index, id)`` of the unchanged documents.
+        """
+        expected = {}
+        deleted = set()
+        for action in actions:
+            if action["_op_type"] == "delete":
+                deleted.add(action["_id"])
+            elif self.content_hash_field in action["_source"]:
+                expected.setdefault(action["_index"], {})[action["_id"]] = action[
+                    "_source"
+                ]
+
+        unchanged = set()
+        fields = [self.content_hash_field, *self.unhashed_fields]
+        for index, sources in expected.items():
+            # a document deleted in the same batch has to be written again
+            ids = [id_ for id_ in sources if id_ not in deleted]
+            if not ids:
+                continue
+            try:
+                stored = self.client.mget(
+                    index=index, body={"ids": ids}, _source_includes=fields
+                )
+            except search.exceptions.NotFoundError:
+                continue
+
+            for doc in stored["docs"]:
+                if not doc.get("found"):
+                    continue
+                source = sources[doc["_id"]]
+                if all(doc["_source"].get(f) == source.get(f) for f in fields):
+                    unchanged.add((index, doc["_id"]))
+
+        return unchanged
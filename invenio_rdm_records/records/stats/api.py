@@ -11,9 +11,17 @@ In contrast to the very liberal defaults provided by Invenio-Stats, these permis
 factories deny access unless otherwise specified.
 """
 
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from flask import current_app
+from invenio_search import current_search_client
+from invenio_search.engine import dsl
 from invenio_stats.proxies import current_stats
 
+_prefetched_stats = ContextVar("rdm_records_prefetched_stats", default=None)
+"""Statistics prefetched for the batch of records currently being indexed."""
+
 
 class Statistics:
     """Statistics API class."""
@@ -24,6 +32,191 @@ class Statistics:
         query_config = current_stats.queries[query_name]
         return query_config.cls(name=query_config.name, **query_config.params)
 
+    @classmethod
+    def _build_batch_search(cls, query_name, query_param, values):
+        """Build a search aggregating a query's metrics for many values at once.
+
+        The resulting search is the equivalent of running the configured query
+        once per value, with the values bucketed by a terms aggregation. The
+        query modifiers are called with the same keyword arguments as by the
+        query itself, except that the query parameter holds all the values.
+        """
+        query = cls._get_query(query_name)
+        field = query.required_filters[query_param]
+
+        search = dsl.Search(using=query.client, index=query.index)[0:0]
+        for modifier in query.query_modifiers:
+            search = modifier(search, **{query_param: values})
+
+        search = search.filter("terms", **{field: values})
+        bucket = search.aggs.bucket("by_value", "terms", field=field, size=len(values))
+        for dst, (metric, metric_field, opts) in query.metric_fields.items():
+            bucket.metric(dst, metric, field=metric_field, **opts)
+
+        return search
+
+    @staticmethod
+    def _parse_batch_response(response, metrics):
+        """Turn the aggregation buckets of a batch search into a lookup table."""
+        return {
+            bucket["key"]: {metric: bucket[metric]["value"] for metric in metrics}
+            for bucket in response.aggregations.by_value.buckets
+        }
+
+    @classmethod
+    def get_records_stats(cls, records):
+        """Fetch the statistics for many records with a single multi-search.
+
+        :param records: Iterable of ``(recid, parent_recid)`` tuples.
+        :returns: Dictionary mapping each ``recid`` to its statistics, in the same
+                  format as returned by ``get_record_stats()``.
+        """
+        records = list(records)
+        if not records:
+            return {}
+
+        recids = list({recid for recid, _ in records})
+        parent_recids = list({parent_recid for _, parent_recid in records})
+
+        view_metrics = ("views", "unique_views")
+        download_metrics = ("downloads", "unique_downloads", "data_volume")
+        searches = [
+            ("record-view", "recid", recids, view_metrics),
+            ("record-view-all-versions", "parent_recid", parent_recids, view_metrics),
+            ("record-download", "recid", recids, download_metrics),
+            (
+                "record-download-all-versions",
+                "parent_recid",
+                parent_recids,
+                download_metrics,
+            ),
+        ]
+
+        results = [{} for _ in searches]
+        try:
+            multi_search = dsl.MultiSearch(using=current_search_client)
+            for query_name, query_param, values, _ in searches:
+                multi_search = multi_search.add(
+                    cls._build_batch_search(query_name, query_param, values)
+                )
+
+            responses = multi_search.execute(raise_on_error=False)
+            for idx, (response, search_def) in enumerate(zip(responses, searches)):
+                if response is None:
+                    # e.g. the aggregation search index hasn't been created yet
+                    current_app.logger.warning(
+                        f"Could not fetch '{search_def[0]}' statistics in bulk."
+                    )
+                    continue
+
+                results[idx] = cls._parse_batch_response(response, search_def[3])
+
+        except Exception as e:
+            # e.g. opensearchpy.exceptions.ConnectionError
+            current_app.logger.warning(e)
+
+        views, views_all, downloads, downloads_all = results
+        empty_views = dict.fromkeys(view_metrics, 0)
+        empty_downloads = dict.fromkeys(download_metrics, 0)
+
+        return {
+            recid: cls._build_stats(
+                views.get(recid, empty_views),
+                views_all.get(parent_recid, empty_views),
+                downloads.get(recid, empty_downloads),
+                downloads_all.get(parent_recid, empty_downloads),
+            )
+            for recid, parent_recid in records
+        }
+
+    @classmethod
+    def get_updated_parent_recids(cls, since, page_size=1000):
+        """Get the parents whose aggregated statistics changed since a given time.
+
+        Since the statistics of all versions are dumped with each record, all the
+        versions of these parents need updated statistics.
+
+        :param since: Naive UTC datetime, compared to the ``updated_timestamp``
+                      of the aggregations.
+        :returns: Set of parent record IDs.
+        """
+        parent_recids = set()
+        for query_name in ("record-view-all-versions", "record-download-all-versions"):
+            query = cls._get_query(query_name)
+            field = query.required_filters["parent_recid"]
+            after = None
+            while True:
+                search = dsl.Search(using=query.client, index=query.index)[0:0]
+                search = search.filter(
+                    "range", updated_timestamp={"gt": since.isoformat()}
+                )
+                composite = {
+                    "size": page_size,
+                    "sources": [{"parent_recid": {"terms": {"field": field}}}],
+                }
+                if after:
+                    composite["after"] = after
+                search.aggs.bucket("parents", "composite", **composite)
+
+                try:
+                    result = search.execute().aggregations.parents
+                except Exception as e:
+                    # e.g. the aggregation search index hasn't been created yet
+                    current_app.logger.warning(e)
+                    break
+
+                parent_recids.update(b.key.parent_recid for b in result.buckets)
+                if len(result.buckets) < page_size:
+                    break
+                after = result.after_key.to_dict()
+
+        return parent_recids
+
+    @classmethod
+    @contextmanager
+    def prefetch(cls, records=(), stats=None):
+        """Prefetch the statistics for a batch of records.
+
+        While the context is active, ``get_prefetched_record_stats()`` serves the
+        statistics of the given records without querying the search engine again.
+        The statistics already prefetched by an enclosing context are reused.
+
+        :param records: Iterable of ``(recid, parent_recid)`` tuples.
+        :param stats: Statistics already fetched, by ``recid`` (optional).
+        """
+        known = {**(_prefetched_stats.get() or {}), **(stats or {})}
+        missing = [(recid, parent) for recid, parent in records if recid not in known]
+        token = _prefetched_stats.set({**known, **cls.get_records_stats(missing)})
+        try:
+            yield
+        finally:
+            _prefetched_stats.reset(token)
+
+    @classmethod
+    def get_prefetched_record_stats(cls, recid):
+        """Get the prefetched statistics for the given record, if available."""
+        return (_prefetched_stats.get() or {}).get(recid)
+
+    @staticmethod
+    def _build_stats(views, views_all, downloads, downloads_all):
+        """Assemble the statistics dictionary from the query results."""
+        return {
+            "this_version": {
+                "views": views["views"],
+                "unique_views": views["unique_views"],
+                "downloads": downloads["downloads"],
+                "unique_downloads": downloads["unique_downloads"],
+                "data_volume": downloads["data_volume"],
+            },
+            "all_versions": {
+                "views": views_all["views"],
+                "unique_views": views_all["unique_views"],
+                "downloads": downloads_all["downloads"],
+                "unique_downloads": downloads_all["unique_downloads"],
+                "data_volume": downloads_all["data_volume"],
+            },
+        }
+
     @classmethod
     def get_record_stats(cls, recid, parent_recid):
         """Fetch the statistics for the given record."""
@@ -60,21 +253,4 @@ class Statistics:
             }
             downloads = downloads_all = fallback_result
 
-        stats = {
-            "this_version": {
-                "views": views["views"],
-                "unique_views": views["unique_views"],
-                "downloads": downloads["downloads"],
-                "unique_downloads": downloads["unique_downloads"],
-                "data_volume": downloads["data_volume"],
-            },
-            "all_versions": {
-                "views": views_all["views"],
-                "unique_views": views_all["unique_views"],
-                "downloads": downloads_all["downloads"],
-                "unique_downloads": downloads_all["unique_downloads"],
-                "data_volume": downloads_all["data_volume"],
-            },
-        }
-
-        return stats
+        return cls._build_stats(views, views_all, downloads, downloads_all)
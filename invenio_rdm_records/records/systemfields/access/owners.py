@@ -8,8 +8,14 @@
 
 """Owners classes for the access system field."""
 
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from invenio_accounts.models import User
 
+_preloaded_entities = ContextVar("rdm_records_preloaded_owners", default=None)
+"""Identity map of the owner entities preloaded for the current batch."""
+
 
 class Owner:
     """An abstraction between owner entities and specifications as dicts."""
@@ -36,6 +42,31 @@ class Owner:
         elif owner is not None:
             raise TypeError("invalid owner type: {}".format(type(owner)))
 
+    @staticmethod
+    @contextmanager
+    def preload(owners):
+        """Preload the entities of many owners with a single query per type.
+
+        While the context is active, ``resolve()`` looks up the preloaded entities
+        instead of querying the database for each owner.
+        Owners whose entity could not be found are remembered as missing.
+        """
+        user_ids = {
+            int(o.owner_id)
+            for o in owners
+            if o.owner_type == "user" and str(o.owner_id).isdigit()
+        }
+        entities = {("user", str(user_id)): None for user_id in user_ids}
+        if user_ids:
+            for user in User.query.filter(User.id.in_(user_ids)):
+                entities[("user", str(user.id))] = user
+
+        token = _preloaded_entities.set(entities)
+        try:
+            yield
+        finally:
+            _preloaded_entities.reset(token)
+
     def dump(self):
         """Dump the owner to a dictionary."""
         if self.owner_type is None and self.owner_id is None:
@@ -50,7 +81,12 @@ class Owner:
                 return None
 
             elif self.owner_type == "user":
-                self._entity = User.query.get(self.owner_id)
+                preloaded = _preloaded_entities.get() or {}
+                key = (self.owner_type, str(self.owner_id))
+                if key in preloaded:
+                    self._entity = preloaded[key]
+                else:
+                    self._entity = User.query.get(self.owner_id)
 
             else:
                 raise ValueError("unknown owner type: {}".format(self.owner_type))
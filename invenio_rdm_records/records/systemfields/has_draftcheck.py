@@ -11,6 +11,7 @@ The HasDraftCheckField is used to check if an associated draft exists for a
 a record.
 """
 
+from invenio_db import db
 from invenio_records.dictutils import dict_set
 from invenio_records.systemfields import SystemField
 from sqlalchemy.orm.exc import NoResultFound
@@ -44,12 +45,43 @@ class HasDraftCheckField(SystemField):
         if self.draft_cls is None:
             return False
 
+        # Use the value computed for the record's batch, if available
+        has_draft = self._get_cache(record)
+        if has_draft is not None:
+            return has_draft
+
         try:
             self.draft_cls.get_record(record.id)
             return True
         except NoResultFound:
             return False
 
+    def prefetch(self, records):
+        """Compute the value for many records with a single query.
+
+        The result is cached on each record, so that accessing the field (e.g.
+        when dumping the records for bulk indexing, or when hydrating search
+        results) doesn't query the database once per record anymore.
+
+        :param records: Iterable of records of the class holding this field.
+        """
+        if self.draft_cls is None:
+            return
+
+        records = [record for record in records if record.id is not None]
+        if not records:
+            return
+
+        model_cls = self.draft_cls.model_cls
+        query = db.session.query(model_cls.id).filter(
+            model_cls.id.in_([record.id for record in records]),
+            model_cls.is_deleted != True,  # noqa
+        )
+        draft_ids = {draft_id for draft_id, in query}
+
+        for record in records:
+            self._set_cache(record, record.id in draft_ids)
+
     def pre_dump(self, record, data, **kwargs):
         """Called before a record is dumped in a secondary storage system."""
         dict_set(data, self.key, record.has_draft)
@@ -0,0 +1,671 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Parallel, resumable and incremental reindexing of records.
+
+For full reindexing, the rows of each record table are split into shards of
+consecutive UUIDs, which are then dumped and bulk-indexed by a pool of worker
+processes. Completed shards are recorded in a checkpoint file, so that an
+interrupted run can be resumed.
+
+For incremental reindexing, only the records and drafts modified since a given
+time (or since the persisted watermark of the last run) are reindexed.
+
+For zero-downtime reindexing, new indices are built next to the live ones and
+the aliases are switched over to them atomically once they are complete.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from functools import partial
+from itertools import islice
+
+from flask import current_app
+from invenio_db import db
+from invenio_records_resources.proxies import current_service_registry
+from invenio_search import current_search, current_search_client
+from invenio_search.utils import build_alias_name, build_index_name
+from sqlalchemy import or_
+
+from .records.indexer import RDMRecordIndexer
+
+ReindexTarget = namedtuple(
+    "ReindexTarget", ["name", "service_id", "indexer", "index"], defaults=(None,)
+)
+"""A record table to reindex, identified by its service and indexer attribute.
+
+If ``index`` is set, the records are written to this concrete index instead of
+the write alias of the record class.
+"""
+
+REINDEX_TARGETS = (
+    ReindexTarget("vocabularies", "vocabularies", "indexer"),
+    ReindexTarget("names", "names", "indexer"),
+    ReindexTarget("funders", "funders", "indexer"),
+    ReindexTarget("awards", "awards", "indexer"),
+    ReindexTarget("subjects", "subjects", "indexer"),
+    ReindexTarget("affiliations", "affiliations", "indexer"),
+    ReindexTarget("records", "records", "indexer"),
+    ReindexTarget("drafts", "records", "draft_indexer"),
+)
+"""Targets reindexed by ``rdm-records rebuild-index``, in order."""
+
+INCREMENTAL_REINDEX_TARGETS = (
+    ReindexTarget("records", "records", "indexer"),
+    ReindexTarget("drafts", "records", "draft_indexer"),
+)
+"""Targets reindexed by ``rdm-records rebuild-index --incremental``, in order."""
+
+
+def get_indexer(target):
+    """Get a batch-prefetching indexer for the given target."""
+    service = current_service_registry.get(target.service_id)
+    indexer = getattr(service, target.indexer)
+    if isinstance(indexer, RDMRecordIndexer) and not target.index:
+        return indexer
+
+    return RDMRecordIndexer(
+        search_client=indexer.client,
+        record_cls=indexer.record_cls,
+        record_dumper=indexer.record_dumper,
+        index=target.index,
+    )
+
+
+def ids_query(model_cls, start=None, end=None):
+    """Query the IDs of the (not deleted) rows of a table in a UUID range.
+
+    :param start: First ID of the range (inclusive), or ``None``.
+    :param end: Last ID of the range (exclusive), or ``None``.
+    """
+    query = db.session.query(model_cls.id).filter(model_cls.is_deleted == False)  # noqa
+    if start is not None:
+        query = query.filter(model_cls.id >= start)
+    if end is not None:
+        query = query.filter(model_cls.id < end)
+    return query
+
+
+def compute_shards(model_cls, shard_size):
+    """Split the rows of a table into shards of at most ``shard_size`` rows.
+
+    The IDs are streamed in order, remembering only every ``shard_size``-th one
+    as a shard boundary.
+
+    :returns: List of shards, as dictionaries with the ``start`` and ``end``
+              IDs (as strings) and the ``count`` of rows in the shard.
+    """
+    shards = []
+    start, count = None, 0
+    query = ids_query(model_cls).order_by(model_cls.id).yield_per(shard_size)
+    for (id_,) in query:
+        if count == shard_size:
+            shards.append({"start": start, "end": str(id_), "count": count})
+            start, count = str(id_), 0
+        count += 1
+
+    if count:
+        shards.append({"start": start, "end": None, "count": count})
+
+    return shards
+
+
+def _shard_key(shard):
+    """Key identifying a shard in the checkpoint."""
+    return shard["start"] or ""
+
+
+def _reset_connections():
+    """Drop the database and search connections inherited from a parent process.
+
+    The search client is rebuilt on its next use, since the parent process may
+    have used it (e.g. to create the indices) before forking.
+    """
+    db.engine.dispose(close=False)
+    current_search._client = None
+
+
+def _init_worker(app):
+    """Set up a forked worker process."""
+    app.app_context().push()
+    _reset_connections()
+
+
+def _index_shard(task):
+    """Index all the records of a shard."""
+    target, shard = task
+    try:
+        indexer = get_indexer(target)
+        query = ids_query(indexer.record_cls.model_cls, shard["start"], shard["end"])
+        indexed, errors = indexer.index_records(id_ for (id_,) in query)
+        return target, shard, indexed, errors, None
+    except Exception as e:
+        current_app.logger.exception(f"Failed to index {target.name} shard.")
+        return target, shard, 0, 0, str(e)
+
+
+def _index_shard_in_worker(task):
+    """Index all the records of a shard (executed in a worker process)."""
+    try:
+        return _index_shard(task)
+    finally:
+        db.session.remove()
+
+
+class ReindexProgress:
+    """Throughput and ETA of the reindexing of one target."""
+
+    def __init__(self, target, total, done=0):
+        """Constructor."""
+        self.target = target
+        self.total = total
+        self.done = done
+        self.indexed = 0
+        self.errors = 0
+        self.failed_shards = 0
+        self.started = time.monotonic()
+
+    def update(self, count, indexed, errors, failure=None):
+        """Account for a processed batch of ``count`` records."""
+        self.done += count
+        self.indexed += indexed
+        self.errors += errors
+        if failure:
+            self.failed_shards += 1
+
+    @property
+    def rate(self):
+        """Indexed documents per second since the start of this run."""
+        elapsed = time.monotonic() - self.started
+        return self.indexed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """Estimated remaining time, or ``None`` if unknown."""
+        if not self.rate:
+            return None
+        return timedelta(seconds=round((self.total - self.done) / self.rate))
+
+    def __str__(self):
+        """Return str(self)."""
+        eta = self.eta if self.eta is not None else "-"
+        return (
+            f"{self.target.name}: {self.done}/{self.total} docs "
+            f"({self.rate:.1f} docs/s, {self.errors} errors, ETA {eta})"
+        )
+
+
+class Checkpoint:
+    """Shards and completed shards of a reindex run, persisted to a JSON file."""
+
+    def __init__(self, path=None):
+        """Constructor.
+
+        :param path: Path of the checkpoint file. If ``None``, nothing is persisted.
+        """
+        self.path = path
+        self.data = {}
+        if path and os.path.exists(path):
+            with open(path) as fp:
+                self.data = json.load(fp)
+
+    def shards(self, target):
+        """Get the stored shards of a target, or ``None``."""
+        return self.data.get(target.name, {}).get("shards")
+
+    def set_shards(self, target, shards):
+        """Store the shards of a target."""
+        self.data[target.name] = {"shards": shards, "done": []}
+        self.save()
+
+    def is_done(self, target, shard):
+        """Check if a shard has been completed already."""
+        return _shard_key(shard) in self.data[target.name]["done"]
+
+    def mark_done(self, target, shard):
+        """Record a shard as completed."""
+        self.data[target.name]["done"].append(_shard_key(shard))
+        self.save()
+
+    def save(self):
+        """Atomically write the checkpoint file."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(self.data, fp)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the checkpoint file."""
+        self.data = {}
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ShardedReindex:
+    """Reindex record tables in shards, using a pool of worker processes."""
+
+    def __init__(
+        self,
+        targets=REINDEX_TARGETS,
+        workers=1,
+        shard_size=10000,
+        checkpoint_path=None,
+        watermark_path=None,
+        progress_callback=None,
+    ):
+        """Constructor.
+
+        :param targets: The ``ReindexTarget`` to reindex, in order.
+        :param workers: Number of worker processes. With ``0``, the shards are
+                        indexed in the current process.
+        :param shard_size: Maximum number of records per shard.
+        :param checkpoint_path: File for resuming interrupted runs (optional).
+        :param watermark_path: File storing the start time of the last run
+                               without errors, for later incremental runs
+                               (optional).
+        :param progress_callback: Called with a ``ReindexProgress`` after each
+                                  processed shard.
+        """
+        self.targets = targets
+        self.workers = workers
+        self.shard_size = shard_size
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.watermark = Watermark(watermark_path) if watermark_path else None
+        self.progress_callback = progress_callback
+
+    def _plan(self, target):
+        """Get the shards of a target, reusing the ones of an interrupted run."""
+        shards = self.checkpoint.shards(target)
+        if shards is None:
+            model_cls = get_indexer(target).record_cls.model_cls
+            shards = compute_shards(model_cls, self.shard_size)
+            self.checkpoint.set_shards(target, shards)
+        return shards
+
+    def run(self):
+        """Reindex all targets.
+
+        :returns: List of ``ReindexProgress``, one per target.
+        """
+        started = datetime.utcnow()
+        results = []
+        with ExitStack() as stack:
+            if self.workers:
+                # the forked workers open their own database and search connections
+                app = current_app._get_current_object()
+                context = multiprocessing.get_context("fork")
+                pool = stack.enter_context(
+                    context.Pool(self.workers, _init_worker, (app,))
+                )
+                index_shards = partial(pool.imap_unordered, _index_shard_in_worker)
+            else:
+                index_shards = partial(map, _index_shard)
+
+            for target in self.targets:
+                shards = self._plan(target)
+                pending = [s for s in shards if not self.checkpoint.is_done(target, s)]
+                progress = ReindexProgress(
+                    target,
+                    total=sum(s["count"] for s in shards),
+                    done=sum(s["count"] for s in shards if s not in pending),
+                )
+
+                tasks = [(target, shard) for shard in pending]
+                for _, shard, indexed, errors, failure in index_shards(tasks):
+                    progress.update(shard["count"], indexed, errors, failure)
+                    if not failure:
+                        self.checkpoint.mark_done(target, shard)
+                    if self.progress_callback:
+                        self.progress_callback(progress)
+
+                results.append(progress)
+
+        if not any(progress.failed_shards for progress in results):
+            self.checkpoint.clear()
+            # the records which failed to be indexed are retried by the next run
+            if self.watermark and not any(progress.errors for progress in results):
+                self.watermark.set(started)
+
+        return results
+
+
+class Watermark:
+    """Start time of the last successful reindex run, persisted to a JSON file."""
+
+    def __init__(self, path):
+        """Constructor."""
+        self.path = path
+
+    def get(self):
+        """Get the watermark, or ``None`` if there is none yet."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as fp:
+            return datetime.fromisoformat(json.load(fp)["updated"])
+
+    def set(self, value):
+        """Atomically persist the watermark."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump({"updated": value.isoformat()}, fp)
+        os.replace(tmp_path, self.path)
+
+
+def updated_ids_query(record_cls, since):
+    """Query the IDs of the records affected by modifications since a given time.
+
+    These are the records whose row was updated, as well as all the versions of
+    the records whose parent was updated (since the parent is part of their
+    search documents).
+
+    :param since: Naive UTC datetime, as stored in the ``updated`` columns.
+    """
+    model_cls = record_cls.model_cls
+    parent_model_cls = record_cls.parent_record_cls.model_cls
+    updated_parents = db.session.query(parent_model_cls.id).filter(
+        parent_model_cls.updated > since
+    )
+    return db.session.query(model_cls.id, model_cls.is_deleted).filter(
+        or_(model_cls.updated > since, model_cls.parent_id.in_(updated_parents))
+    )
+
+
+WATERMARK_SAFETY_WINDOW = timedelta(minutes=5)
+"""Time subtracted from the watermark when resuming from it.
+
+The ``updated`` timestamps are set before the transactions are committed, so
+the modifications of the transactions still ongoing when a run started may
+carry an earlier time than its watermark. They are picked up by the next run,
+along with the modifications of a few minutes which are reindexed twice.
+"""
+
+
+class IncrementalReindex:
+    """Reindex the records and drafts modified since a given time."""
+
+    def __init__(
+        self,
+        since=None,
+        watermark_path=None,
+        targets=INCREMENTAL_REINDEX_TARGETS,
+        chunk_size=1000,
+        progress_callback=None,
+        safety_window=WATERMARK_SAFETY_WINDOW,
+    ):
+        """Constructor.
+
+        :param since: Reindex the modifications since this (naive UTC) datetime.
+                      Defaults to the persisted watermark, minus the
+                      ``safety_window``.
+        :param watermark_path: File storing the watermark (optional).
+        :param targets: The ``ReindexTarget`` to reindex, in order.
+        :param chunk_size: Number of records streamed and indexed at once.
+        :param progress_callback: Called with a ``ReindexProgress`` after each
+                                  processed chunk.
+        :param safety_window: Time subtracted from the watermark, see
+                              ``WATERMARK_SAFETY_WINDOW``.
+        """
+        self.watermark = Watermark(watermark_path) if watermark_path else None
+        self.since = since
+        if self.since is None and self.watermark:
+            watermark = self.watermark.get()
+            if watermark is not None:
+                self.since = watermark - safety_window
+        if self.since is None:
+            raise ValueError("No modification time or stored watermark to start from.")
+
+        self.targets = targets
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+
+    def _reindex_target(self, target):
+        """Reindex the modified records of one target."""
+        indexer = get_indexer(target)
+        query = updated_ids_query(indexer.record_cls, self.since)
+        progress = ReindexProgress(target, total=query.count())
+
+        # stream the rows through a server-side cursor
+        rows = iter(
+            query.execution_options(stream_results=True).yield_per(self.chunk_size)
+        )
+        while chunk := list(islice(rows, self.chunk_size)):
+            to_index = [id_ for id_, is_deleted in chunk if not is_deleted]
+            to_delete = [id_ for id_, is_deleted in chunk if is_deleted]
+
+            indexed, errors = indexer.index_records(to_index) if to_index else (0, 0)
+            if to_delete:
+                indexer.delete_records(to_delete)
+
+            progress.update(len(chunk), indexed, errors)
+            if self.progress_callback:
+                self.progress_callback(progress)
+
+        return progress
+
+    def run(self):
+        """Reindex all targets and move the watermark forward.
+
+        The watermark is kept if some records failed to be indexed, so that they
+        are retried by the next run.
+
+        :returns: List of ``ReindexProgress``, one per target.
+        """
+        # modifications done while this run is ongoing will be picked up next time
+        started = datetime.utcnow()
+        results = [self._reindex_target(target) for target in self.targets]
+        if self.watermark and not any(progress.errors for progress in results):
+            self.watermark.set(started)
+        return results
+
+
+def update_mappings(targets=INCREMENTAL_REINDEX_TARGETS):
+    """Add the new fields of the current mappings to the existing indices.
+
+    Only additions are allowed, so that the indices do not need to be rebuilt
+    when a mapping gains fields without changing its version (e.g. the
+    ``content_hash`` and ``oai_sets`` fields). The documents holding the new
+    fields are rejected by the existing (strict) indices until their mappings
+    are updated.
+
+    :returns: List of the names of the updated indices.
+    """
+    updated = []
+    for target in targets:
+        index_name = get_indexer(target).record_cls.index._name
+        current_search.update_mapping(index_name)
+        updated.append(index_name)
+    return updated
+
+
+def _parent_aliases(index_name):
+    """Get the names of the aliases containing an index, from the outermost."""
+
+    def _find(tree, path):
+        for name, value in tree.items():
+            if isinstance(value, dict):
+                found = _find(value, path + [name])
+                if found is not None:
+                    return found
+            elif name == index_name:
+                return path
+        return None
+
+    return _find(current_search.active_aliases, []) or []
+
+
+class BlueGreenReindex:
+    """Reindex records into new indices and switch the aliases over to them.
+
+    For each target, a new index is created from the current mapping of the
+    record class (i.e. possibly a new mapping version) and bulk-loaded in shards
+    by a pool of worker processes. Meanwhile, the application keeps reading from
+    and writing to the old indices through the aliases. The modifications done
+    during the copy are then replayed on the new indices, and all the aliases are
+    switched to them in a single atomic request. A last replay picks up the
+    modifications done between the first replay and the switch.
+    """
+
+    def __init__(
+        self,
+        targets=INCREMENTAL_REINDEX_TARGETS,
+        workers=1,
+        shard_size=10000,
+        delete_old=False,
+        progress_callback=None,
+    ):
+        """Constructor.
+
+        :param targets: The ``ReindexTarget`` to reindex, in order.
+        :param workers: Number of worker processes for the bulk load (see
+                        ``ShardedReindex``).
+        :param shard_size: Maximum number of records per shard.
+        :param delete_old: Delete the old indices after switching the aliases.
+        :param progress_callback: Called with the current step as a string, or with
+                                  a ``ReindexProgress`` while loading the records.
+        """
+        self.targets = targets
+        self.workers = workers
+        self.shard_size = shard_size
+        self.delete_old = delete_old
+        self.progress_callback = progress_callback
+
+    def _report(self, progress):
+        """Report the progress to the callback, if any."""
+        if self.progress_callback:
+            self.progress_callback(progress)
+
+    def plan(self):
+        """Compute the indices and aliases involved, without changing anything.
+
+        :returns: List of dictionaries (one per target) with the ``target``, the
+                  ``index`` name (from the mappings), the ``suffix`` and name of
+                  the ``new_index`` to create, the ``old_indices`` currently
+                  behind the aliases and the ``aliases`` to switch.
+        """
+        suffix = f"-{time.time_ns() // 1000000}"
+        plans = []
+        for target in self.targets:
+            index_name = get_indexer(target).record_cls.index._name
+            aliases = [build_alias_name(a) for a in _parent_aliases(index_name)]
+            write_alias = build_alias_name(index_name)
+            # the innermost parent alias contains the indices of older mapping
+            # versions too, whose write alias differs from the current one
+            lookup = aliases[-1] if aliases else write_alias
+            old_indices = []
+            if current_search_client.indices.exists_alias(name=lookup):
+                old_indices = sorted(
+                    current_search_client.indices.get_alias(name=lookup)
+                )
+            plans.append(
+                {
+                    "target": target,
+                    "index": index_name,
+                    "suffix": suffix,
+                    "new_index": build_index_name(index_name, suffix=suffix),
+                    "old_indices": old_indices,
+                    "aliases": aliases + [write_alias],
+                }
+            )
+        return plans
+
+    def _alias_actions(self, plans):
+        """Actions moving all the aliases from the old to the new indices.
+
+        The old indices are detached from all their aliases, including the write
+        aliases of older mapping versions.
+        """
+        actions = []
+        for plan in plans:
+            for old_index in plan["old_indices"]:
+                old_aliases = current_search_client.indices.get_alias(index=old_index)
+                for alias in old_aliases[old_index]["aliases"]:
+                    actions.append({"remove": {"index": old_index, "alias": alias}})
+            for alias in plan["aliases"]:
+                actions.append({"add": {"index": plan["new_index"], "alias": alias}})
+        return actions
+
+    def _replay(self, targets, since):
+        """Reindex the records modified since the given time.
+
+        The ``WATERMARK_SAFETY_WINDOW`` is subtracted from the time, to pick up
+        the modifications of the transactions ongoing at that time.
+
+        :returns: The number of records which failed to be indexed.
+        """
+        results = IncrementalReindex(
+            since=since - WATERMARK_SAFETY_WINDOW, targets=targets
+        ).run()
+        return sum(progress.errors for progress in results)
+
+    def run(self):
+        """Build the new indices, then switch the aliases over to them.
+
+        :returns: The executed plans (see ``plan``).
+        """
+        plans = self.plan()
+        targets = [plan["target"]._replace(index=plan["new_index"]) for plan in plans]
+
+        for plan in plans:
+            self._report(f"Creating index {plan['new_index']}...")
+            current_search.create_index(
+                plan["index"],
+                suffix=plan["suffix"],
+                create_write_alias=False,
+            )
+            # refreshing during the bulk load only slows it down
+            current_search_client.indices.put_settings(
+                index=plan["new_index"], body={"index": {"refresh_interval": "-1"}}
+            )
+
+        copy_started = datetime.utcnow()
+        results = ShardedReindex(
+            targets=targets,
+            workers=self.workers,
+            shard_size=self.shard_size,
+            progress_callback=self._report,
+        ).run()
+        if any(progress.failed_shards for progress in results):
+            raise RuntimeError("Failed to load some shards, the aliases were kept.")
+
+        replay_started = datetime.utcnow()
+        self._report("Replaying the modifications done during the copy...")
+        if self._replay(targets, copy_started):
+            raise RuntimeError("Failed to replay some records, the aliases were kept.")
+
+        for plan in plans:
+            current_search_client.indices.put_settings(
+                index=plan["new_index"], body={"index": {"refresh_interval": None}}
+            )
+            current_search_client.indices.refresh(index=plan["new_index"])
+
+        self._report("Switching aliases...")
+        current_search_client.indices.update_aliases(
+            body={"actions": self._alias_actions(plans)}
+        )
+
+        # modifications done right before the switch were written to the old indices
+        self._report("Replaying the modifications done during the switch...")
+        if self._replay(targets, replay_started):
+            raise RuntimeError(
+                "Failed to replay some records after switching the aliases, the old "
+                "indices were kept."
+            )
+
+        if self.delete_old:
+            for plan in plans:
+                for old_index in plan["old_indices"]:
+                    self._report(f"Deleting index {old_index}...")
+                    current_search_client.indices.delete(index=old_index)
+
+        return plans
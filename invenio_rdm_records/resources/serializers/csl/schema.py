@@ -7,7 +7,6 @@
 
 """CSL based Schema for Invenio RDM Records."""
 
-from edtf import parse_edtf
 from edtf.parser.edtf_exceptions import EDTFParseException
 from edtf.parser.parser_classes import Date, Interval
 from flask_resources.serializers import BaseSerializerSchema
@@ -17,6 +16,7 @@ from invenio_vocabularies.proxies import current_service as vocabulary_service
 from marshmallow import Schema, fields, missing, pre_dump
 from marshmallow_utils.fields import SanitizedUnicode, StrippedHTML
 
+from ....edtf import edtf_cache
 from ..utils import get_preferred_identifier
 
 
@@ -81,7 +81,7 @@ class CSLJSONSchema(BaseSerializerSchema):
     def get_issued(self, obj):
         """Get issued dates."""
         try:
-            parsed = parse_edtf(obj["metadata"].get("publication_date"))
+            parsed = edtf_cache.parse(obj["metadata"].get("publication_date"))
         except EDTFParseException:
             return missing
 
@@ -9,7 +9,6 @@
 
 """DataCite based Schema for Invenio RDM Records."""
 
-from edtf import parse_edtf
 from edtf.parser.grammar import ParseException
 from flask import current_app
 from flask_resources.serializers import BaseSerializerSchema
@@ -21,6 +20,7 @@ from marshmallow import Schema, ValidationError, fields, missing, post_dump, val
 from marshmallow_utils.fields import SanitizedUnicode
 from marshmallow_utils.html import strip_html
 
+from ....edtf import edtf_cache
 from ....proxies import current_rdm_records_service
 from ...serializers.ui.schema import current_default_locale
 from ..utils import get_preferred_identifier, get_vocabulary_props
@@ -255,7 +255,7 @@ class DataCite43Schema(BaseSerializerSchema):
         """Get publication year from edtf date."""
         try:
             publication_date = obj["metadata"]["publication_date"]
-            parsed_date = parse_edtf(publication_date)
+            parsed_date = edtf_cache.parse(publication_date)
             return str(parsed_date.lower_strict().tm_year)
         except ParseException:
             # Should not fail since it was validated at service schema
@@ -377,29 +377,22 @@ class DataCite43Schema(BaseSerializerSchema):
         # Generate parent/child versioning relationships
         if self.context.get("is_parent"):
             # Fetch DOIs for all versions
-            # NOTE: The refresh is safe to do here since we'll be in Celery task
-            current_rdm_records_service.indexer.refresh()
-            record_versions = current_rdm_records_service.search_versions(
-                system_identity,
-                obj._child["id"],
-                params={"_source_includes": "pids.doi"},
+            versions_dois = current_rdm_records_service.pids.read_versions_pids(
+                system_identity, obj._child["id"], "doi"
             )
-            for version in record_versions:
-                version_doi = version["pids"]["doi"]
-                id_scheme = get_scheme_datacite(
-                    "doi",
-                    "RDM_RECORDS_IDENTIFIERS_SCHEMES",
-                    default="DOI",
+            id_scheme = get_scheme_datacite(
+                "doi",
+                "RDM_RECORDS_IDENTIFIERS_SCHEMES",
+                default="DOI",
+            )
+            for version_doi in versions_dois:
+                serialized_identifiers.append(
+                    {
+                        "relatedIdentifier": version_doi,
+                        "relationType": "HasVersion",
+                        "relatedIdentifierType": id_scheme,
+                    }
                 )
-
-                if version_doi:
-                    serialized_identifiers.append(
-                        {
-                            "relatedIdentifier": version_doi["identifier"],
-                            "relationType": "HasVersion",
-                            "relatedIdentifierType": id_scheme,
-                        }
-                    )
         else:
             if hasattr(obj, "parent"):
                 parent_record = obj.parent
@@ -9,11 +9,11 @@
 
 from datacite import schema43
 from lxml import etree as ET
-from pkg_resources import resource_stream
-from werkzeug.utils import cached_property
 
 from invenio_rdm_records.resources.serializers import DataCite43XMLSerializer
 
+from ..xslt import xslt_registry
+
 
 class DCATSerializer(DataCite43XMLSerializer):
     """DCAT serializer for records."""
@@ -22,6 +22,13 @@ class DCATSerializer(DataCite43XMLSerializer):
         """Constructor."""
         super().__init__(encoder=self._etree_tostring)
 
+    def serialize_object_etree(self, obj):
+        """Serialize a single object into a DCAT-AP element.
+
+        Used by the OAI-PMH server, which embeds the element in its response.
+        """
+        return self.transform_with_xslt(self.dump_obj(obj))
+
     def _etree_tostring(self, record, **kwargs):
         root = self.transform_with_xslt(record, **kwargs)
         return ET.tostring(
@@ -31,15 +38,15 @@ class DCATSerializer(DataCite43XMLSerializer):
             encoding="utf-8",
         ).decode("utf-8")
 
-    @cached_property
+    @property
     def xslt_transform_func(self):
-        """Return the DCAT XSLT transformation function."""
-        with resource_stream(
+        """Return the DCAT XSLT transformation function.
+
+        The stylesheet is compiled once per thread, and shared by all instances.
+        """
+        return xslt_registry.get(
             "invenio_rdm_records.resources.serializers", "dcat/datacite-to-dcat-ap.xsl"
-        ) as f:
-            xsl = ET.XML(f.read())
-        transform = ET.XSLT(xsl)
-        return transform
+        )
 
     def transform_with_xslt(self, dc_record, **kwargs):
         """Transform record with XSLT."""
@@ -14,6 +14,7 @@ from flask_resources.serializers import JSONSerializer, SimpleSerializer
 from invenio_rdm_records.contrib.journal.processors import JournalDublinCoreDumper
 from invenio_rdm_records.contrib.meeting.processors import MeetingDublinCoreDumper
 
+from ..utils import stream_xml_collection
 from .schema import DublinCoreSchema
 
 
@@ -37,8 +38,7 @@ class DublinCoreJSONSerializer(MarshmallowSerializer):
 class DublinCoreXMLSerializer(MarshmallowSerializer):
     """Marshmallow based Dublin Core serializer for records.
 
-    Note: This serializer is not suitable for serializing large number of
-    records.
+    Lists of records are streamed, one record at a time.
     """
 
     def __init__(self, **options):
@@ -53,3 +53,18 @@ class DublinCoreXMLSerializer(MarshmallowSerializer):
             encoder=simpledc.tostring,
             **options,
         )
+
+    def serialize_object_etree(self, obj):
+        """Serialize a single object into a Dublin Core element."""
+        return simpledc.dump_etree(self.dump_obj(obj))
+
+    def serialize_object_list(self, obj_list):
+        """Serialize a list of objects into a streamed collection of records.
+
+        Each record is dumped when it is written, so the memory use does not
+        grow with the number of records.
+        """
+        return stream_xml_collection(
+            (self.serialize_object_etree(obj) for obj in obj_list["hits"]["hits"]),
+            "collection",
+        )
@@ -13,14 +13,17 @@ from flask_resources.serializers import SimpleSerializer
 from lxml import etree
 
 from ....contrib.journal.processors import JournalMarcXMLDumper
+from ..utils import stream_xml_collection
 from .schema import MARCXMLSchema
 
+MARC21_NS = "http://www.loc.gov/MARC21/slim"
+"""Namespace of MARC 21 XML."""
+
 
 class MARCXMLSerializer(MarshmallowSerializer):
     """Marshmallow based MARCXML serializer for records.
 
-    Note: This serializer is not suitable for serializing large number of
-    records.
+    Lists of records are streamed, one record at a time.
     """
 
     def __init__(self, **options):
@@ -33,6 +36,25 @@ class MARCXMLSerializer(MarshmallowSerializer):
             encoder=self.marcxml_tostring,
         )
 
+    def serialize_object_etree(self, obj):
+        """Serialize a single object into a MARCXML element.
+
+        Used by the OAI-PMH server, which embeds the element in its response.
+        """
+        return dumps_etree(self.dump_obj(obj))
+
+    def serialize_object_list(self, obj_list):
+        """Serialize a list of objects into a streamed MARCXML collection.
+
+        Each record is dumped when it is written, so the memory use does not
+        grow with the number of records.
+        """
+        return stream_xml_collection(
+            (self.serialize_object_etree(obj) for obj in obj_list["hits"]["hits"]),
+            "{{{0}}}collection".format(MARC21_NS),
+            nsmap={None: MARC21_NS},
+        )
+
     @classmethod
     def marcxml_tostring(cls, record):
         """Stringify a MarcXML record."""
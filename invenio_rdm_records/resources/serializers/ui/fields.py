@@ -10,9 +10,12 @@
 """Record response serializers."""
 
 from babel_edtf import format_edtf
+from edtf.parser.grammar import ParseException
 from invenio_i18n import gettext as _
 from marshmallow import fields
+from marshmallow_utils.fields import FormatEDTF as FormatEDTF_
 
+from invenio_rdm_records.edtf import edtf_cache
 from invenio_rdm_records.records.systemfields.access.field.record import (
     AccessStatusEnum,
 )
@@ -118,7 +121,7 @@ class UIObjectAccessStatus(UIAccessStatus):
         """Embargo date."""
         until = self.record_access_dict.get("embargo").get("until")
         if until:
-            return format_edtf(until, format="long")
+            return format_edtf(edtf_cache.parse(until), format="long")
         return until
 
     @property
@@ -151,3 +154,17 @@ class AccessStatusField(fields.Field):
                 "embargo_date_l10n": record_access_status_ui.embargo_date,
                 "message_class": record_access_status_ui.message_class,
             }
+
+
+class FormatEDTF(FormatEDTF_):
+    """Format an EDTF-formatted string, parsing it through the EDTF cache."""
+
+    def format_value(self, value):
+        """Format an EDTF date."""
+        if isinstance(value, str):
+            try:
+                value = edtf_cache.parse(value)
+            except ParseException:
+                # let the formatting report the invalid value
+                pass
+        return super().format_value(value)
@@ -25,11 +25,11 @@ from invenio_vocabularies.contrib.funders.serializer import FunderL10NItemSchema
 from invenio_vocabularies.resources import L10NString, VocabularyL10Schema
 from marshmallow import Schema, fields, missing, pre_dump
 from marshmallow_utils.fields import FormatDate as FormatDate_
-from marshmallow_utils.fields import FormatEDTF as FormatEDTF_
 from marshmallow_utils.fields import SanitizedHTML, SanitizedUnicode, StrippedHTML
 from marshmallow_utils.fields.babel import gettext_from_dict
 
 from .fields import AccessStatusField
+from .fields import FormatEDTF as FormatEDTF_
 
 
 def current_default_locale():
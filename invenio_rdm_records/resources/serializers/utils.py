@@ -8,9 +8,13 @@
 
 """Helpers for serializers."""
 
+from io import BytesIO
+
+from flask import has_request_context, stream_with_context
 from invenio_access.permissions import system_identity
 from invenio_search.engine import dsl
 from invenio_vocabularies.proxies import current_service as vocabulary_service
+from lxml import etree
 
 from .errors import VocabularyItemNotFoundError
 
@@ -48,3 +52,40 @@ def get_preferred_identifier(priority, identifiers):
             return identifiers[idx]
 
     return None
+
+
+def stream_xml_collection(elements, tag, nsmap=None):
+    """Serialize XML elements incrementally, wrapped in a collection element.
+
+    Each element is written out before the next one is generated, so that the
+    memory use does not grow with the number of elements. Within a request, the
+    chunks can be streamed as the response body.
+
+    :param elements: Iterable of lxml elements, e.g. a generator.
+    :param tag: Tag of the collection element.
+    :param nsmap: Namespace mapping of the collection element.
+    :returns: Generator of the chunks of the serialized document.
+    """
+
+    def generate():
+        buffer = BytesIO()
+
+        def drain():
+            chunk = buffer.getvalue().decode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
+        with etree.xmlfile(buffer, encoding="utf-8") as xf:
+            xf.write_declaration()
+            with xf.element(tag, nsmap=nsmap):
+                xf.write("\n")
+                for element in elements:
+                    xf.write(element, pretty_print=True)
+                    xf.flush()
+                    yield drain()
+        yield drain()
+
+    if has_request_context():
+        return stream_with_context(generate())
+    return generate()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Process-wide registry of compiled XSLT stylesheets."""
+
+import threading
+
+from lxml import etree as ET
+from pkg_resources import resource_string
+
+
+class XSLTRegistry:
+    """Registry of compiled XSLT transformations.
+
+    Each stylesheet is read and parsed only once per process. As lxml's XSLT
+    objects must not be shared between threads, the stylesheets are compiled once
+    per thread (and stylesheet), and then reused for all transformations.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._lock = threading.Lock()
+        self._stylesheets = {}
+        self._local = threading.local()
+
+    def _stylesheet(self, package, path):
+        """Get the parsed stylesheet document."""
+        key = (package, path)
+        with self._lock:
+            if key not in self._stylesheets:
+                self._stylesheets[key] = ET.XML(resource_string(package, path))
+            return self._stylesheets[key]
+
+    def get(self, package, path):
+        """Get the compiled XSLT transformation of a package resource.
+
+        :param package: Name of the package containing the stylesheet.
+        :param path: Path of the stylesheet in the package.
+        """
+        transforms = getattr(self._local, "transforms", None)
+        if transforms is None:
+            transforms = self._local.transforms = {}
+
+        key = (package, path)
+        if key not in transforms:
+            transforms[key] = ET.XSLT(self._stylesheet(package, path))
+        return transforms[key]
+
+    def clear(self):
+        """Forget the stylesheets, e.g. to reload them."""
+        with self._lock:
+            self._stylesheets.clear()
+        self._local = threading.local()
+
+
+xslt_registry = XSLTRegistry()
+"""Process-wide registry of compiled XSLT transformations."""
@@ -9,6 +9,7 @@
 # it under the terms of the MIT License; see LICENSE file for more details.
 
 """RDM record access settings service."""
+
 from datetime import datetime, timedelta
 
 import arrow
@@ -29,6 +30,7 @@ from ...requests.access.requests import EmailOp
 from ...secret_links.errors import InvalidPermissionLevelError
 from ..errors import DuplicateAccessRequestError
 from ..results import GrantSubjectExpandableField
+from ..uow import ParentsRecordsIndexOp
 
 
 class RecordAccessService(RecordService):
@@ -52,6 +54,18 @@ class RecordAccessService(RecordService):
         kwargs["expandable_fields"] = self.expandable_fields
         return self.config.grant_result_list_cls(*args, **kwargs)
 
+    def _index_related_records(self, record, parent, uow=None):
+        """Index all the versions of the parent, once per unit of work."""
+        uow.register(
+            ParentsRecordsIndexOp(
+                parent or record.parent,
+                indexer=self.indexer,
+                async_threshold=current_app.config[
+                    "RDM_INDEX_RELATED_RECORDS_ASYNC_THRESHOLD"
+                ],
+            )
+        )
+
     def get_parent_and_record_or_draft(self, _id):
         """Return parent and (record or draft)."""
         try:
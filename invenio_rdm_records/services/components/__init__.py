@@ -11,6 +11,7 @@
 from .access import AccessComponent
 from .custom_fields import CustomFieldsComponent
 from .metadata import MetadataComponent
+from .oai import OAIRenderCacheComponent
 from .pids import ParentPIDsComponent, PIDsComponent
 from .review import ReviewComponent
 
@@ -18,6 +19,7 @@ __all__ = (
     "AccessComponent",
     "CustomFieldsComponent",
     "MetadataComponent",
+    "OAIRenderCacheComponent",
     "PIDsComponent",
     "ParentPIDsComponent",
     "ReviewComponent",
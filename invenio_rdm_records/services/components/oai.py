@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""RDM service component for the OAI-PMH render cache."""
+
+from flask import current_app
+from invenio_drafts_resources.services.records.components import ServiceComponent
+from invenio_records_resources.services.uow import TaskOp
+
+from ..tasks import render_oai_metadata
+
+
+class OAIRenderCacheComponent(ServiceComponent):
+    """Service component rendering the OAI-PMH metadata of published records."""
+
+    def publish(self, identity, draft=None, record=None):
+        """Render the metadata in the background, if eager rendering is enabled."""
+        if not current_app.config.get("RDM_OAI_RENDER_CACHE_EAGER", False):
+            return
+        # only public records are harvestable
+        if record.access.protection.record != "public":
+            return
+        self.uow.register(TaskOp(render_oai_metadata, str(record.id)))
@@ -12,10 +12,37 @@
 
 from copy import copy
 
+from flask import current_app
 from invenio_drafts_resources.services.records.components import ServiceComponent
 from invenio_records_resources.services.uow import RecordCommitOp, TaskOp
 
-from ..pids.tasks import register_or_update_pid
+from ..pids import queue
+from ..pids.tasks import process_pid_sync_queue, register_or_update_pid
+
+
+def register_pids_sync(uow, record, schemes, parent=False, delay=None):
+    """Register or update PIDs on their remote providers, after the commit.
+
+    If enabled, the requests are stored in the PID synchronization queue, along
+    with the changes of the record. Otherwise, a task is sent per PID.
+
+    :param delay: Time during which the requests for the same PIDs are merged,
+        see :func:`invenio_rdm_records.services.pids.queue.enqueue`. Only
+        supported by the queue.
+    """
+    if not current_app.config.get("RDM_PIDS_SYNC_QUEUE_ENABLED", False):
+        for scheme in schemes:
+            uow.register(
+                TaskOp(register_or_update_pid, record["id"], scheme, parent=parent)
+            )
+        return
+
+    # the requests for parent PIDs are merged across all the versions
+    record_id = record.parent.pid.pid_value if parent else record["id"]
+    for scheme in schemes:
+        queue.enqueue(record_id, scheme, parent=parent, delay=delay)
+    if schemes and not delay:
+        uow.register(TaskOp(process_pid_sync_queue))
 
 
 class PIDsComponent(ServiceComponent):
@@ -104,8 +131,7 @@ class PIDsComponent(ServiceComponent):
         record.pids = pids
 
         # Async register/update tasks after transaction commit.
-        for scheme in pids.keys():
-            self.uow.register(TaskOp(register_or_update_pid, record["id"], scheme))
+        register_pids_sync(self.uow, record, list(pids.keys()))
 
     def new_version(self, identity, draft=None, record=None):
         """A new draft should not have any pids from the previous record."""
@@ -164,8 +190,19 @@ class ParentPIDsComponent(ServiceComponent):
         # TODO: This should normally be done in `Service.publish`
         self.uow.register(RecordCommitOp(record.parent))
 
-        # Async register/update tasks after transaction commit.
-        for scheme in pids.keys():
-            self.uow.register(
-                TaskOp(register_or_update_pid, record["id"], scheme, parent=True)
-            )
+        # Async register/update tasks after transaction commit. The updates of
+        # the existing PIDs are delayed, to be merged with the ones of the
+        # versions published in a row.
+        register_pids_sync(
+            self.uow,
+            record,
+            [scheme for scheme in pids if scheme not in current_schemes],
+            parent=True,
+        )
+        register_pids_sync(
+            self.uow,
+            record,
+            [scheme for scheme in pids if scheme in current_schemes],
+            parent=True,
+            delay=current_app.config.get("RDM_PIDS_PARENT_UPDATE_DELAY"),
+        )
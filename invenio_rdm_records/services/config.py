@@ -59,11 +59,13 @@ from requests import Request
 
 from ..records import RDMDraft, RDMRecord
 from ..records.api import RDMDraftMediaFiles, RDMRecordMediaFiles
+from ..records.indexer import RDMRecordIndexer
 from . import facets
 from .components import (
     AccessComponent,
     CustomFieldsComponent,
     MetadataComponent,
+    OAIRenderCacheComponent,
     ParentPIDsComponent,
     PIDsComponent,
     ReviewComponent,
@@ -252,6 +254,10 @@ class RDMRecordServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     record_cls = RDMRecord
     draft_cls = RDMDraft
 
+    # Indexers
+    indexer_cls = RDMRecordIndexer
+    draft_indexer_cls = RDMRecordIndexer
+
     # Schemas
     schema = RDMRecordSchema
     schema_parent = RDMParentSchema
@@ -330,9 +336,13 @@ class RDMRecordServiceConfig(RecordServiceConfig, ConfiguratorMixin):
         ParentPIDsComponent,
         RelationsComponent,
         ReviewComponent,
+        OAIRenderCacheComponent,
     ]
 
     # Links
+    links_oai_item = ["self_html", "doi"]
+    """Links of the result items used by the OAI-PMH server."""
+
     links_item = {
         "self": ConditionalLink(
             cond=is_record,
@@ -8,10 +8,12 @@
 
 """RDM PIDs Service."""
 
+from collections import defaultdict
+
 from flask.globals import current_app
 from invenio_i18n import lazy_gettext as _
 from invenio_pidstore.errors import PIDDoesNotExistError
-from invenio_pidstore.models import PIDStatus
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 from marshmallow import ValidationError
 
 from ..errors import ValidationErrorWithMessageAsList
@@ -25,6 +27,15 @@ class PIDManager:
         """Constructor for RecordService."""
         self._providers = providers
         self._required_schemes = required_schemes
+        # TODO: Refactor to get it injected instead.
+        self._schemes = {
+            scheme: (
+                conf.get("validator", lambda x: True),
+                conf.get("normalizer"),
+                conf.get("label", scheme),
+            )
+            for scheme, conf in current_app.config["RDM_PERSISTENT_IDENTIFIERS"].items()
+        }
 
     def _get_provider(self, scheme, provider_name=None):
         """Get a provider."""
@@ -52,16 +63,13 @@ class PIDManager:
 
     def _validate_identifiers(self, pids, errors):
         """Validate and normalize identifiers."""
-        # TODO: Refactor to get it injected instead.
-        conf = current_app.config["RDM_PERSISTENT_IDENTIFIERS"]
-
         identifiers = []
         for scheme, pids_attrs in pids.items():
             identifier = pids_attrs.get("identifier")
 
-            validator = conf.get(scheme, {}).get("validator", lambda x: True)
-            normalizer = conf.get(scheme, {}).get("normalizer")
-            label = conf.get(scheme, {}).get("label", scheme)
+            validator, normalizer, label = self._schemes.get(
+                scheme, (lambda x: True, None, scheme)
+            )
 
             if identifier:
                 if not validator(identifier):
@@ -79,7 +87,31 @@ class PIDManager:
         for scheme, id_ in identifiers:
             pids[scheme]["identifier"] = id_
 
-    def _validate_pids(self, pids, record, errors):
+    def _fetch_pids(self, pids_list):
+        """Fetch the existing PIDs of many identifiers, with one query per PID type.
+
+        :param pids_list: Iterable of the PIDs dictionaries of records.
+        :returns: Dictionary of the existing PIDs by PID type and value.
+        """
+        values = defaultdict(set)
+        for pids in pids_list:
+            for scheme, pid_attrs in pids.items():
+                identifier = pid_attrs.get("identifier")
+                if identifier:
+                    provider = self._get_provider(scheme, pid_attrs.get("provider"))
+                    values[provider.pid_type].add(identifier)
+
+        existing = {}
+        for pid_type, pid_values in values.items():
+            query = PersistentIdentifier.query.filter(
+                PersistentIdentifier.pid_type == pid_type,
+                PersistentIdentifier.pid_value.in_(list(pid_values)),
+            )
+            for pid in query:
+                existing[(pid_type, pid.pid_value)] = pid
+        return existing
+
+    def _validate_pids(self, pids, record, errors, existing=None):
         """Validate an iterator of PIDs.
 
         This function assumes all pid schemes are supported by the system.
@@ -92,11 +124,14 @@ class PIDManager:
         The responsibility lies with each provider since they are the ones
         that know their criteria for a record that is complete enough to get
         a PID.
+
+        :param existing: Dictionary of the existing PIDs by PID type and value,
+            if already fetched (see ``_fetch_pids``).
         """
         # Validate according to the schemes that the draft has and the schemes that
         # the draft would be given. _required_schemes are schemes that would be given
         # (if not already on the draft).
-        schemes = set(pids.keys()) | set(self._required_schemes)
+        schemes = set(pids.keys()) | set(self._required_schemes or [])
         scheme_provider_names = [
             # provider_name for an absent-but-required pid will be None which will
             # in turn select the default provider below
@@ -109,6 +144,9 @@ class PIDManager:
         ]
 
         for provider, pid_dict in provider_pid_dicts:
+            if existing is not None:
+                pid_key = (provider.pid_type, pid_dict.get("identifier"))
+                pid_dict = {**pid_dict, "pid": existing.get(pid_key)}
             success, provider_errors = provider.validate(record=record, **pid_dict)
             if not success:
                 errors.extend(provider_errors)
@@ -124,6 +162,38 @@ class PIDManager:
         if raise_errors and errors:
             raise ValidationErrorWithMessageAsList(message=errors)
 
+    def validate_many(self, records_pids):
+        """Validate the PIDs of many records at once.
+
+        The existing PIDs are fetched with one query per PID type, instead of
+        one query per PID. Unsupported PID schemes or providers are reported as
+        errors of their records, without failing the validation of the others.
+
+        :param records_pids: Iterable of tuples with the PIDs dictionary and
+            the record (or draft) to validate.
+        :returns: List with the list of errors of each record.
+        """
+        records_pids = list(records_pids)
+        errors_list = []
+        supported = []
+        for pids, record in records_pids:
+            errors = []
+            errors_list.append(errors)
+            try:
+                self._validate_pids_schemes(pids)
+                for scheme, pid_attrs in pids.items():
+                    self._get_provider(scheme, pid_attrs.get("provider"))
+            except (PIDSchemeNotSupportedError, ProviderNotSupportedError) as e:
+                errors.append({"field": "pids", "messages": [str(e)]})
+                continue
+            self._validate_identifiers(pids, errors)
+            supported.append((pids, record, errors))
+
+        existing = self._fetch_pids(pids for pids, _, _ in supported)
+        for pids, record, errors in supported:
+            self._validate_pids(pids, record, errors, existing=existing)
+        return errors_list
+
     def read(self, scheme, identifier, provider_name):
         """Read a pid."""
         provider = self._get_provider(scheme, provider_name)
@@ -191,7 +261,7 @@ class PIDManager:
 
         return result
 
-    def update(self, record, scheme, url=None):
+    def update(self, record, scheme, url=None, **kwargs):
         """Update a registered PID on a remote provider."""
         pid_attrs = record.pids.get(scheme, None)
         if not pid_attrs:
@@ -203,7 +273,7 @@ class PIDManager:
         provider = self._get_provider(scheme, pid_attrs["provider"])
         pid = provider.get(pid_attrs["identifier"])
 
-        provider.update(pid, record=record, url=url)
+        provider.update(pid, record=record, url=url, **kwargs)
 
     def reserve(self, draft, scheme, identifier, provider_name):
         """Reserve a PID."""
@@ -217,7 +287,7 @@ class PIDManager:
         for scheme, pid_attrs in pids.items():
             self.reserve(draft, scheme, pid_attrs["identifier"], pid_attrs["provider"])
 
-    def register(self, record, scheme, url):
+    def register(self, record, scheme, url, **kwargs):
         """Register a PID of a record."""
         pid_attrs = record.pids.get(scheme, None)
         if not pid_attrs:
@@ -229,7 +299,7 @@ class PIDManager:
         provider = self._get_provider(scheme, pid_attrs["provider"])
         pid = provider.get(pid_attrs["identifier"])
 
-        provider.register(pid, record=record, url=url)
+        provider.register(pid, record=record, url=url, **kwargs)
 
     def discard(self, scheme, identifier, provider_name=None):
         """Discard a PID."""
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Database models of the PID synchronization queue."""
+
+import enum
+from datetime import datetime
+
+from invenio_db import db
+from sqlalchemy_utils.models import Timestamp
+from sqlalchemy_utils.types import ChoiceType
+
+
+class PIDSyncState(enum.Enum):
+    """States of a PID synchronization request."""
+
+    PENDING = "P"
+    """Waiting to be (re)tried."""
+
+    FAILED = "F"
+    """Given up after too many attempts, until retried manually."""
+
+
+class PIDSyncItem(db.Model, Timestamp):
+    """Request to register or update a PID of a record on its remote provider."""
+
+    __tablename__ = "rdm_pids_sync_queue"
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "record_id", "scheme", "parent", name="uq_rdm_pids_sync_queue_pid"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    record_id = db.Column(db.String(255), nullable=False)
+    """Persistent identifier (``id``) of the record, or of its parent."""
+
+    scheme = db.Column(db.String(64), nullable=False)
+    """Scheme of the PID, e.g. ``doi``."""
+
+    parent = db.Column(db.Boolean, nullable=False, default=False)
+    """Whether the PID is the one of the parent record."""
+
+    state = db.Column(
+        ChoiceType(PIDSyncState, impl=db.String(1)),
+        nullable=False,
+        default=PIDSyncState.PENDING,
+    )
+
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    """Number of failed attempts."""
+
+    next_attempt = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, index=True
+    )
+    """Time after which the request can be processed (again)."""
+
+    generation = db.Column(db.Integer, nullable=False, default=1)
+    """Incremented when the request is repeated, e.g. by a new publication."""
+
+    last_error = db.Column(db.Text, nullable=True)
+    """Error of the last failed attempt."""
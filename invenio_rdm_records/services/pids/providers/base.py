@@ -13,6 +13,9 @@ from invenio_i18n import lazy_gettext as _
 from invenio_pidstore.errors import PIDAlreadyExists, PIDDoesNotExistError
 from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 
+_NOT_FETCHED = object()
+"""Marker of a PID which was not fetched before its validation."""
+
 
 class PIDProvider:
     """Base class for PID providers."""
@@ -135,6 +138,9 @@ class PIDProvider:
     def validate(self, record, identifier=None, provider=None, **kwargs):
         """Validate the attributes of the identifier.
 
+        The existing PID of the identifier can be passed as ``pid`` (``None`` if
+        it does not exist), when it was already fetched.
+
         :returns: A tuple (success, errors). `success` is a bool that specifies
                   if the validation was successful. `errors` is a list of
                   error dicts of the form:
@@ -148,28 +154,31 @@ class PIDProvider:
             )
             raise  # configuration error
 
-        # deduplication check
-        try:
-            pid = self.get(pid_value=identifier)
-            if pid.object_uuid != record.id:
-                current_app.logger.warning(
-                    f"PID {self.pid_type}:{identifier} already exists"
-                )
-                return False, [
-                    # Note that this uses self.pid_type which is not dynamically
-                    # assigned from config.py::RDM_PERSISTENT_IDENTIFIERS, so there
-                    # may come a time where there is a mismatch between the two.
-                    {
-                        "field": f"pids.{self.pid_type}",
-                        "messages": [
-                            _("{pid_type}:{identifier} already exists.").format(
-                                pid_type=self.pid_type, identifier=identifier
-                            )
-                        ],
-                    }
-                ]
-        except PIDDoesNotExistError:
-            pass
+        # deduplication check, unless the existing PID was already fetched
+        pid = kwargs.get("pid", _NOT_FETCHED)
+        if pid is _NOT_FETCHED:
+            try:
+                pid = self.get(pid_value=identifier)
+            except PIDDoesNotExistError:
+                pid = None
+
+        if pid is not None and pid.object_uuid != record.id:
+            current_app.logger.warning(
+                f"PID {self.pid_type}:{identifier} already exists"
+            )
+            return False, [
+                # Note that this uses self.pid_type which is not dynamically
+                # assigned from config.py::RDM_PERSISTENT_IDENTIFIERS, so there
+                # may come a time where there is a mismatch between the two.
+                {
+                    "field": f"pids.{self.pid_type}",
+                    "messages": [
+                        _("{pid_type}:{identifier} already exists.").format(
+                            pid_type=self.pid_type, identifier=identifier
+                        )
+                    ],
+                }
+            ]
 
         return True, []
 
@@ -23,6 +23,7 @@ from invenio_pidstore.models import PIDStatus
 from invenio_rdm_records.resources.serializers import DataCite43JSONSerializer
 
 from .base import PIDProvider
+from .transport import PooledDataCiteRESTClient, get_transport
 
 
 class DataCiteClient:
@@ -74,12 +75,21 @@ class DataCiteClient:
         """DataCite REST API client instance."""
         if self._api is None:
             self.check_credentials()
-            self._api = DataCiteRESTClient(
+            pool_size = self.cfg("pool_size", 10)
+            args = (
                 self.cfg("username"),
                 self.cfg("password"),
                 self.cfg("prefix"),
                 self.cfg("test_mode", True),
             )
+            if pool_size:
+                self._api = PooledDataCiteRESTClient(
+                    *args,
+                    timeout=self.cfg("timeout"),
+                    transport=get_transport(pool_size),
+                )
+            else:
+                self._api = DataCiteRESTClient(*args, timeout=self.cfg("timeout"))
         return self._api
 
 
@@ -147,6 +157,7 @@ class DataCitePIDProvider(PIDProvider):
 
         :param pid: the PID to register.
         :param record: the record metadata for the DOI.
+        :param raise_errors: Raise the DataCite errors instead of returning `False`.
         :returns: `True` if is registered successfully.
         """
         local_success = super().register(pid)
@@ -163,6 +174,8 @@ class DataCitePIDProvider(PIDProvider):
                 f"DataCite provider error when registering DOI for {pid.pid_value}"
             )
             self._log_errors(e)
+            if kwargs.get("raise_errors"):
+                raise
 
             return False
 
@@ -172,6 +185,7 @@ class DataCitePIDProvider(PIDProvider):
         This can be called before/after a DOI is registered.
         :param pid: the PID to register.
         :param record: the record metadata for the DOI.
+        :param raise_errors: Raise the DataCite errors instead of returning `False`.
         :returns: `True` if is updated successfully.
         """
         try:
@@ -183,6 +197,8 @@ class DataCitePIDProvider(PIDProvider):
                 f"DataCite provider error when updating DOI for {pid.pid_value}"
             )
             self._log_errors(e)
+            if kwargs.get("raise_errors"):
+                raise
 
             return False
 
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Pooled HTTP transport of the DataCite REST API clients.
+
+The ``datacite`` package opens a new connection for each request. The transport
+instead keeps a pool of keep-alive connections per worker process, shared by
+all the DataCite clients with the same pool configuration (e.g. the clients of
+the record and parent DOIs), and collects metrics about the requests.
+"""
+
+import os
+import ssl
+import threading
+import time
+
+import requests
+from datacite import DataCiteRESTClient
+from datacite.errors import HttpError
+from datacite.request import DataCiteRequest
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from requests.exceptions import RequestException
+
+
+class DataCiteTransport:
+    """Pool of keep-alive HTTP connections, with request metrics."""
+
+    def __init__(self, pool_size=10):
+        """Constructor.
+
+        :param pool_size: Maximum number of connections kept alive per host.
+        """
+        self.pool_size = pool_size
+        self._adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._latency = 0.0
+        self._max_latency = 0.0
+
+    def request(self, method, url, **kwargs):
+        """Send a request with one of the pooled connections."""
+        start = time.monotonic()
+        error = True
+        try:
+            response = self.session.request(method, url, **kwargs)
+            error = response.status_code >= 500
+            return response
+        finally:
+            self._record(time.monotonic() - start, error)
+
+    def _record(self, latency, error):
+        """Record the outcome of a request."""
+        with self._lock:
+            self._requests += 1
+            self._errors += int(error)
+            self._latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+    def _connections(self):
+        """Get the number of connections opened so far."""
+        pools = self._adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def metrics(self):
+        """Get the metrics of the requests sent so far.
+
+        The errors are the failed requests and the responses with a server
+        error status, which DataCite returns when it is overloaded.
+        """
+        with self._lock:
+            requests_, errors = self._requests, self._errors
+            latency, max_latency = self._latency, self._max_latency
+        connections = self._connections()
+        return {
+            "requests": requests_,
+            "errors": errors,
+            "error_rate": errors / requests_ if requests_ else 0.0,
+            "latency_avg": latency / requests_ if requests_ else 0.0,
+            "latency_max": max_latency,
+            "connections": connections,
+            "connections_reused": max(0, requests_ - connections),
+        }
+
+    def close(self):
+        """Close all the pooled connections."""
+        self.session.close()
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def _reset_transports():
+    """Drop the transports inherited from the parent of a forked process."""
+    global _transports_lock
+    _transports.clear()
+    _transports_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    # connections must not be shared between the forked worker processes
+    os.register_at_fork(after_in_child=_reset_transports)
+
+
+def get_transport(pool_size=10):
+    """Get the transport of the current process for a pool configuration."""
+    with _transports_lock:
+        transport = _transports.get(pool_size)
+        if transport is None:
+            transport = _transports[pool_size] = DataCiteTransport(pool_size)
+        return transport
+
+
+def transport_metrics():
+    """Get the metrics of all the transports of the current process."""
+    metrics = [transport.metrics() for transport in list(_transports.values())]
+    totals = {
+        key: sum(m[key] for m in metrics)
+        for key in ("requests", "errors", "connections", "connections_reused")
+    }
+    requests_ = totals["requests"]
+    totals["error_rate"] = totals["errors"] / requests_ if requests_ else 0.0
+    totals["latency_avg"] = (
+        sum(m["latency_avg"] * m["requests"] for m in metrics) / requests_
+        if requests_
+        else 0.0
+    )
+    totals["latency_max"] = max((m["latency_max"] for m in metrics), default=0.0)
+    return totals
+
+
+class PooledDataCiteRequest(DataCiteRequest):
+    """DataCite request sent with a pooled transport."""
+
+    def __init__(self, transport, **kwargs):
+        """Constructor."""
+        super().__init__(**kwargs)
+        self.transport = transport
+
+    def request(self, url, method="GET", body=None, params=None, headers=None):
+        """Make a request."""
+        params = dict(params or {})
+        params.update(self.default_params)
+        if self.base_url:
+            url = self.base_url + url
+        if body and isinstance(body, str):
+            body = body.encode("utf-8")
+
+        kwargs = dict(
+            auth=HTTPBasicAuth(self.username, self.password),
+            params=params,
+            headers=headers or {},
+        )
+        if method in ("POST", "PUT"):
+            kwargs["data"] = body
+        if self.timeout is not None:
+            kwargs["timeout"] = self.timeout
+
+        try:
+            return self.transport.request(method, url, **kwargs)
+        except (RequestException, ssl.SSLError) as e:
+            raise HttpError(e)
+
+
+class PooledDataCiteRESTClient(DataCiteRESTClient):
+    """DataCite REST API client sending its requests with a pooled transport."""
+
+    def __init__(self, *args, transport=None, **kwargs):
+        """Constructor.
+
+        :param transport: The :class:`DataCiteTransport` to use. Defaults to the
+            one of the current process.
+        """
+        super().__init__(*args, **kwargs)
+        self.transport = transport or get_transport()
+
+    def _create_request(self):
+        """Create a new request object."""
+        return PooledDataCiteRequest(
+            self.transport,
+            base_url=self.api_url,
+            username=self.username,
+            password=self.password,
+            timeout=self.timeout,
+        )
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Durable queue of the PIDs to register or update on their remote providers.
+
+The requests are stored in the database, in the same transaction as the
+changes of the records (e.g. their publication), and processed in the
+background:
+
+- only a bounded number of workers drain the queue at the same time, and each
+  of them sends at most a configured number of requests per second;
+- the requests which fail are retried with an exponential backoff, and are
+  given up after a configured number of attempts, until retried manually;
+- the requests claimed by a worker are leased for a limited time, so that the
+  requests of crashed workers are processed again.
+"""
+
+import time
+from datetime import datetime
+
+import sqlalchemy as sa
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
+from invenio_db import db
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ...proxies import current_rdm_records
+from .models import PIDSyncItem, PIDSyncState
+
+WORKER_SLOT_CACHE_KEY = "rdm_records:pids_sync:worker:{0}"
+"""Cache key of the lock of a worker slot."""
+
+_upsert_dialects = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+"""Insert constructs supporting ``ON CONFLICT DO UPDATE``, per database dialect."""
+
+
+def enqueue(record_id, scheme, parent=False, delay=None):
+    """Request the registration or update of a PID of a record.
+
+    Repeated requests for the same PID are merged into the existing one, which
+    is revived if it had been given up. The request is only stored once the
+    current transaction is committed.
+
+    :param record_id: Persistent identifier (``id``) of the record, or of the
+        parent record for the PIDs of parent records.
+    :param scheme: Scheme of the PID.
+    :param parent: Whether the PID is the one of the parent record.
+    :param delay: Time to wait for more requests for the same PID before
+        processing the request. A repeated request does not postpone it
+        further, so that the PID is synchronized once per period of time.
+    """
+    now = datetime.utcnow()
+    next_attempt = now + delay if delay else now
+    table = PIDSyncItem.__table__
+    insert = _upsert_dialects.get(db.engine.dialect.name)
+    if insert is None:
+        return _enqueue_item(record_id, scheme, parent, next_attempt)
+
+    # merged atomically, the concurrent requests can not create duplicates
+    failed = table.c.state == PIDSyncState.FAILED
+    stmt = insert(table).values(
+        created=now,
+        updated=now,
+        record_id=record_id,
+        scheme=scheme,
+        parent=parent,
+        state=PIDSyncState.PENDING,
+        attempts=0,
+        next_attempt=next_attempt,
+        generation=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.record_id, table.c.scheme, table.c.parent],
+        set_={
+            "updated": now,
+            "state": PIDSyncState.PENDING,
+            "generation": table.c.generation + 1,
+            "attempts": sa.case((failed, 0), else_=table.c.attempts),
+            "next_attempt": sa.case(
+                (failed, stmt.excluded.next_attempt),
+                (
+                    table.c.next_attempt < stmt.excluded.next_attempt,
+                    table.c.next_attempt,
+                ),
+                else_=stmt.excluded.next_attempt,
+            ),
+        },
+    )
+    db.session.execute(stmt)
+
+
+def _enqueue_item(record_id, scheme, parent, next_attempt):
+    """Merge a request with the ORM, for the databases without upserts."""
+    item = PIDSyncItem.query.filter_by(
+        record_id=record_id, scheme=scheme, parent=parent
+    ).one_or_none()
+    if item is None:
+        item = PIDSyncItem(record_id=record_id, scheme=scheme, parent=parent)
+        db.session.add(item)
+    else:
+        item.generation += 1
+        if item.state == PIDSyncState.FAILED:
+            item.attempts = 0
+        elif item.next_attempt is not None:
+            next_attempt = min(item.next_attempt, next_attempt)
+    item.state = PIDSyncState.PENDING
+    item.next_attempt = next_attempt
+
+
+def backoff(attempts):
+    """Get the delay before the next attempt, after a number of failed attempts."""
+    delay = current_app.config["RDM_PIDS_SYNC_BACKOFF"] * 2 ** (attempts - 1)
+    return min(delay, current_app.config["RDM_PIDS_SYNC_BACKOFF_MAX"])
+
+
+def claim(limit):
+    """Claim a batch of the due requests, leasing them for the current worker.
+
+    :param limit: Maximum number of claimed requests.
+    :returns: List of tuples with the ID and generation of the claimed requests.
+    """
+    now = datetime.utcnow()
+    items = (
+        PIDSyncItem.query.filter(
+            PIDSyncItem.state == PIDSyncState.PENDING,
+            PIDSyncItem.next_attempt <= now,
+        )
+        .order_by(PIDSyncItem.next_attempt)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    claimed = []
+    for item in items:
+        item.next_attempt = now + current_app.config["RDM_PIDS_SYNC_LEASE"]
+        claimed.append((item.id, item.generation))
+    db.session.commit()
+    return claimed
+
+
+def release(item_ids):
+    """Hand back claimed requests which were not processed, to be claimed again.
+
+    :param item_ids: IDs of the claimed requests.
+    """
+    PIDSyncItem.query.filter(
+        PIDSyncItem.id.in_(item_ids),
+        PIDSyncItem.state == PIDSyncState.PENDING,
+    ).update({"next_attempt": datetime.utcnow()}, synchronize_session=False)
+    db.session.commit()
+
+
+def process(item_id, generation):
+    """Register or update the PID of a claimed request.
+
+    On success, the request is removed unless it was repeated in the meantime.
+    On failure, it is scheduled for a later attempt, or given up.
+
+    :returns: ``True`` if the PID was synchronized.
+    """
+    item = db.session.get(PIDSyncItem, item_id)
+    if item is None:
+        return False
+    record_id, scheme, parent = item.record_id, item.scheme, item.parent
+
+    try:
+        if parent:
+            record_id = _latest_record_id(record_id)
+        current_rdm_records.records_service.pids.register_or_update(
+            system_identity,
+            record_id,
+            scheme,
+            parent=parent,
+            raise_errors=True,
+        )
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.warning(
+            f"Failed to synchronize the {scheme} PID of record {record_id}.",
+            exc_info=True,
+        )
+        _failed(item_id, e)
+        return False
+
+    # kept if requested again while being processed, its next attempt was then
+    # already brought forward by the new request
+    PIDSyncItem.query.filter_by(id=item_id, generation=generation).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+    return True
+
+
+def _latest_record_id(parent_id):
+    """Get the ID of the latest version of a parent record."""
+    record_cls = current_rdm_records.records_service.record_cls
+    parent = record_cls.parent_record_cls.pid.resolve(parent_id, registered_only=False)
+    return record_cls.get_latest_by_parent(parent).pid.pid_value
+
+
+def _failed(item_id, error):
+    """Schedule the next attempt of a failed request, or give it up."""
+    item = db.session.get(PIDSyncItem, item_id)
+    if item is None:
+        return
+    item.attempts += 1
+    item.last_error = str(error) or error.__class__.__name__
+    if item.attempts >= current_app.config["RDM_PIDS_SYNC_MAX_ATTEMPTS"]:
+        item.state = PIDSyncState.FAILED
+    else:
+        item.next_attempt = datetime.utcnow() + backoff(item.attempts)
+    db.session.commit()
+
+
+def drain(limit=None, deadline=None):
+    """Process the due requests, respecting the rate limit.
+
+    :param limit: Maximum number of processed requests. Defaults to all of them.
+    :param deadline: Time (as of ``time.monotonic()``) after which no more
+        requests are processed. The claimed requests left are handed back.
+    :returns: Tuple with the number of synchronized and failed requests.
+
+    The requests of a batch are only processed during the first half of their
+    lease (leaving the other half to the request in progress), and the requests
+    left are then handed back and claimed again, so that slow requests do not
+    let the lease of the batch expire and other workers process it again.
+    """
+    batch_size = current_app.config["RDM_PIDS_SYNC_BATCH_SIZE"]
+    rate_limit = current_app.config["RDM_PIDS_SYNC_RATE_LIMIT"]
+    concurrency = current_app.config["RDM_PIDS_SYNC_CONCURRENCY"]
+    # each of the concurrent workers gets its share of the rate limit
+    interval = concurrency / rate_limit if rate_limit else 0
+    lease = current_app.config["RDM_PIDS_SYNC_LEASE"].total_seconds()
+
+    synced = failed = 0
+    last_request = None
+    while limit is None or synced + failed < limit:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        size = batch_size if limit is None else min(batch_size, limit - synced - failed)
+        claimed = claim(size)
+        if not claimed:
+            break
+        renew = time.monotonic() + lease / 2
+        for i, (item_id, generation) in enumerate(claimed):
+            now = time.monotonic()
+            # at least one request is processed per batch
+            if i and (now >= renew or (deadline is not None and now >= deadline)):
+                release([id_ for id_, _ in claimed[i:]])
+                break
+            if last_request is not None:
+                time.sleep(max(0, last_request + interval - time.monotonic()))
+            last_request = time.monotonic()
+            if process(item_id, generation):
+                synced += 1
+            else:
+                failed += 1
+    return synced, failed
+
+
+def acquire_worker_slot():
+    """Acquire one of the worker slots, bounding the concurrent workers.
+
+    :returns: The key of the acquired slot, or ``None`` if all are taken.
+    """
+    timeout = int(current_app.config["RDM_PIDS_SYNC_LEASE"].total_seconds())
+    for slot in range(current_app.config["RDM_PIDS_SYNC_CONCURRENCY"]):
+        key = WORKER_SLOT_CACHE_KEY.format(slot)
+        if current_cache.add(key, True, timeout=timeout):
+            return key
+    return None
+
+
+def release_worker_slot(key):
+    """Release a worker slot."""
+    current_cache.delete(key)
+
+
+def stuck(include_pending=True):
+    """Get the requests which were given up, or have already failed.
+
+    :param include_pending: Also include the pending requests which failed at
+        least once.
+    """
+    query = PIDSyncItem.query
+    if include_pending:
+        query = query.filter(
+            (PIDSyncItem.state == PIDSyncState.FAILED) | (PIDSyncItem.attempts > 0)
+        )
+    else:
+        query = query.filter(PIDSyncItem.state == PIDSyncState.FAILED)
+    return query.order_by(PIDSyncItem.next_attempt)
+
+
+def retry(item_ids=None):
+    """Schedule requests for an immediate new attempt, reviving given up ones.
+
+    :param item_ids: IDs of the requests. Defaults to all the given up ones.
+    :returns: Number of rescheduled requests.
+    """
+    query = PIDSyncItem.query
+    if item_ids is None:
+        query = query.filter(PIDSyncItem.state == PIDSyncState.FAILED)
+    else:
+        query = query.filter(PIDSyncItem.id.in_(list(item_ids)))
+    rescheduled = 0
+    for item in query:
+        if item.state == PIDSyncState.FAILED:
+            item.attempts = 0
+        item.state = PIDSyncState.PENDING
+        item.next_attempt = datetime.utcnow()
+        rescheduled += 1
+    db.session.commit()
+    return rescheduled
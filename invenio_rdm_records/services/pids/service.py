@@ -7,13 +7,17 @@
 
 """RDM PIDs Service."""
 
+from invenio_db import db
 from invenio_drafts_resources.services.records import RecordService
 from invenio_pidstore.errors import PIDDoesNotExistError
-from invenio_pidstore.models import PersistentIdentifier
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 from invenio_records_resources.services.uow import RecordCommitOp, unit_of_work
 from invenio_requests.services.results import EntityResolverExpandableField
 from sqlalchemy.orm.exc import NoResultFound
 
+from invenio_rdm_records.records.systemfields.deletion_status import (
+    RecordDeletionStatusEnum,
+)
 from invenio_rdm_records.services.results import ParentCommunitiesExpandableField
 from invenio_rdm_records.utils import ChainObject
 
@@ -25,6 +29,8 @@ class PIDsService(RecordService):
         """Constructor for RecordService."""
         super().__init__(config)
         self.manager_cls = manager_cls
+        self._pid_manager = None
+        self._parent_pid_manager = None
 
     @property
     def expandable_fields(self):
@@ -44,10 +50,14 @@ class PIDsService(RecordService):
         This is done to:
         - only access self.config attributes when in an application context
         - limit code change
-        - limit side-effects (in case using pre-existing `pid_manager` would
-                              cause some.)
+
+        The manager is built once, on first access, and reused afterwards.
         """
-        return self.manager_cls(self.config.pids_providers, self.config.pids_required)
+        if self._pid_manager is None:
+            self._pid_manager = self.manager_cls(
+                self.config.pids_providers, self.config.pids_required
+            )
+        return self._pid_manager
 
     @property
     def pid_manager(self):
@@ -57,7 +67,11 @@ class PIDsService(RecordService):
     @property
     def parent_pid_manager(self):
         """Parent PID Manager."""
-        return self.manager_cls(self.config.parent_pids_providers)
+        if self._parent_pid_manager is None:
+            self._parent_pid_manager = self.manager_cls(
+                self.config.parent_pids_providers
+            )
+        return self._parent_pid_manager
 
     def resolve(self, identity, id_, scheme, expand=False):
         """Resolve PID to a record (not draft)."""
@@ -91,6 +105,35 @@ class PIDsService(RecordService):
             expand=expand,
         )
 
+    def read_versions_pids(self, identity, id_, scheme):
+        """Read the PIDs of all the published versions of a record.
+
+        The PIDs are read from the database in a single query, so that the
+        versions which are not yet indexed are included.
+
+        :param id_: Persistent identifier (``id``) of one of the versions.
+        :param scheme: Scheme of the PIDs.
+        :returns: List of the values of the PIDs, from the latest version.
+        """
+        record = self.record_cls.pid.resolve(id_, registered_only=False)
+        self.require_permission(identity, "read", record=record)
+
+        model_cls = self.record_cls.model_cls
+        query = (
+            db.session.query(PersistentIdentifier.pid_value)
+            .join(model_cls, model_cls.id == PersistentIdentifier.object_uuid)
+            .filter(
+                model_cls.parent_id == record.parent.id,
+                model_cls.is_deleted == False,  # noqa
+                model_cls.deletion_status == RecordDeletionStatusEnum.PUBLISHED,
+                PersistentIdentifier.pid_type == scheme,
+                PersistentIdentifier.object_type == "rec",
+                PersistentIdentifier.status != PIDStatus.DELETED,
+            )
+            .order_by(model_cls.index.desc())
+        )
+        return [pid_value for (pid_value,) in query]
+
     @unit_of_work()
     def create(self, identity, id_, scheme, provider=None, uow=None, expand=False):
         """Create a `NEW` PID for a given record."""
@@ -155,10 +198,14 @@ class PIDsService(RecordService):
         parent=False,
         uow=None,
         expand=False,
+        raise_errors=False,
     ):
         """Register or update a PID of a record.
 
         If the PID has already been register it updates the remote.
+
+        :param raise_errors: Raise the errors of the remote provider (and roll
+            back the local changes) instead of only logging them.
         """
         record = self.record_cls.pid.resolve(id_, registered_only=False)
 
@@ -195,10 +242,10 @@ class PIDsService(RecordService):
 
         if pid.is_registered():
             self.require_permission(identity, "pid_update", record=record)
-            pid_manager.update(pid_record, scheme, url=url)
+            pid_manager.update(pid_record, scheme, url=url, raise_errors=raise_errors)
         else:
             self.require_permission(identity, "pid_register", record=record)
-            pid_manager.register(pid_record, scheme, url=url)
+            pid_manager.register(pid_record, scheme, url=url, raise_errors=raise_errors)
 
         # draft and index do not need commit/refresh
 
@@ -7,11 +7,17 @@
 
 """RDM PIDs Service tasks."""
 
+import time
+
 from celery import shared_task
+from flask import current_app
 from invenio_access.permissions import system_identity
 
 from invenio_rdm_records.proxies import current_rdm_records
 
+from . import queue
+from .providers.transport import transport_metrics
+
 
 @shared_task(ignore_result=True)
 def register_or_update_pid(recid, scheme, parent=False):
@@ -22,3 +28,27 @@ def register_or_update_pid(recid, scheme, parent=False):
         scheme=scheme,
         parent=parent,
     )
+
+
+@shared_task(ignore_result=True)
+def process_pid_sync_queue():
+    """Start the workers which process the PID synchronization queue."""
+    for _ in range(current_app.config["RDM_PIDS_SYNC_CONCURRENCY"]):
+        drain_pid_sync_queue.delay()
+
+
+@shared_task(ignore_result=True)
+def drain_pid_sync_queue():
+    """Process the due PID synchronization requests, in one of the worker slots."""
+    slot = queue.acquire_worker_slot()
+    if slot is None:
+        return
+    try:
+        # stop before the slot expires, so that it is not taken over meanwhile
+        lease = current_app.config["RDM_PIDS_SYNC_LEASE"].total_seconds()
+        synced, failed = queue.drain(deadline=time.monotonic() + lease / 2)
+        if failed:
+            current_app.logger.warning(f"Failed to synchronize {failed} PIDs.")
+        current_app.logger.info(f"DataCite transport metrics: {transport_metrics()}")
+    finally:
+        queue.release_worker_slot(slot)
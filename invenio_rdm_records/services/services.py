@@ -14,6 +14,7 @@
 
 import arrow
 from invenio_drafts_resources.services.records import RecordService
+from invenio_records_resources.services.base import LinksTemplate
 from invenio_records_resources.services.uow import RecordCommitOp, unit_of_work
 from invenio_requests.services.results import EntityResolverExpandableField
 
@@ -121,10 +122,35 @@ class RDMRecordService(RecordService):
         and pass it into the service (normally the service must be responsible
         for this).
         """
-        record = self.record_cls.loads(oai_record_source)
-        return self.result_item(
-            self,
-            identity,
-            record,
-            links_tpl=self.links_item_tpl,
+        return self.oai_result_items(identity, [oai_record_source])[0]
+
+    def oai_links_tpl(self):
+        """Get the links template of the result items in the OAI server.
+
+        It only holds the links used by the OAI-PMH serializers, and can be shared
+        by the result items of all the records of a harvested page.
+        """
+        return LinksTemplate(
+            {
+                name: link
+                for name, link in self.config.links_item.items()
+                if name in self.config.links_oai_item
+            }
         )
+
+    def oai_result_items(self, identity, oai_record_sources, links_tpl=None):
+        """Get the result items of a page of record sources in the OAI server.
+
+        Same as ``oai_result_item()``, for many records at once, sharing the same
+        links template (see ``oai_links_tpl()``).
+        """
+        links_tpl = links_tpl or self.oai_links_tpl()
+        return [
+            self.result_item(
+                self,
+                identity,
+                self.record_cls.loads(source),
+                links_tpl=links_tpl,
+            )
+            for source in oai_record_sources
+        ]
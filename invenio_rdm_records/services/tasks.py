@@ -7,11 +7,15 @@
 
 """Celery tasks."""
 
+from datetime import datetime
+
 from celery import shared_task
 from flask import current_app
 from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
 
 from invenio_rdm_records.proxies import current_rdm_records
+from invenio_rdm_records.records.stats import Statistics
 from invenio_rdm_records.services.errors import EmbargoNotLiftedError
 
 
@@ -27,3 +31,76 @@ def update_expired_embargos():
         except EmbargoNotLiftedError as ex:
             current_app.logger.warning(ex.description)
             continue
+
+
+@shared_task(ignore_result=True)
+def index_parents_records(parent_ids):
+    """Index all the records of the given parents in bulk."""
+    indexer = current_rdm_records.records_service.indexer
+    indexed, errors = indexer.index_parents_records(parent_ids)
+    if errors:
+        current_app.logger.warning(f"Failed to index {errors} records.")
+
+
+@shared_task(bind=True, ignore_result=True, max_retries=3, default_retry_delay=10)
+def render_oai_metadata(self, record_id):
+    """Render the OAI-PMH metadata of a newly published record into the cache."""
+    from invenio_rdm_records.oaiserver.render_cache import warmup
+
+    # the record might not be searchable yet, right after being indexed
+    if not warmup(record_ids=[record_id]):
+        raise self.retry()
+
+
+@shared_task(ignore_result=True)
+def reclassify_oai_set(spec, cursor=None):
+    """Update the OAI sets of the records which may have joined or left a set.
+
+    Each run processes one bounded batch of records, and then schedules the next
+    batch in a new task.
+    """
+    from invenio_rdm_records.oaiserver.sets import reclassify_set
+
+    size = current_app.config["RDM_OAI_PMH_RECLASSIFY_BATCH_SIZE"]
+    cursor = reclassify_set(spec, search_after=cursor, size=size)
+    if cursor is not None:
+        reclassify_oai_set.delay(spec, cursor)
+
+
+@shared_task(ignore_result=True)
+def refresh_oai_set_counts():
+    """Count the records of all OAI sets, and cache the counts."""
+    from invenio_rdm_records.oaiserver.counts import refresh_counts
+
+    refresh_counts()
+
+
+STATS_REFRESH_CACHE_KEY = "rdm_records:stats_refresh:last_run"
+"""Cache key of the start time of the last statistics refresh."""
+
+
+@shared_task(ignore_result=True)
+def refresh_records_stats():
+    """Update the indexed statistics of records with newly aggregated events.
+
+    Only the records whose indexed statistics are outdated are reindexed. The
+    time of the last refresh only moves forward when all of them were reindexed,
+    so that the failed ones are retried by the next run.
+    """
+    started = datetime.utcnow()
+    since = current_cache.get(STATS_REFRESH_CACHE_KEY)
+    if since is None:
+        since = started - current_app.config["RDM_STATS_REFRESH_LOOKBACK"]
+
+    parent_recids = Statistics.get_updated_parent_recids(since)
+    if parent_recids:
+        indexer = current_rdm_records.records_service.indexer
+        updated, errors = indexer.refresh_stats(parent_recids)
+        if errors:
+            current_app.logger.warning(
+                f"Failed to update the statistics of {errors} records."
+            )
+            return
+
+    # aggregations updated while this task is running are picked up next time
+    current_cache.set(STATS_REFRESH_CACHE_KEY, started, timeout=0)
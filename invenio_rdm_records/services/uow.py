@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Unit of work operations for RDM records."""
+
+from invenio_records_resources.services.uow import Operation
+
+from .tasks import index_parents_records
+
+
+class ParentsRecordsIndexOp(Operation):
+    """Index all the records of a parent, once per unit of work.
+
+    The parents of all the operations of this type registered in a unit of work
+    are collected into the first one, which indexes all their records at once
+    with one bulk request after the commit. If there are more records than the
+    given threshold, the indexing is left to a Celery task instead.
+    """
+
+    def __init__(self, parent, indexer, async_threshold=None):
+        """Initialize the parents' records index operation.
+
+        :param parent: The parent record whose records should be indexed.
+        :param indexer: An ``RDMRecordIndexer`` for the records.
+        :param async_threshold: Number of records above which the indexing is
+                                done in a Celery task.
+        """
+        super().__init__()
+        self._parent_ids = {str(parent.id)}
+        self._indexer = indexer
+        self._async_threshold = async_threshold
+
+    def on_register(self, uow):
+        """Merge the parent into an already registered operation, if any."""
+        for op in uow._operations:
+            if isinstance(op, ParentsRecordsIndexOp) and op._indexer is self._indexer:
+                op._parent_ids |= self._parent_ids
+                self._parent_ids = set()
+                break
+
+    def on_post_commit(self, uow):
+        """Index the records of all the collected parents."""
+        if not self._parent_ids:
+            return
+
+        if self._async_threshold is not None:
+            count = self._indexer.parents_records_query(self._parent_ids).count()
+            if count > self._async_threshold:
+                index_parents_records.delay(sorted(self._parent_ids))
+                return
+
+        self._indexer.index_parents_records(self._parent_ids)
@@ -297,6 +297,8 @@ def app_config(app_config, mock_datacite_client):
     app_config["USERS_RESOURCES_SERVICE_SCHEMA"] = NotificationsUserSchema
 
     app_config["RDM_RESOURCE_ACCESS_TOKENS_ENABLED"] = True
+    # PIDs are synchronized eagerly in the tests, without throttling
+    app_config["RDM_PIDS_SYNC_RATE_LIMIT"] = 0
     return app_config
 
 
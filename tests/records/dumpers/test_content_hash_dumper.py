@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the content hash dumper."""
+
+from invenio_records.dumpers import SearchDumper
+
+from invenio_rdm_records.records import RDMParent
+from invenio_rdm_records.records.dumpers import ContentHashDumperExt
+
+
+def test_content_hash_dumper(app, db):
+    """Test content hash dumper extension implementation."""
+    dumper = SearchDumper(
+        extensions=[ContentHashDumperExt("content_hash", exclude=["stats"])]
+    )
+
+    parent = RDMParent.create({"stats": {"views": 1}})
+    parent.commit()
+    db.session.commit()
+
+    # Dump it
+    dump = parent.dumps(dumper=dumper)
+    assert len(dump["content_hash"]) == 40
+    assert parent.dumps(dumper=dumper)["content_hash"] == dump["content_hash"]
+
+    # excluded fields don't change the hash
+    parent["stats"] = {"views": 2}
+    assert parent.dumps(dumper=dumper)["content_hash"] == dump["content_hash"]
+
+    parent["permission_flags"] = {"can_community_manage_files": True}
+    assert parent.dumps(dumper=dumper)["content_hash"] != dump["content_hash"]
+
+    # Load it
+    new_record = RDMParent.loads(dump, loader=dumper)
+    assert "content_hash" not in new_record
@@ -282,6 +282,21 @@ def test_owner_resolve_invalid():
         assert owner.resolve(raise_exc=True)
 
 
+def test_owner_preload(users, monkeypatch):
+    owners = [Owner({"user": user.id}) for user in users]
+    missing_owner = Owner({"user": 9999})
+
+    with Owner.preload(owners + [missing_owner]):
+        # resolving the preloaded owners doesn't hit the database anymore
+        monkeypatch.setattr(
+            "invenio_rdm_records.records.systemfields.access.owners.User", None
+        )
+        assert [owner.resolve() for owner in owners] == users
+        assert missing_owner.resolve() is None
+        with pytest.raises(LookupError):
+            Owner({"user": 9999}).resolve(raise_exc=True)
+
+
 def test_owner_dump():
     dict_ = {"user": 1}
     owner = Owner(dict_)
@@ -7,6 +7,9 @@
 
 """Test record."""
 
+from invenio_access.permissions import system_identity
+
+from invenio_rdm_records.proxies import current_rdm_records_service
 from invenio_rdm_records.records.api import RDMDraft, RDMRecord
 
 
@@ -26,3 +29,22 @@ def test_idempotence_dumps_loads(running_app, minimal_record):
     draft = RDMDraft.create(minimal_record)
     loaded_draft = RDMDraft.loads(draft.dumps())
     assert dict(draft) == dict(loaded_draft)
+
+
+def test_has_draft_prefetch(running_app, minimal_record, search_clear):
+    """Compute the has_draft field of many records at once."""
+    service = current_rdm_records_service
+    records = []
+    for _ in range(2):
+        draft = service.create(system_identity, minimal_record)
+        records.append(service.publish(system_identity, draft.id))
+    service.edit(system_identity, records[0].id)
+
+    records = [RDMRecord.get_record(r._record.id) for r in records]
+    RDMRecord.has_draft.prefetch(records)
+    assert [r.has_draft for r in records] == [True, False]
+
+    # records loaded from search results can be hydrated the same way
+    hits = [RDMRecord.loads(r.dumps()) for r in records]
+    RDMRecord.has_draft.prefetch(hits)
+    assert [r.has_draft for r in hits] == [True, False]
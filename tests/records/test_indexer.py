@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the bulk indexing with batch-level prefetching."""
+
+from types import SimpleNamespace
+
+from invenio_access.permissions import system_identity
+
+from invenio_rdm_records.proxies import current_rdm_records_service as service
+from invenio_rdm_records.records.indexer import RDMRecordIndexer
+from invenio_rdm_records.records.stats import Statistics
+
+
+def test_prefetched_stats_are_dumped(
+    running_app, minimal_record, search_clear, monkeypatch
+):
+    """Test that the statistics dumper uses the prefetched statistics."""
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)._record
+    recid = record["id"]
+
+    versions_stats = {
+        "views": 1,
+        "unique_views": 1,
+        "downloads": 2,
+        "unique_downloads": 1,
+        "data_volume": 1024,
+    }
+    prefetched = {"this_version": versions_stats, "all_versions": versions_stats}
+    monkeypatch.setattr(
+        Statistics,
+        "get_records_stats",
+        classmethod(lambda cls, records: {rid: prefetched for rid, _ in records}),
+    )
+
+    with Statistics.prefetch([(recid, record.parent["id"])]):
+        assert Statistics.get_prefetched_record_stats(recid) == prefetched
+        assert record.dumps()["stats"] == prefetched
+
+    # outside of the batch, the statistics are fetched per record again
+    assert Statistics.get_prefetched_record_stats(recid) is None
+    assert record.dumps()["stats"]["this_version"]["views"] == 0
+
+
+def test_batch_stats_search_modifiers(monkeypatch):
+    """Test that the query modifiers get the values of the batch search."""
+    calls = []
+
+    def modifier(search, **kwargs):
+        calls.append(kwargs)
+        return search
+
+    query = SimpleNamespace(
+        client=None,
+        index="stats-record-view",
+        required_filters={"recid": "recid"},
+        query_modifiers=[modifier],
+        metric_fields={"views": ("sum", "count", {})},
+    )
+    monkeypatch.setattr(Statistics, "_get_query", classmethod(lambda cls, n: query))
+
+    search = Statistics._build_batch_search("record-view", "recid", ["a", "b"])
+    assert calls == [{"recid": ["a", "b"]}]
+    assert search.to_dict()["query"]["bool"]["filter"] == [
+        {"terms": {"recid": ["a", "b"]}}
+    ]
+
+
+def test_nested_stats_prefetch(monkeypatch):
+    """Test that the statistics prefetched by an enclosing context are reused."""
+    fetched = []
+
+    def get_records_stats(cls, records):
+        records = list(records)
+        fetched.append(records)
+        return {recid: {"fetched": True} for recid, _ in records}
+
+    monkeypatch.setattr(Statistics, "get_records_stats", classmethod(get_records_stats))
+
+    with Statistics.prefetch(stats={"a": {"fetched": False}}):
+        with Statistics.prefetch([("a", "p"), ("b", "p")]):
+            assert Statistics.get_prefetched_record_stats("a") == {"fetched": False}
+            assert Statistics.get_prefetched_record_stats("b") == {"fetched": True}
+    assert fetched == [[], [("b", "p")]]
+    assert Statistics.get_prefetched_record_stats("a") is None
+
+
+def test_bulk_index_records(running_app, minimal_record, search_clear):
+    """Test bulk indexing of records and drafts with prefetching."""
+    assert isinstance(service.indexer, RDMRecordIndexer)
+    assert isinstance(service.draft_indexer, RDMRecordIndexer)
+
+    records = []
+    for _ in range(3):
+        draft = service.create(system_identity, minimal_record)
+        records.append(service.publish(system_identity, draft.id))
+    open_draft = service.create(system_identity, minimal_record)
+
+    service.indexer.bulk_index([r._record.id for r in records])
+    service.draft_indexer.bulk_index([open_draft._record.id])
+    service.indexer.process_bulk_queue()
+    service.draft_indexer.process_bulk_queue()
+    service.record_cls.index.refresh()
+    service.draft_cls.index.refresh()
+
+    res = service.search(system_identity)
+    assert res.total == 3
+    for hit in res.hits:
+        assert hit["stats"]["this_version"]["views"] == 0
+        assert hit["stats"]["all_versions"]["downloads"] == 0
+
+    res = service.search_drafts(system_identity)
+    assert open_draft.id in [hit["id"] for hit in res.hits]
+
+
+def test_unchanged_documents_are_skipped(running_app, minimal_record, search_clear):
+    """Test that documents which are up to date in the index are not rewritten."""
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)._record
+    index = service.indexer._prepare_index(record.index._name)
+
+    assert service.indexer.index_records([record.id]) == (1, 0)
+    seq_no = service.indexer.client.get(index=index, id=str(record.id))["_seq_no"]
+
+    # nothing changed: the document is not written again
+    assert service.indexer.index_records([record.id]) == (1, 0)
+    doc = service.indexer.client.get(index=index, id=str(record.id))
+    assert doc["_seq_no"] == seq_no
+    assert doc["_source"]["content_hash"]
+
+    # the document is written again once the record changes
+    record["metadata"]["title"] = "A new title"
+    record.commit()
+    assert service.indexer.index_records([record.id]) == (1, 0)
+    doc = service.indexer.client.get(index=index, id=str(record.id))
+    assert doc["_seq_no"] > seq_no
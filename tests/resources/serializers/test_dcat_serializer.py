@@ -7,6 +7,8 @@
 
 """Resources serializers tests."""
 
+from lxml import etree
+
 from invenio_rdm_records.resources.serializers import DCATSerializer
 
 
@@ -159,3 +161,9 @@ def test_dcat_serializer(running_app, enhanced_full_record):
     serializer = DCATSerializer()
     serialized_record = serializer.serialize_object(enhanced_full_record)
     assert serialized_record == "\n".join(expected_data)
+
+    # the OAI-PMH server uses the element directly
+    element = serializer.serialize_object_etree(enhanced_full_record)
+    assert etree.tostring(element, pretty_print=True).decode("utf-8") == "\n".join(
+        expected_data[1:]
+    )
@@ -185,9 +185,14 @@ def test_dublincorexml_serializer_list(
     ]
 
     serializer = DublinCoreXMLSerializer()
-    serialized_records = serializer.serialize_object_list(
-        {"hits": {"hits": [updated_full_record, updated_minimal_record]}}
+    # the records are streamed, in a collection element
+    serialized_records = "".join(
+        serializer.serialize_object_list(
+            {"hits": {"hits": [updated_full_record, updated_minimal_record]}}
+        )
     )
+    assert serialized_records.count("<oai_dc:dc ") == 2
+    assert "</collection>" in serialized_records
 
     for ed in expected_data_full:
         assert ed in serialized_records
@@ -11,6 +11,7 @@ from collections import Iterable
 
 import pytest
 from dojson.contrib.marc21.utils import GroupableOrderedDict, create_record
+from lxml import etree
 
 from invenio_rdm_records.resources.serializers.marcxml import MARCXMLSerializer
 
@@ -173,3 +174,32 @@ def test_marcxml_serializer_full_record(running_app, updated_full_record):
     record1 = set(record1)
     record2 = set(record2)
     assert record1 == record2
+
+
+def test_marcxml_serializer_etree(running_app, updated_full_record):
+    """Test serializing into a MARCXML element."""
+    serializer = MARCXMLSerializer()
+    element = serializer.serialize_object_etree(updated_full_record)
+
+    assert etree.QName(element).localname == "record"
+    assert create_record(etree.tostring(element)) == create_record(
+        serializer.serialize_object(updated_full_record)
+    )
+
+
+def test_marcxml_serializer_list(
+    running_app, updated_full_record, updated_minimal_record
+):
+    """Test streaming a list of records into a MARCXML collection."""
+    serializer = MARCXMLSerializer()
+    chunks = serializer.serialize_object_list(
+        {"hits": {"hits": [updated_full_record, updated_minimal_record]}}
+    )
+    assert not isinstance(chunks, str)
+
+    collection = etree.fromstring("".join(chunks).encode("utf-8"))
+    assert etree.QName(collection).localname == "collection"
+    assert [create_record(etree.tostring(record)) for record in collection] == [
+        create_record(serializer.serialize_object(updated_full_record)),
+        create_record(serializer.serialize_object(updated_minimal_record)),
+    ]
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the registry of compiled XSLT stylesheets."""
+
+import os
+import threading
+import timeit
+
+import pytest
+from lxml import etree as ET
+from pkg_resources import resource_string
+
+from invenio_rdm_records.resources.serializers.xslt import XSLTRegistry
+
+DCAT_XSL = ("invenio_rdm_records.resources.serializers", "dcat/datacite-to-dcat-ap.xsl")
+
+DATACITE_RECORD = """
+<resource xmlns="http://datacite.org/schema/kernel-4">
+  <identifier identifierType="DOI">10.1234/inveniordm.1234</identifier>
+  <creators><creator><creatorName>Nielsen, Lars Holm</creatorName></creator></creators>
+  <titles><title>InvenioRDM</title></titles>
+  <publisher>InvenioRDM</publisher>
+  <publicationYear>2023</publicationYear>
+  <resourceType resourceTypeGeneral="Image">Photo</resourceType>
+</resource>
+"""
+
+
+def test_xslt_registry():
+    """Test compiling the stylesheets once per thread."""
+    registry = XSLTRegistry()
+    transform = registry.get(*DCAT_XSL)
+    assert registry.get(*DCAT_XSL) is transform
+    assert ET.QName(transform(ET.XML(DATACITE_RECORD)).getroot()).localname == "RDF"
+
+    # XSLT objects are not shared between threads
+    other = []
+    thread = threading.Thread(target=lambda: other.append(registry.get(*DCAT_XSL)))
+    thread.start()
+    thread.join()
+    assert other[0] is not transform
+
+    registry.clear()
+    assert registry.get(*DCAT_XSL) is not transform
+
+
+@pytest.mark.skipif(
+    not os.environ.get("RDM_RECORDS_BENCHMARKS"),
+    reason="benchmark, run with RDM_RECORDS_BENCHMARKS=1 and -s",
+)
+def test_xslt_registry_benchmark():
+    """Compare the per-record cost of compiling the stylesheet with the registry."""
+    record = ET.XML(DATACITE_RECORD)
+    registry = XSLTRegistry()
+
+    def compile_per_record():
+        ET.XSLT(ET.XML(resource_string(*DCAT_XSL)))(record)
+
+    def shared_transform():
+        registry.get(*DCAT_XSL)(record)
+
+    number = 20
+    before = min(timeit.repeat(compile_per_record, number=number, repeat=3)) / number
+    after = min(timeit.repeat(shared_transform, number=number, repeat=3)) / number
+    print(
+        f"DCAT transformation per record: {before * 1000:.2f}ms before, "
+        f"{after * 1000:.2f}ms after"
+    )
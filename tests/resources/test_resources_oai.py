@@ -169,6 +169,22 @@ def test_get_set_not_existing(client, admin, headers):
     _get_set(client, 9001, headers, 404).json
 
 
+def test_read_counts(client, admin, minimal_oai_set, headers):
+    """Retrieve the record counts of sets."""
+    client = admin.login(client)
+    _create_set(client, minimal_oai_set, headers, 201)
+    _create_set(client, {**minimal_oai_set, "spec": "s2"}, headers, 201)
+
+    res = client.get("/oaipmh/sets/counts", headers=headers)
+    assert res.status_code == 200
+    assert res.json["hits"]["total"] == 2
+    assert {hit["spec"] for hit in res.json["hits"]["hits"]} == {"spec", "s2"}
+
+    res = client.get("/oaipmh/sets/counts?spec=s2", headers=headers)
+    assert res.status_code == 200
+    assert [hit["spec"] for hit in res.json["hits"]["hits"]] == ["s2"]
+
+
 def test_update_set(client, admin, minimal_oai_set, headers):
     """Update a set."""
     client = admin.login(client)
@@ -259,3 +275,34 @@ def test_search_metadata_formats(client, admin, headers):
         assert hit["id"] in available_formats
         assert hit["schema"] == available_formats[hit["id"]]["schema"]
         assert hit["namespace"] == available_formats[hit["id"]]["namespace"]
+
+
+def test_search_sets_conditional(client, admin, minimal_oai_set, headers):
+    """Answer conditional requests of the set listing."""
+    client = admin.login(client)
+    _create_set(client, minimal_oai_set, headers, 201)
+
+    res = _search_sets(client, {}, headers, 200)
+    etag = res.headers["ETag"]
+    assert res.headers["Last-Modified"]
+
+    res = _search_sets(client, {}, {**headers, "If-None-Match": etag}, 304)
+    res = _search_sets(
+        client,
+        {},
+        {**headers, "If-Modified-Since": res.headers["Last-Modified"]},
+        304,
+    )
+
+    # changing the sets invalidates the copies
+    _create_set(client, {**minimal_oai_set, "spec": "s2"}, headers, 201)
+    res = _search_sets(client, {}, {**headers, "If-None-Match": etag}, 200)
+    assert res.json["hits"]["total"] == 2
+
+
+def test_search_metadata_formats_conditional(client, admin, headers):
+    """Answer conditional requests of the metadata formats."""
+    client = admin.login(client)
+
+    etag = _search_formats(client, headers, 200).headers["ETag"]
+    _search_formats(client, {**headers, "If-None-Match": etag}, 304)
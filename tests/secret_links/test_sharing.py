@@ -16,11 +16,14 @@ from flask_principal import AnonymousIdentity, Identity, UserNeed
 from invenio_access.permissions import any_user, authenticated_user
 from invenio_db import db
 from invenio_records_resources.services.errors import PermissionDeniedError
+from invenio_records_resources.services.uow import UnitOfWork
 from marshmallow.exceptions import ValidationError
 
 from invenio_rdm_records.proxies import current_rdm_records
 from invenio_rdm_records.records import RDMRecord
 from invenio_rdm_records.secret_links.permissions import LinkNeed
+from invenio_rdm_records.services import tasks
+from invenio_rdm_records.services.uow import ParentsRecordsIndexOp
 
 
 @pytest.fixture()
@@ -212,3 +215,42 @@ def test_read_restricted_record_with_secret_link(
     res = client.get("/records", query_string={"q": f"id:{recid}"})
     assert res.status_code == 200
     assert res.json["hits"]["total"] == 0
+
+
+def test_related_records_indexed_once(
+    running_app, service, restricted_record, identity_simple, monkeypatch
+):
+    """Test that several link changes reindex the parent's versions only once."""
+    calls = []
+    indexer_cls = type(service.indexer)
+    index_parents_records = indexer_cls.index_parents_records
+    monkeypatch.setattr(
+        indexer_cls,
+        "index_parents_records",
+        lambda self, ids: calls.append(set(ids)) or index_parents_records(self, ids),
+    )
+
+    id_ = restricted_record.id
+    with UnitOfWork(db.session) as uow:
+        for permission in ("view", "preview", "edit"):
+            service.access.create_secret_link(
+                identity_simple, id_, {"permission": permission}, uow=uow
+            )
+        ops = [op for op in uow._operations if isinstance(op, ParentsRecordsIndexOp)]
+        assert len(ops) == 3
+        uow.commit()
+
+    parent_id = str(restricted_record._record.parent.id)
+    assert calls == [{parent_id}]
+
+    # above the threshold, the indexing is left to a Celery task
+    delayed = []
+    monkeypatch.setitem(
+        running_app.app.config, "RDM_INDEX_RELATED_RECORDS_ASYNC_THRESHOLD", 0
+    )
+    monkeypatch.setattr(
+        tasks.index_parents_records, "delay", lambda ids: delayed.append(ids)
+    )
+    service.access.create_secret_link(identity_simple, id_, {"permission": "view"})
+    assert delayed == [[parent_id]]
+    assert len(calls) == 1
@@ -28,6 +28,9 @@ def datacite_provider(mocker):
     mocker.patch(
         "invenio_rdm_records.services.pids.providers.datacite.DataCiteRESTClient"
     )
+    mocker.patch(
+        "invenio_rdm_records.services.pids.providers.datacite.PooledDataCiteRESTClient"
+    )
 
     return DataCitePIDProvider("datacite", client=DataCiteClient("datacite"))
 
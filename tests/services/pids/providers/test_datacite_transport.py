@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""DataCite pooled transport tests."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from datacite.errors import DataCiteServerError
+
+from invenio_rdm_records.services.pids.providers.transport import (
+    DataCiteTransport,
+    PooledDataCiteRESTClient,
+)
+
+
+class DataCiteHandler(BaseHTTPRequestHandler):
+    """Minimal DataCite REST API, keeping the connections alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/vnd.api+json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        if "unavailable" in self.path:
+            return self._respond(500, {"errors": [{"title": "Unavailable"}]})
+        self._respond(200, {"data": {"attributes": {"state": "findable"}}})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def datacite_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DataCiteHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_transport_reuses_connections(datacite_server):
+    transport = DataCiteTransport(pool_size=2)
+    clients = [
+        PooledDataCiteRESTClient(
+            "user", "secret", "10.1234", url=datacite_server, transport=transport
+        )
+        for _ in range(2)
+    ]
+    for i in range(5):
+        for client in clients:
+            client.update_doi(f"10.1234/{i}", url="https://example.org")
+
+    metrics = transport.metrics()
+    assert metrics["requests"] == 10
+    assert metrics["connections"] == 1
+    assert metrics["connections_reused"] == 9
+    assert metrics["errors"] == 0
+    assert metrics["latency_max"] >= metrics["latency_avg"] > 0
+
+    with pytest.raises(DataCiteServerError):
+        clients[0].update_doi("10.1234/unavailable", url="https://example.org")
+    metrics = transport.metrics()
+    assert metrics["errors"] == 1
+    assert metrics["error_rate"] == pytest.approx(1 / 11)
+    transport.close()
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""PID synchronization queue tests."""
+
+from datetime import datetime, timedelta
+from unittest import mock
+
+from datacite.errors import DataCiteServerError
+from invenio_db import db
+from invenio_pidstore.models import PIDStatus
+
+from invenio_rdm_records.proxies import current_rdm_records
+from invenio_rdm_records.services.pids import queue
+from invenio_rdm_records.services.pids.models import PIDSyncItem, PIDSyncState
+from tests.fake_datacite_client import FakeDataCiteRESTClient
+
+
+def _doi_status(service, doi):
+    provider = service.pids.pid_manager._get_provider("doi", "datacite")
+    return provider.get(pid_value=doi).status
+
+
+def test_sync_queue_retries(
+    running_app, search_clear, minimal_record, superuser_identity
+):
+    """Failed registrations stay in the queue, and are retried."""
+    service = current_rdm_records.records_service
+    draft = service.create(superuser_identity, minimal_record)
+
+    with mock.patch.object(
+        FakeDataCiteRESTClient,
+        "public_doi",
+        side_effect=DataCiteServerError("Service unavailable"),
+    ):
+        record = service.publish(superuser_identity, draft.id)
+
+    doi = record["pids"]["doi"]["identifier"]
+    assert _doi_status(service, doi) == PIDStatus.RESERVED
+    items = PIDSyncItem.query.filter_by(scheme="doi").all()
+    assert len(items) == 2  # record and parent DOIs
+    for item in items:
+        assert item.state == PIDSyncState.PENDING
+        assert item.attempts == 1
+        assert "Service unavailable" in item.last_error
+        assert item.next_attempt > datetime.utcnow()
+    assert queue.stuck().count() == 2
+
+    # not due yet
+    assert queue.drain() == (0, 0)
+
+    assert queue.retry([item.id for item in items]) == 2
+    synced, failed = queue.drain()
+    assert failed == 0
+    assert _doi_status(service, doi) == PIDStatus.REGISTERED
+    assert PIDSyncItem.query.filter_by(scheme="doi").count() == 0
+
+
+def test_sync_queue_gives_up(
+    running_app, search_clear, minimal_record, superuser_identity, monkeypatch
+):
+    """Requests are given up after too many attempts, until retried."""
+    monkeypatch.setitem(running_app.app.config, "RDM_PIDS_SYNC_MAX_ATTEMPTS", 1)
+    service = current_rdm_records.records_service
+    draft = service.create(superuser_identity, minimal_record)
+
+    with mock.patch.object(
+        FakeDataCiteRESTClient,
+        "public_doi",
+        side_effect=DataCiteServerError("Service unavailable"),
+    ):
+        service.publish(superuser_identity, draft.id)
+
+    items = queue.stuck(include_pending=False).all()
+    assert len(items) == 2
+    assert all(item.state == PIDSyncState.FAILED for item in items)
+    assert queue.drain() == (0, 0)
+
+    # a new request for the same PID revives it
+    queue.enqueue(items[0].record_id, "doi", parent=items[0].parent)
+    db.session.refresh(items[0])
+    assert items[0].state == PIDSyncState.PENDING
+    assert items[0].attempts == 0
+
+    assert queue.retry() == 1
+    assert queue.drain() == (2, 0)
+    assert PIDSyncItem.query.count() == 0
+
+
+def test_sync_queue_keeps_repeated_requests(
+    running_app, search_clear, minimal_record, superuser_identity
+):
+    """A request repeated while being processed is not removed."""
+    service = current_rdm_records.records_service
+    draft = service.create(superuser_identity, minimal_record)
+    with mock.patch.object(
+        FakeDataCiteRESTClient,
+        "public_doi",
+        side_effect=DataCiteServerError("Service unavailable"),
+    ):
+        record = service.publish(superuser_identity, draft.id)
+
+    queue.retry()
+    claimed = dict(queue.claim(10))
+    item = PIDSyncItem.query.filter_by(record_id=record.id, parent=False).one()
+    queue.enqueue(record.id, "doi")
+    db.session.commit()
+
+    assert queue.process(item.id, claimed[item.id])
+    db.session.refresh(item)
+    assert item.generation == claimed[item.id] + 1
+    assert item.state == PIDSyncState.PENDING
+    assert PIDSyncItem.query.filter_by(record_id=record.id).count() == 1
+
+
+def test_sync_queue_renews_leases(
+    running_app, search_clear, minimal_record, superuser_identity, monkeypatch
+):
+    """The requests left when the lease of a batch expires are handed back."""
+    service = current_rdm_records.records_service
+    draft = service.create(superuser_identity, minimal_record)
+    with mock.patch.object(
+        FakeDataCiteRESTClient,
+        "public_doi",
+        side_effect=DataCiteServerError("Service unavailable"),
+    ):
+        service.publish(superuser_identity, draft.id)
+
+    queue.retry()
+    monkeypatch.setitem(running_app.app.config, "RDM_PIDS_SYNC_LEASE", timedelta(0))
+    with mock.patch.object(queue, "release", wraps=queue.release) as release:
+        assert queue.drain() == (2, 0)
+    release.assert_called_once()
+    assert PIDSyncItem.query.count() == 0
+
+
+def test_sync_queue_merges_parent_updates(
+    running_app, search_clear, minimal_record, superuser_identity
+):
+    """The updates of a parent PID are merged across the published versions."""
+    service = current_rdm_records.records_service
+    draft = service.create(superuser_identity, minimal_record)
+    record = service.publish(superuser_identity, draft.id)
+    parent_id = record._record.parent.pid.pid_value
+    parent_doi = record["parent"]["pids"]["doi"]["identifier"]
+
+    with mock.patch.object(FakeDataCiteRESTClient, "update_doi") as update_doi:
+        for _ in range(3):
+            draft = service.new_version(superuser_identity, record.id)
+            data = draft.data.copy()
+            data["metadata"]["publication_date"] = "2023-01-01"
+            service.update_draft(superuser_identity, draft.id, data)
+            record = service.publish(superuser_identity, draft.id)
+
+        updated = [c.kwargs["doi"] for c in update_doi.call_args_list]
+        assert parent_doi not in updated
+
+        item = PIDSyncItem.query.filter_by(scheme="doi", parent=True).one()
+        assert item.record_id == parent_id
+        assert item.generation == 3
+        assert item.next_attempt > datetime.utcnow() + timedelta(minutes=4)
+
+        queue.retry([item.id])
+        update_doi.reset_mock()
+        assert queue.drain() == (1, 0)
+        update_doi.assert_called_once()
+        assert update_doi.call_args.kwargs["doi"] == parent_doi
+
+
+def test_sync_queue_is_scheduled(running_app):
+    """The retried and delayed requests are processed periodically."""
+    tasks = [
+        entry["task"]
+        for entry in running_app.app.config["CELERY_BEAT_SCHEDULE"].values()
+    ]
+    assert "invenio_rdm_records.services.pids.tasks.process_pid_sync_queue" in tasks
@@ -20,6 +20,7 @@ from invenio_pidstore.models import PIDStatus
 from marshmallow import ValidationError
 
 from invenio_rdm_records.proxies import current_rdm_records
+from invenio_rdm_records.services.pids.providers import PIDProvider
 
 
 @pytest.fixture()
@@ -84,6 +85,26 @@ def test_resolve_non_existing_pid(running_app, search_clear, minimal_record):
         service.pids.resolve(identity=superuser_identity, id_=fake_doi, scheme="doi")
 
 
+def test_read_versions_pids(running_app, search_clear, minimal_record):
+    service = current_rdm_records.records_service
+    superuser_identity = running_app.superuser_identity
+    draft = service.create(superuser_identity, minimal_record)
+    record = service.publish(superuser_identity, draft.id)
+    # unpublished versions are not included
+    draft = service.new_version(superuser_identity, record.id)
+    assert service.pids.read_versions_pids(superuser_identity, record.id, "doi") == [
+        record["pids"]["doi"]["identifier"]
+    ]
+
+    service.update_draft(superuser_identity, draft.id, minimal_record)
+    new_record = service.publish(superuser_identity, draft.id)
+    # latest version first
+    assert service.pids.read_versions_pids(superuser_identity, record.id, "doi") == [
+        new_record["pids"]["doi"]["identifier"],
+        record["pids"]["doi"]["identifier"],
+    ]
+
+
 def test_reserve_pid(running_app, search_clear, minimal_record):
     service = current_rdm_records.records_service
     superuser_identity = running_app.superuser_identity
@@ -298,6 +319,46 @@ def test_pids_duplicates(running_app, search_clear, minimal_record):
     assert error_msg in duplicated_draft.errors
 
 
+def test_pids_validate_many(running_app, search_clear, minimal_record, mocker):
+    superuser_identity = running_app.superuser_identity
+    service = current_rdm_records.records_service
+    manager = service.pids.pid_manager
+    minimal_record["pids"] = {}
+    draft = service.create(superuser_identity, minimal_record)
+    draft = service.pids.create(superuser_identity, draft.id, "doi")
+    doi = draft["pids"]["doi"]["identifier"]
+    other_draft = service.create(superuser_identity, minimal_record)
+
+    get = mocker.spy(PIDProvider, "get")
+    errors_list = manager.validate_many(
+        [
+            (deepcopy(draft["pids"]), draft._record),
+            (
+                {"doi": {"identifier": "10.4321/Test.1234", "provider": "external"}},
+                other_draft._record,
+            ),
+            (
+                {"doi": {"identifier": f"doi:{doi}", "provider": "external"}},
+                other_draft._record,
+            ),
+            (
+                {"unknown": {"identifier": "1234", "provider": "external"}},
+                other_draft._record,
+            ),
+        ]
+    )
+    assert not get.called
+
+    assert errors_list[0] == []
+    assert errors_list[1] == []
+    assert errors_list[2][0]["field"] == "pids.doi"
+    assert f"doi:{doi} already exists." in errors_list[2][0]["messages"]
+    assert errors_list[3][0]["field"] == "pids"
+
+    # the manager is reused
+    assert service.pids.pid_manager is manager
+
+
 def test_pids_creation_invalid_external_payload(
     running_app, search_clear, minimal_record
 ):
@@ -8,12 +8,15 @@
 
 """PID service tasks tests."""
 
+from datetime import datetime
 from unittest import mock
 
 import pytest
 from invenio_pidstore.models import PIDStatus
 
 from invenio_rdm_records.proxies import current_rdm_records
+from invenio_rdm_records.services.pids import queue
+from invenio_rdm_records.services.pids.models import PIDSyncItem
 from invenio_rdm_records.services.pids.tasks import register_or_update_pid
 
 
@@ -110,6 +113,17 @@ def test_update_pid(
     assert mock_datacite_client.api.update_doi.called is False
     service.publish(superuser_identity, record_edited.id)
 
+    # the update of the parent DOI is delayed, to be merged with the ones of
+    # the next versions
+    updated = [
+        c.kwargs["doi"] for c in mock_datacite_client.api.update_doi.call_args_list
+    ]
+    assert updated == [doi]
+    item = PIDSyncItem.query.filter_by(scheme="doi", parent=True).one()
+    assert item.next_attempt > datetime.utcnow()
+    queue.retry([item.id])
+    assert queue.drain() == (1, 0)
+
     mock_datacite_client.api.update_doi.assert_has_calls(
         [
             mock.call(
@@ -13,10 +13,14 @@ from invenio_db import db
 from invenio_oaiserver.models import OAISet
 from marshmallow import ValidationError
 
+from invenio_rdm_records.oaiserver.counts import refresh_counts
+from invenio_rdm_records.oaiserver.services.cache import VersionedCache
 from invenio_rdm_records.oaiserver.services.config import OAIPMHServerServiceConfig
 from invenio_rdm_records.oaiserver.services.errors import OAIPMHSetNotEditable
 from invenio_rdm_records.oaiserver.services.services import OAIPMHServerService
 from invenio_rdm_records.proxies import current_oaipmh_server_service
+from invenio_rdm_records.proxies import current_rdm_records_service as records_service
+from invenio_rdm_records.records.api import RDMRecord
 
 
 def test_minimal_set_creation_and_edit(running_app, search_clear, minimal_oai_set):
@@ -74,3 +78,86 @@ def test_reserved_prefixes(running_app, search_clear, minimal_oai_set):
     # Must fail as "cds-" is a reserved prefix
     with pytest.raises(ValidationError):
         service.create(superuser_identity, minimal_oai_set)
+
+
+def test_search_sets(running_app, search_clear, minimal_oai_set):
+    superuser_identity = running_app.superuser_identity
+    service = current_oaipmh_server_service
+    for i in range(3):
+        service.create(
+            superuser_identity,
+            {**minimal_oai_set, "name": f"Set {i}", "spec": f"spec-{i}"},
+        )
+
+    result = service.search(superuser_identity, {"q": "spec-", "size": 2}).to_dict()
+    assert result["hits"]["total"] == 3
+    assert len(result["hits"]["hits"]) == 2
+
+    result = service.search(superuser_identity, {"q": "set 1"}).to_dict()
+    assert result["hits"]["total"] == 1
+    assert result["hits"]["hits"][0]["spec"] == "spec-1"
+
+    # the total is still known past the last page
+    result = service.search(superuser_identity, {"size": 2, "page": 3}).to_dict()
+    assert result["hits"]["total"] == 3
+    assert result["hits"]["hits"] == []
+
+
+def test_read_counts(running_app, search_clear, minimal_oai_set, minimal_record):
+    superuser_identity = running_app.superuser_identity
+    service = current_oaipmh_server_service
+    service.create(superuser_identity, minimal_oai_set)
+    service.create(
+        superuser_identity,
+        {**minimal_oai_set, "spec": "none", "search_pattern": "id:missing"},
+    )
+
+    draft = records_service.create(superuser_identity, minimal_record)
+    records_service.publish(superuser_identity, draft.id)
+    RDMRecord.index.refresh()
+
+    assert service.read_counts(superuser_identity) == {"spec": 1, "none": 0}
+
+    # the counts are cached
+    draft = records_service.create(superuser_identity, minimal_record)
+    records_service.publish(superuser_identity, draft.id)
+    RDMRecord.index.refresh()
+    assert service.read_counts(superuser_identity, ["spec"]) == {"spec": 1}
+
+    refresh_counts()
+    assert service.read_counts(superuser_identity, ["spec"]) == {"spec": 2}
+    hits = service.search(superuser_identity, {}).to_dict()["hits"]["hits"]
+    assert {hit["spec"]: hit["records_count"] for hit in hits} == {
+        "spec": 2,
+        "none": 0,
+    }
+
+
+def test_versioned_cache_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    cache = VersionedCache(ttl=60)
+    cache.set("v1", "key", "value")
+    assert cache.get("v1", "key") == "value"
+    assert cache.get("v2", "key") is None
+
+    cache.set("v2", "key", "value")
+    now[0] += 60
+    assert cache.get("v2", "key") is None
+
+
+def test_search_sets_cache(running_app, search_clear, minimal_oai_set):
+    superuser_identity = running_app.superuser_identity
+    service = current_oaipmh_server_service
+    oai_item = service.create(superuser_identity, minimal_oai_set)
+    etag, _ = service.read_sets_validators(superuser_identity)
+
+    result = service.search(superuser_identity, {}).to_dict()
+    assert result["hits"]["hits"][0]["name"] == "name"
+
+    # the cached page is dropped when the sets are changed
+    data = {**oai_item.to_dict(), "name": "Updated name"}
+    service.update(superuser_identity, oai_item._item.id, data)
+    assert service.read_sets_validators(superuser_identity)[0] != etag
+    result = service.search(superuser_identity, {}).to_dict()
+    assert result["hits"]["hits"][0]["name"] == "Updated name"
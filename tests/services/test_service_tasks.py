@@ -8,10 +8,17 @@
 """Service tasks tests."""
 
 import pytest
+from invenio_access.permissions import system_identity
+from invenio_cache import current_cache
 
 from invenio_rdm_records.proxies import current_rdm_records
-from invenio_rdm_records.records.api import RDMDraft
-from invenio_rdm_records.services.tasks import update_expired_embargos
+from invenio_rdm_records.records.api import RDMDraft, RDMRecord
+from invenio_rdm_records.records.stats import Statistics
+from invenio_rdm_records.services.tasks import (
+    STATS_REFRESH_CACHE_KEY,
+    refresh_records_stats,
+    update_expired_embargos,
+)
 
 
 def test_embargo_lift_without_draft(embargoed_record, running_app, search_clear):
@@ -78,3 +85,42 @@ def test_embargo_lift_with_updated_draft(
     assert draft_lifted.access.embargo.active is False
     assert draft_lifted.access.protection.files == "restricted"
     assert draft_lifted.access.protection.record == "public"
+
+
+def test_refresh_records_stats(running_app, minimal_record, search_clear, monkeypatch):
+    """Test reindexing the records whose statistics are outdated."""
+    service = current_rdm_records.records_service
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)
+    new_version = service.new_version(system_identity, record.id)
+    service.update_draft(system_identity, new_version.id, minimal_record)
+    service.publish(system_identity, new_version.id)
+    RDMRecord.index.refresh()
+
+    views = {"views": 3, "unique_views": 2}
+    downloads = {"downloads": 0, "unique_downloads": 0, "data_volume": 0}
+    stats = Statistics._build_stats(views, views, downloads, downloads)
+    monkeypatch.setattr(
+        Statistics,
+        "get_updated_parent_recids",
+        classmethod(lambda cls, since: {record["parent"]["id"]}),
+    )
+    monkeypatch.setattr(
+        Statistics,
+        "get_records_stats",
+        classmethod(lambda cls, records: {recid: stats for recid, _ in records}),
+    )
+
+    refresh_records_stats()
+    RDMRecord.index.refresh()
+
+    # all versions got the new statistics
+    res = service.search(system_identity, params={"allversions": True})
+    assert res.total == 2
+    for hit in res.hits:
+        assert hit["stats"] == stats
+
+    # the documents which are up to date are not written again
+    indexer = service.indexer
+    assert indexer.refresh_stats([record["parent"]["id"]]) == (0, 0)
+    assert current_cache.get(STATS_REFRESH_CACHE_KEY) is not None
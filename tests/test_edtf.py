@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the memoized EDTF parsing."""
+
+import pytest
+from edtf.parser.edtf_exceptions import EDTFParseException
+
+from invenio_rdm_records.edtf import EDTFCache
+
+
+def test_edtf_cache():
+    """Test the parsed values and bounds are cached."""
+    cache = EDTFCache(maxsize=2)
+
+    assert cache.bounds("2020-01/2021") == ("2020-01-01", "2021-12-31")
+    assert cache.bounds("2020-01/2021") == ("2020-01-01", "2021-12-31")
+    assert cache.parse("2020-01/2021") is cache.parse("2020-01/2021")
+
+    info = cache.info()
+    assert info["bounds"]["hits"] == 1
+    assert info["bounds"]["misses"] == 1
+    assert info["parse"]["hits"] == 2
+    assert info["parse"]["misses"] == 1
+
+    # the caches are bounded
+    cache.parse("2021")
+    cache.parse("2022")
+    assert cache.info()["parse"]["currsize"] == 2
+
+    # invalid values are not cached
+    for _ in range(2):
+        with pytest.raises(EDTFParseException):
+            cache.parse("invalid")
+    assert cache.info()["parse"]["currsize"] == 2
+
+    # values beyond the level 0 of EDTF are parsed with the full grammar
+    assert cache.bounds("2020-XX") == ("2020-01-01", "2020-12-31")
+    assert cache.bounds("2020-01-XX") == ("2020-01-01", "2020-01-31")
+
+    cache.clear()
+    assert cache.info()["parse"]["hits"] == 0
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the cursor-based paging of OAI-PMH records."""
+
+from invenio_access.permissions import system_identity
+
+from invenio_rdm_records.oaiserver.query import get_records
+from invenio_rdm_records.proxies import current_rdm_records_service as service
+from invenio_rdm_records.records.api import RDMRecord
+
+
+def test_cursor_pagination(running_app, minimal_record, search_clear):
+    """Test paging through the OAI-PMH records with search_after cursors."""
+    running_app.app.config["OAISERVER_PAGE_SIZE"] = 2
+    for _ in range(3):
+        draft = service.create(system_identity, minimal_record)
+        service.publish(system_identity, draft.id)
+    RDMRecord.index.refresh()
+
+    first = get_records()
+    assert first.total == 3
+    assert first.has_next and first._scroll_id
+    first_ids = [item["id"] for item in first.items]
+    assert len(first_ids) == 2
+
+    # the total is counted for the first page only, and carried in the token
+    token = {"page": first.next_num, "scroll_id": first._scroll_id}
+    second = get_records(resumptionToken=token)
+    assert "total" not in second.response["hits"]
+    assert second.total == 3
+    assert not second.has_next and second._scroll_id is None
+    second_ids = [item["id"] for item in second.items]
+    assert len(second_ids) == 1
+    assert not set(first_ids) & set(second_ids)
+
+
+def test_page_result_items(running_app, minimal_record, search_clear):
+    """Test building the result items of a harvested page at once."""
+    for _ in range(2):
+        draft = service.create(system_identity, minimal_record)
+        service.publish(system_identity, draft.id)
+    RDMRecord.index.refresh()
+
+    page = get_records()
+    sources = [item["json"]["_source"] for item in page.items]
+    items = service.oai_result_items(system_identity, sources)
+    assert [item.id for item in items] == [s["id"] for s in sources]
+    for item in items:
+        assert set(item.links) <= {"self_html", "doi"}
+        assert "self_html" in item.links
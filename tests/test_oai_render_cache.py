@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the OAI-PMH render cache."""
+
+from flask import g
+from flask_principal import AnonymousIdentity
+from invenio_access.permissions import any_user, system_identity
+from invenio_db import db
+
+from invenio_rdm_records.oai import dublincore_etree
+from invenio_rdm_records.oaiserver import render_cache
+from invenio_rdm_records.oaiserver.models import OAIRenderCache
+from invenio_rdm_records.proxies import current_rdm_records_service as service
+from invenio_rdm_records.records.api import RDMRecord
+
+
+def test_render_cache(running_app, minimal_record, search_clear):
+    """Test rendering records into the cache, and serving them from it."""
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)
+    RDMRecord.index.refresh()
+    record_id = record._record.id
+
+    assert render_cache.warmup(["oai_dc"]) == 1
+    entry = db.session.get(OAIRenderCache, (record_id, "oai_dc"))
+    assert entry.revision_id == record._record.revision_id
+
+    # the stored rendering is served for the same revision of the record
+    entry.xml = b"<cached/>"
+    db.session.commit()
+    source = RDMRecord.index.search().filter("term", id=record.id).execute()[0]
+    g.identity = AnonymousIdentity()
+    g.identity.provides.add(any_user)
+    assert dublincore_etree(None, {"_source": source.to_dict()}).tag == "cached"
+
+    # ...but not for a newer one
+    source = {**source.to_dict(), "version_id": source["version_id"] + 1}
+    assert dublincore_etree(None, {"_source": source}).tag != "cached"
+    # the new rendering is only written once flushed (after the response)
+    assert db.session.get(OAIRenderCache, (record_id, "oai_dc")).xml == b"<cached/>"
+    render_cache.flush()
+    entry = db.session.get(OAIRenderCache, (record_id, "oai_dc"))
+    assert entry.revision_id == record._record.revision_id + 1
+    assert entry.xml != b"<cached/>"
+
+    assert render_cache.invalidate(record_ids=[record_id]) == 1
+    assert OAIRenderCache.query.count() == 0
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the materialized membership of records in OAI sets."""
+
+from invenio_access.permissions import system_identity
+from invenio_db import db
+from invenio_oaiserver.models import OAISet
+
+from invenio_rdm_records.oaiserver.sets import (
+    CLASSIFIED_FIELD,
+    SETS_FIELD,
+    reclassify_set,
+    records_sets,
+    set_records_query,
+)
+from invenio_rdm_records.proxies import current_rdm_records_service as service
+from invenio_rdm_records.records.api import RDMRecord
+
+
+def _indexed_document(record_id):
+    """Get the search document of a record."""
+    RDMRecord.index.refresh()
+    return RDMRecord.index.search().filter("term", id=record_id).execute()[0]
+
+
+def _indexed_sets(record_id):
+    """Get the OAI sets stored in the search document of a record."""
+    document = _indexed_document(record_id).to_dict()
+    assert document[CLASSIFIED_FIELD] is True
+    return document.get(SETS_FIELD)
+
+
+def test_materialized_sets(running_app, minimal_record, search_clear):
+    """Test classifying records into sets when indexing and reclassifying them."""
+    oai_set = OAISet(spec="published", name="Published", search_pattern="*")
+    db.session.add(oai_set)
+    db.session.commit()
+
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)
+    assert _indexed_sets(record.id) == ["published"]
+
+    # the set no longer matches the record
+    oai_set.search_pattern = "is_published:false"
+    db.session.commit()
+    assert reclassify_set("published") is None
+    assert _indexed_sets(record.id) == []
+    # the record is not matched with the query of the set anymore
+    search = RDMRecord.index.search().filter(set_records_query("published"))
+    assert search.count() == 0
+    assert records_sets([_indexed_document(record.id).to_dict()]) == [[]]
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the sharded and incremental reindexing."""
+
+from datetime import datetime, timedelta
+
+from invenio_access.permissions import system_identity
+from invenio_search import current_search, current_search_client
+from invenio_search.utils import build_alias_name
+
+from invenio_rdm_records.proxies import current_rdm_records_service as service
+from invenio_rdm_records.records.api import RDMRecord
+from invenio_rdm_records.records.indexer import RDMRecordIndexer
+from invenio_rdm_records.reindex import (
+    INCREMENTAL_REINDEX_TARGETS,
+    REINDEX_TARGETS,
+    WATERMARK_SAFETY_WINDOW,
+    BlueGreenReindex,
+    Checkpoint,
+    IncrementalReindex,
+    Watermark,
+    _reset_connections,
+    compute_shards,
+    get_indexer,
+    ids_query,
+    update_mappings,
+    updated_ids_query,
+)
+
+
+def test_compute_shards(running_app, minimal_record, search_clear):
+    """Test splitting a record table into shards."""
+    for _ in range(5):
+        draft = service.create(system_identity, minimal_record)
+        service.publish(system_identity, draft.id)
+
+    model_cls = RDMRecord.model_cls
+    shards = compute_shards(model_cls, shard_size=2)
+    assert [s["count"] for s in shards] == [2, 2, 1]
+    assert shards[0]["start"] is None and shards[-1]["end"] is None
+
+    # the shards cover all the records, without overlapping
+    ids = []
+    for shard in shards:
+        ids.extend(id_ for (id_,) in ids_query(model_cls, shard["start"], shard["end"]))
+    assert sorted(ids) == sorted(id_ for (id_,) in ids_query(model_cls))
+
+    # the records of a shard can be indexed without going through the queue
+    records_target = next(t for t in REINDEX_TARGETS if t.name == "records")
+    indexer = get_indexer(records_target)
+    assert indexer.index_records(ids) == (5, 0)
+
+
+def test_checkpoint(tmp_path):
+    """Test persisting and resuming the progress of a reindex run."""
+    path = str(tmp_path / "checkpoint.json")
+    target = REINDEX_TARGETS[0]
+    shards = [
+        {"start": None, "end": "b", "count": 2},
+        {"start": "b", "end": None, "count": 1},
+    ]
+
+    checkpoint = Checkpoint(path)
+    assert checkpoint.shards(target) is None
+    checkpoint.set_shards(target, shards)
+    checkpoint.mark_done(target, shards[0])
+
+    resumed = Checkpoint(path)
+    assert resumed.shards(target) == shards
+    assert resumed.is_done(target, shards[0])
+    assert not resumed.is_done(target, shards[1])
+
+    resumed.clear()
+    assert Checkpoint(path).shards(target) is None
+
+
+def test_incremental_reindex(
+    running_app, minimal_record, search_clear, tmp_path, monkeypatch
+):
+    """Test reindexing only the records modified since a given time."""
+    draft = service.create(system_identity, minimal_record)
+    old_record = service.publish(system_identity, draft.id)
+
+    since = datetime.utcnow()
+    draft = service.create(system_identity, minimal_record)
+    new_record = service.publish(system_identity, draft.id)
+    # a new secret link updates the parent, which affects all its versions
+    service.access.create_secret_link(
+        system_identity, old_record.id, {"permission": "view"}
+    )
+
+    ids = {id_ for id_, _ in updated_ids_query(RDMRecord, since)}
+    assert ids == {old_record._record.id, new_record._record.id}
+
+    watermark_path = str(tmp_path / "watermark.json")
+    results = IncrementalReindex(since=since, watermark_path=watermark_path).run()
+    progress = {p.target.name: p for p in results}
+    assert progress["records"].indexed == 2
+
+    # the next run starts from the persisted watermark, minus a safety window
+    watermark = Watermark(watermark_path).get()
+    assert watermark > since
+    assert (
+        IncrementalReindex(watermark_path=watermark_path).since
+        == watermark - WATERMARK_SAFETY_WINDOW
+    )
+    assert (
+        IncrementalReindex(
+            watermark_path=watermark_path, safety_window=timedelta(0)
+        ).since
+        == watermark
+    )
+
+    # the watermark is kept when some records failed to be indexed
+    monkeypatch.setattr(
+        RDMRecordIndexer, "index_records", lambda self, ids: (0, len(list(ids)))
+    )
+    results = IncrementalReindex(since=since, watermark_path=watermark_path).run()
+    assert {p.target.name: p for p in results}["records"].errors == 2
+    assert Watermark(watermark_path).get() == watermark
+
+
+def test_blue_green_reindex_plan(running_app, minimal_record, search_clear):
+    """Test planning the switch to new indices, and loading a new index."""
+    plans = BlueGreenReindex().plan()
+    plans = {plan["target"].name: plan for plan in plans}
+
+    records_plan = plans["records"]
+    index_name = RDMRecord.index._name
+    assert records_plan["index"] == index_name
+    assert records_plan["aliases"] == [
+        build_alias_name("rdmrecords"),
+        build_alias_name("rdmrecords-records"),
+        build_alias_name(index_name),
+    ]
+    assert records_plan["new_index"] not in records_plan["old_indices"]
+    assert records_plan["old_indices"] == sorted(
+        current_search_client.indices.get_alias(name=build_alias_name(index_name))
+    )
+
+    # records can be written to the new index while it is not aliased yet
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)
+    records_target = next(t for t in INCREMENTAL_REINDEX_TARGETS if t.name == "records")
+    new_index = records_plan["new_index"]
+    current_search.create_index(
+        index_name, suffix=records_plan["suffix"], create_write_alias=False
+    )
+    try:
+        indexer = get_indexer(records_target._replace(index=new_index))
+        assert indexer.index_records([record._record.id]) == (1, 0)
+        current_search_client.indices.refresh(index=new_index)
+        assert current_search_client.count(index=new_index)["count"] == 1
+    finally:
+        current_search_client.indices.delete(index=new_index)
+
+
+def test_blue_green_reindex(running_app, minimal_record, search_clear):
+    """Test loading new indices and switching the aliases over to them."""
+    draft = service.create(system_identity, minimal_record)
+    record = service.publish(system_identity, draft.id)
+    records_target = next(t for t in INCREMENTAL_REINDEX_TARGETS if t.name == "records")
+    write_alias = build_alias_name(RDMRecord.index._name)
+    old_indices = sorted(current_search_client.indices.get_alias(name=write_alias))
+
+    steps = []
+    plans = BlueGreenReindex(
+        targets=[records_target],
+        workers=0,
+        delete_old=True,
+        progress_callback=steps.append,
+    ).run()
+
+    new_index = plans[0]["new_index"]
+    assert plans[0]["old_indices"] == old_indices
+    for alias in plans[0]["aliases"]:
+        assert list(current_search_client.indices.get_alias(name=alias)) == [new_index]
+    assert not current_search_client.indices.exists(index=old_indices)
+    assert "Switching aliases..." in steps
+
+    RDMRecord.index.refresh()
+    hits = RDMRecord.index.search().filter("term", id=record.id).execute()
+    assert hits.hits.total.value == 1
+    assert hits[0].meta.index == new_index
+
+
+def test_reset_connections(running_app):
+    """The search client used before forking the workers is not reused."""
+    client = current_search.client
+    _reset_connections()
+    assert current_search.client is not client
+
+
+def test_update_mappings(running_app, search_clear):
+    """Test adding the new fields of the mappings to the existing indices."""
+    index_name = RDMRecord.index._name
+    assert index_name in update_mappings()
+
+    alias = build_alias_name(index_name)
+    mappings = current_search_client.indices.get_mapping(index=alias)
+    properties = next(iter(mappings.values()))["mappings"]["properties"]
+    assert "content_hash" in properties